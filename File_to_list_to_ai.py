@@ -43,8 +43,8 @@
 # # give_to_ai()
 import pandas as pd
 from Title_Identify_with_ai import identify_title
+from ai_processing import normalize_title
 import time
-import re
 import os # Added for path joining
 
 # Read the CSV file
@@ -71,15 +71,8 @@ def give_to_ai():
         titles = df["Job_Title"].tolist() # Use underscore
         skills = df["Skills"].tolist()    # Use underscore
 
-        # Iterate over the list of titles
-        cleaned_titles = []
-        for title in titles:
-            # Clean each title
-            title_str = str(title).strip() # Ensure string, Remove leading/trailing whitespace
-            title_str = re.sub(r'[^\w\s]', '', title_str)  # Remove all special characters (except spaces)
-            title_str = re.sub(r'\s+', ' ', title_str)  # Replace multiple spaces with a single space
-            title_str = title_str.lower()  # Optional: Convert to lowercase
-            cleaned_titles.append(title_str)
+        # Clean each title (same normalization as the classification cache keys)
+        cleaned_titles = [normalize_title(title) for title in titles]
 
         print(f"Processing {len(cleaned_titles)} titles for AI.")
 
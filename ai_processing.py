@@ -1,78 +1,345 @@
 # ai_processing.py
-import google.generativeai as genai
+import re
+import json
 import time
+import random
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import config
+from rate_control import QuotaLimiter
+from classification_cache import ClassificationCache
 
-def identify_job_titles(titles: list, skills: list, batch_size=10) -> list:
-    """
-    Identifies job titles using Google Gemini API in batches.
-    Returns a list of identified titles corresponding to the input.
-    """
-    if len(titles) != len(skills):
-        raise ValueError("titles и skills должны быть одной длины")
-
-    genai.configure(api_key=config.API_KEY)
-    model = genai.GenerativeModel("gemini-1.5-flash")
-    all_identified_titles = []
+MODEL_NAME = "gemini-1.5-flash"
+# Rate limited or server-side failures; anything else (bad key, blocked prompt) is final
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+# Models sometimes wrap JSON answers in ```json ... ``` despite being asked not to
+JSON_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+MAX_TITLE_CHARS = 120
+# Answer size of one job, e.g. [12,"Backend Developer"],
+OUTPUT_TOKENS_PER_ITEM = 10
 
-    prompt_template = """
-You are an expert job title classifier. Your task is to match the given job `Title` and `Skills` to a single, most appropriate title from the predefined list.
+PROMPT_TEMPLATE = """
+You are an expert job title classifier. Your task is to match each job's `title` and `skills` to a single, most appropriate title from the predefined list.
 
 ### Predefined Job Titles (Your only valid outputs):
 {valid_titles}
 
 ### Rules:
-1.  Analyze both the `Title` and `Skills` to make the best match.
+1.  Analyze both the `title` and `skills` of a job to make the best match.
 2.  If a clear match is not possible from the provided information, you MUST return "unknown".
-3.  The number of titles in your output MUST exactly match the number of jobs in the input.
-4.  Your output MUST be a single line of comma-separated values. Do not add explanations or formatting.
+3.  Each input job is a JSON array [id, title, skills]. Return one [id, chosen title] pair per input job.
+4.  Your output MUST be a JSON array only. Do not add explanations or formatting.
 
 ### Example Input:
-Title: ["Ведущий разработчик Java", "Data analyst", "Инженер по данным"]
-Skills: ["Spring, SQL", "Tableau, Excel", "ETL, Airflow, Python"]
+[[0,"Ведущий разработчик Java","spring, sql"],[1,"Data analyst","excel, tableau"],[2,"Инженер по данным","airflow, etl, python"]]
 
 ### Example Output:
-Backend Developer, Data Analyst, Data Engineer
+[[0,"Backend Developer"],[1,"Data Analyst"],[2,"Data Engineer"]]
 
 ---
 ### New Input to Process:
-Title: {titles}
-Skills: {skills}
+{jobs}
 
 ### Output:
 """
 
-    for i in range(0, len(titles), batch_size):
-        titles_batch = titles[i:i + batch_size]
-        skills_batch = skills[i:i + batch_size]
 
-        prompt = prompt_template.format(
-            valid_titles=", ".join(config.VALID_JOB_TITLES),
-            titles=titles_batch,
-            skills=skills_batch
-        )
+def prompt_version() -> str:
+    """Identifies the prompt (template and valid titles) that cached answers were given to."""
+    text = PROMPT_TEMPLATE + "\n".join(config.VALID_JOB_TITLES)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
 
-        print(f"\n--- Sending batch {i//batch_size + 1} to AI for title identification ---")
 
-        try:
-            response = model.generate_content(prompt)
+def normalize_title(title) -> str:
+    """Lower-cased title without punctuation or repeated spaces (the cache key form)."""
+    title = re.sub(r'[^\w\s]', '', str(title).strip())  # Remove all special characters (except spaces)
+    return re.sub(r'\s+', ' ', title).strip().lower()
+
+
+def normalize_skills(skills) -> str:
+    """Order- and case-independent form of a skills list (or its string form from a CSV)."""
+    if isinstance(skills, str):
+        skills = skills.strip("[]").replace("'", "").split(",")
+    elif not isinstance(skills, (list, tuple, set)):
+        return ""
+    return ", ".join(sorted({str(skill).strip().lower() for skill in skills} - {""}))
+
+
+def estimate_tokens(text: str) -> int:
+    """Local token count estimate: ~4 Latin characters per token, ~2 for Cyrillic and other scripts."""
+    non_ascii = sum(1 for char in text if ord(char) > 127)
+    return (len(text) - non_ascii) // 4 + non_ascii // 2 + 1
+
+
+def _encode_job(job_id, title, skills, max_skills):
+    """Compact prompt form of one job: [id, title, first `max_skills` skills]."""
+    skill_list = normalize_skills(skills).split(", ")
+    return json.dumps(
+        [job_id, str(title).strip()[:MAX_TITLE_CHARS], ", ".join(skill_list[:max_skills])],
+        ensure_ascii=False, separators=(",", ":")
+    )
+
 
-            if not response.text:
-                raise ValueError("Empty AI response")
+def _build_prompt(encoded_jobs):
+    return PROMPT_TEMPLATE.format(
+        valid_titles=", ".join(config.VALID_JOB_TITLES),
+        jobs="[" + ",".join(encoded_jobs) + "]"
+    )
 
-            identified = [t.strip() for t in response.text.strip().split(',')]
 
-            if len(identified) == len(titles_batch):
-                all_identified_titles.extend(identified)
-                print(f"  ✅ AI response received for batch: {identified}")
+def _pack_batches(jobs, token_budget, max_items, max_skills):
+    """
+    Groups jobs ({key: (title, skills)}) into requests of at most `token_budget`
+    estimated tokens (instructions once, plus each job and its answer) and
+    `max_items` jobs. Returns the keys of each request.
+    """
+    overhead = estimate_tokens(_build_prompt([]))
+    batches, batch, used = [], [], overhead
+    for key, (title, skills) in jobs.items():
+        cost = estimate_tokens(_encode_job(len(batch), title, skills, max_skills)) + 1 + OUTPUT_TOKENS_PER_ITEM
+        if batch and (used + cost > token_budget or len(batch) >= max_items):
+            batches.append(batch)
+            batch, used = [], overhead
+        batch.append(key)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+class _TokenUsage:
+    """Tokens spent across worker threads; actual counts when the API reports them."""
+
+    def __init__(self):
+        self.requests = 0
+        self.tokens = 0
+        self.estimated = False
+        self._lock = threading.Lock()
+
+    def add(self, response, estimate):
+        metadata = getattr(response, 'usage_metadata', None)
+        total = getattr(metadata, 'total_token_count', None)
+        with self._lock:
+            self.requests += 1
+            if isinstance(total, int):
+                self.tokens += total
             else:
-                print(f"  ❌ AI response mismatch. Expected {len(titles_batch)} titles, got {len(identified)}. Filling with 'unknown'.")
-                all_identified_titles.extend(['unknown'] * len(titles_batch))
+                self.tokens += estimate
+                self.estimated = True
+
+
+def _status_of(error):
+    # google.api_core exceptions carry the HTTP status as `code`
+    code = getattr(error, 'code', None)
+    return int(code) if isinstance(code, int) else None
+
+
+def _parse_labels(text, batch_len):
+    """
+    Reads the model's JSON answer. Returns {item id: label} for the items whose
+    id is in range and whose label is a valid title or "unknown"; the rest are dropped.
+    """
+    text = JSON_FENCE_PATTERN.sub("", (text or "").strip())
+    try:
+        answer = json.loads(text)
+    except ValueError:
+        return {}
+    if isinstance(answer, dict):
+        answer = answer.get("jobs") or answer.get("results") or [answer]
+    if not isinstance(answer, list):
+        return {}
+
+    valid = set(config.VALID_JOB_TITLES) | {'unknown'}
+    labels = {}
+    for item in answer:
+        if isinstance(item, list) and len(item) == 2:
+            item_id, label = item
+        elif isinstance(item, dict):
+            item_id, label = item.get("id"), item.get("title")
+        else:
+            continue
+        if isinstance(item_id, int) and 0 <= item_id < batch_len and isinstance(label, str) and label.strip() in valid:
+            labels[item_id] = label.strip()
+    return labels
+
+
+def _request_labels(model, limiter, usage, batch_number, titles_batch, skills_batch, max_skills,
+                    max_retries=4, backoff_base=2.0):
+    """
+    Sends one request, retrying throttled and 5xx responses.
 
+    Returns:
+        dict or None: {position in the batch: label} for the valid items of the
+        answer (possibly empty), or None if the API call itself failed.
+    """
+    prompt = _build_prompt([
+        _encode_job(i, title, skills, max_skills)
+        for i, (title, skills) in enumerate(zip(titles_batch, skills_batch))
+    ])
+    tokens = estimate_tokens(prompt) + OUTPUT_TOKENS_PER_ITEM * len(titles_batch)
+
+    for attempt in range(max_retries + 1):
+        limiter.acquire(tokens)
+        try:
+            response = model.generate_content(prompt)
         except Exception as e:
-            print(f"  ❌ AI API Error for batch: {e}. Filling with 'unknown'.")
-            all_identified_titles.extend(['unknown'] * len(titles_batch))
+            status = _status_of(e)
+            if status in RETRYABLE_STATUSES and attempt < max_retries:
+                delay = backoff_base * 2 ** attempt * random.uniform(0.5, 1.5)
+                if status == 429:
+                    # The quota is shared, so hold every worker rather than only this one
+                    limiter.pause(delay)
+                print(f"  ⚠️ Batch {batch_number}: API returned {status}. Retrying in {delay:.1f}s.")
+                time.sleep(delay)
+                continue
+            print(f"  ❌ AI API Error for batch {batch_number}: {e}.")
+            return None
+        usage.add(response, tokens)
+        return _parse_labels(getattr(response, 'text', None), len(titles_batch))
+    return None
+
+
+def _classify_batch(model, limiter, usage, batch_number, titles_batch, skills_batch, max_skills, max_retries=4):
+    """
+    Classifies one batch, keeping every valid item of each answer.
+
+    Items missing from an answer or labelled with an invalid title are sent again on
+    their own; if a request salvages nothing, its items are split in halves and each
+    half retried, down to single items.
+
+    Returns:
+        list: One label per job, None where no valid label was obtained.
+    """
+    labels = [None] * len(titles_batch)
+    pending = [list(range(len(titles_batch)))]
+    requests_made = 0
+    while pending:
+        positions = pending.pop()
+        answer = _request_labels(
+            model, limiter, usage, batch_number,
+            [titles_batch[i] for i in positions], [skills_batch[i] for i in positions],
+            max_skills, max_retries=max_retries
+        )
+        requests_made += 1
+        if answer is None:
+            continue  # API failure, already retried; splitting would not help
+        for item_id, label in answer.items():
+            labels[positions[item_id]] = label
+        missing = [position for item_id, position in enumerate(positions) if item_id not in answer]
+        if not missing:
+            continue
+        if answer:
+            pending.append(missing)
+        elif len(missing) > 1:
+            half = len(missing) // 2
+            pending.extend([missing[half:], missing[:half]])
+
+    resolved = sum(label is not None for label in labels)
+    mark = "✅" if resolved == len(labels) else "⚠️"
+    print(f"  {mark} Batch {batch_number}: {resolved}/{len(labels)} titles identified in {requests_made} requests.")
+    return labels
+
+
+def identify_job_titles(titles: list, skills: list, batch_size=None, model=None, workers=None,
+                        limiter=None, max_retries=None, cache=None, token_budget=None, failed_label='unknown') -> list:
+    """
+    Identifies job titles using Google Gemini API in batches.
+    Returns a list of identified titles corresponding to the input.
+
+    Jobs are reduced to unique (normalized title, normalized skills) keys and looked
+    up in the classification cache first; only misses are sent, each with the first
+    original title it came from. They are packed into
+    requests up to a token budget, several in flight at once on `workers` threads,
+    paced by the configured requests- and tokens-per-minute quotas. Answers are
+    cached and broadcast back to every job.
+
+    Args:
+        titles (list): Job titles to classify.
+        skills (list): Skills of each job, aligned with `titles`.
+        batch_size (int): Maximum jobs per request (config.AI_MAX_BATCH_ITEMS).
+        model: Object with a generate_content(prompt) method returning a response
+            with `.text`; defaults to the configured Gemini model.
+        workers (int): Concurrent requests.
+        limiter (QuotaLimiter): Shared quota; built from config if not given.
+        max_retries (int): Retries of a batch after 429/5xx responses.
+        cache (ClassificationCache): Earlier answers; the default file if not given.
+        token_budget (int): Estimated tokens per request (config.AI_BATCH_TOKEN_BUDGET).
+        failed_label: Returned for jobs that got no valid answer (API failure or
+            unusable reply), as opposed to the model answering "unknown".
+    """
+    if len(titles) != len(skills):
+        raise ValueError("titles и skills должны быть одной длины")
+
+    keys = [(normalize_title(title), normalize_skills(skill)) for title, skill in zip(titles, skills)]
+    # The key only finds cached answers; the model gets the first original title of
+    # each key, since normalizing merges "C++" with "C#" and turns ".NET" into "net"
+    originals = {}
+    for key, title, skill in zip(keys, titles, skills):
+        originals.setdefault(key, (title, skill))
+    unique_keys = list(originals)
+
+    if model is None:
+        import google.generativeai as genai  # only needed for the real API, not for a given model
+        genai.configure(api_key=config.API_KEY)
+        model = genai.GenerativeModel(MODEL_NAME, generation_config={"response_mime_type": "application/json"})
+    model_name = getattr(model, 'model_name', None) or type(model).__name__
+    version = prompt_version()
+
+    owns_cache = cache is None
+    cache = cache or ClassificationCache()
+    try:
+        labels = cache.get_many(unique_keys, model_name, version)
+        pending = [key for key in unique_keys if key not in labels]
+        print(f"\n--- AI title identification: {len(titles)} jobs, {len(unique_keys)} unique, "
+              f"{len(labels)} cached, {len(pending)} to send ---")
+        if pending:
+            new_labels = _classify_pending(
+                {key: originals[key] for key in pending}, model, workers, limiter, max_retries,
+                token_budget=token_budget or getattr(config, 'AI_BATCH_TOKEN_BUDGET', 4000),
+                max_items=batch_size or getattr(config, 'AI_MAX_BATCH_ITEMS', 100),
+                max_skills=getattr(config, 'AI_MAX_SKILLS', 8)
+            )
+            cache.put_many(new_labels, model_name, version)
+            labels.update(new_labels)
+    finally:
+        if owns_cache:
+            cache.close()
+
+    return [labels.get(key, failed_label) for key in keys]
+
+
+def _classify_pending(jobs, model, workers, limiter, max_retries, token_budget, max_items, max_skills):
+    """
+    Sends the uncached jobs ({key: (original title, skills)}) in packed batches.
+    Returns {key: label} for the keys that got a valid label.
+    """
+    workers = workers or getattr(config, 'AI_WORKERS', 4)
+    limiter = limiter or QuotaLimiter(
+        getattr(config, 'AI_REQUESTS_PER_MINUTE', 15),
+        getattr(config, 'AI_TOKENS_PER_MINUTE', 1000000)
+    )
+    max_retries = getattr(config, 'AI_MAX_RETRIES', 4) if max_retries is None else max_retries
+    usage = _TokenUsage()
+
+    batches = _pack_batches(jobs, token_budget, max_items, max_skills)
+    print(f"Sending {len(batches)} batches (up to {token_budget} tokens each) on {workers} workers.")
+
+    def classify(numbered_batch):
+        batch_number, batch = numbered_batch
+        return _classify_batch(
+            model, limiter, usage, batch_number,
+            [jobs[key][0] for key in batch], [jobs[key][1] for key in batch],
+            max_skills, max_retries=max_retries
+        )
 
-        time.sleep(5)
+    labels = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # map() yields in submission order, so results line up with their batch
+        for batch, identified in zip(batches, executor.map(classify, enumerate(batches, start=1))):
+            labels.update((key, label) for key, label in zip(batch, identified) if label is not None)
 
-    return all_identified_titles
+    per_row = usage.tokens / len(labels) if labels else float(usage.tokens)
+    print(f"AI usage: {usage.requests} requests, {'~' if usage.estimated else ''}{usage.tokens} tokens, "
+          f"{per_row:.0f} tokens per classified title.")
+    return labels
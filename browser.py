@@ -0,0 +1,70 @@
+# browser.py
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+# Requests the scraper never needs: we only read text and the logo's src attribute.
+# Patterns use Chrome's Network.setBlockedURLs wildcard syntax.
+BLOCKED_URL_PATTERNS = [
+    # Images and media (the logo URL is still read from the DOM)
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Third-party analytics, ads and trackers
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*mc.yandex.ru*", "*yandex.ru/ads*",
+    "*facebook.net*", "*connect.facebook.com*", "*vk.com/rtrg*",
+    "*top-fwz1.mail.ru*", "*hotjar.com*", "*criteo.com*",
+]
+
+
+def create_driver(headless=True, lean=False, blocked_url_patterns=None):
+    """
+    Creates a Chrome WebDriver for scraping.
+
+    Args:
+        headless (bool): Run Chrome without a visible window (used by pool workers).
+        lean (bool): Eager page loads plus no images, media, fonts or third-party trackers.
+        blocked_url_patterns (list): Overrides BLOCKED_URL_PATTERNS in lean mode.
+
+    Returns:
+        webdriver.Chrome: A ready-to-use driver. The caller is responsible for quit().
+    """
+    options = webdriver.ChromeOptions()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1366,900")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-dev-shm-usage")
+
+    if lean:
+        # Return from get() once the DOM is parsed instead of waiting for every subresource
+        options.page_load_strategy = "eager"
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.media_stream": 2,
+        })
+
+    driver = webdriver.Chrome(options=options)
+
+    if lean:
+        block_resources(driver, blocked_url_patterns or BLOCKED_URL_PATTERNS)
+    return driver
+
+
+def block_resources(driver, patterns):
+    """
+    Applies a URL block list to the driver's current tab.
+
+    CDP blocking is per tab, so this must be called again after switching to a new
+    tab. Does nothing when `patterns` is empty (drivers not in lean mode).
+    """
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    except WebDriverException as e:
+        print(f"⚠️ Could not enable resource blocking: {e}")
@@ -0,0 +1,84 @@
+# classification_cache.py
+import os
+import time
+import sqlite3
+import threading
+
+
+class ClassificationCache:
+    """
+    SQLite store of earlier job-title classifications.
+
+    Keys are (model, prompt version, normalized title, normalized skills), so
+    changing the model or the prompt starts from an empty cache instead of reusing
+    answers to a different question.
+
+    Args:
+        path (str): SQLite file shared across runs.
+    """
+
+    def __init__(self, path=os.path.join('Data', 'classification_cache.sqlite')):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS classifications (
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                title_key TEXT NOT NULL,
+                skills_key TEXT NOT NULL,
+                label TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (model, prompt_version, title_key, skills_key)
+            )
+        """)
+        self._conn.commit()
+
+    def get_many(self, keys, model, prompt_version):
+        """Returns {(title_key, skills_key): label} for the keys that are cached."""
+        found = {}
+        with self._lock:
+            for title_key, skills_key in keys:
+                row = self._conn.execute(
+                    "SELECT label FROM classifications "
+                    "WHERE model = ? AND prompt_version = ? AND title_key = ? AND skills_key = ?",
+                    (model, prompt_version, title_key, skills_key)
+                ).fetchone()
+                if row is not None:
+                    found[(title_key, skills_key)] = row[0]
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, labels, model, prompt_version):
+        """Stores {(title_key, skills_key): label} in one transaction."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO classifications "
+                "(model, prompt_version, title_key, skills_key, label, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(model, prompt_version, title_key, skills_key, label, now)
+                 for (title_key, skills_key), label in labels.items()]
+            )
+            self._conn.commit()
+
+    def labeled_titles(self, prompt_version):
+        """Every (title_key, label) answered to `prompt_version`, by any model, except "unknown"."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT DISTINCT title_key, label FROM classifications "
+                "WHERE prompt_version = ? AND label <> 'unknown'",
+                (prompt_version,)
+            ).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
@@ -1,7 +1,6 @@
 import pandas as pd
 import os
-import pyodbc
-import traceback
+import database
 
 def collect_into_dataframe(job_ids, company_names, job_titles, location_jobs,
                            post_dates, technical_skills, salary, company_logo_urls,
@@ -39,53 +38,9 @@ def collect_into_dataframe(job_ids, company_names, job_titles, location_jobs,
     df.to_csv(file_path, index=False, encoding='utf-8')
     print(f"✅ Raw data saved to '{file_path}'.")
 
-    # INSERT to SQL Server — replace placeholders below
-    insert_to_sql_server(
-        df,
-        server="localhost",           # 🔁 change to your server
-        database="YourDatabaseName",  # 🔁 change to your DB
-        table_name="YourTableName",   # 🔁 change to your table
-        username="your_username",     # 🔁 change to your login
-        password="your_password"      # 🔁 change to your password
-    )
+    # Upsert into the configured database (config.DB_CONFIG)
+    insert_to_sql_server(df)
 
-def insert_to_sql_server(df, server, database, table_name, username, password):
-    """Inserts DataFrame into SQL Server table using pyodbc."""
-    conn_str = (
-        f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-        f"SERVER={server};DATABASE={database};UID={username};PWD={password};"
-    )
-
-    try:
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
-        print("✅ Connected to SQL Server.")
-
-        # Clean Posted_date column to valid datetime.date
-        df['Posted_date'] = pd.to_datetime(df['Posted_date'], errors='coerce').dt.date
-
-        insert_query = f"""
-            INSERT INTO {table_name} (
-                ID, Posted_date, Job_Title_from_List, Job_Title,
-                Company, Company_Logo_URL, Country, Location,
-                Skills, Salary_Info, Source
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
-
-        cursor.fast_executemany = True
-        rows = [tuple(row) for row in df.itertuples(index=False)]
-
-        cursor.executemany(insert_query, rows)
-        conn.commit()
-        print(f"✅ Inserted {len(rows)} rows into table '{table_name}'.")
-
-    except Exception as e:
-        print("❌ SQL Server Error:")
-        traceback.print_exc()
-    finally:
-        try:
-            cursor.close()
-            conn.close()
-            print("🔒 SQL connection closed.")
-        except:
-            pass
+def insert_to_sql_server(df, db_config=None):
+    """Upserts the DataFrame through the shared database session (default config.DB_CONFIG)."""
+    database.insert_to_sql(df, db_config)
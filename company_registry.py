@@ -0,0 +1,243 @@
+# company_registry.py
+import os
+import re
+import time
+import sqlite3
+import threading
+from collections import defaultdict
+import pandas as pd
+from transliterate import translit
+
+# Legal-form words dropped from the matching key, in Russian, Uzbek and English
+LEGAL_FORMS = {
+    "ooo", "ao", "ip", "zao", "pao", "oao", "chp", "mchj", "xk", "aj",
+    "llc", "ltd", "inc", "jsc", "corp", "co", "plc", "gmbh",
+}
+_PUNCTUATION_PATTERN = re.compile(r"[^\w]+")
+_CYRILLIC_PATTERN = re.compile(r"[а-яА-ЯёЁ]")
+
+
+def company_key(name: str) -> str:
+    """
+    Matching form of a company name: transliterated, lower-cased, without punctuation
+    or legal forms. "ООО «Uzum Market»" and "Uzum market LLC" both give "uzum market".
+    """
+    if _CYRILLIC_PATTERN.search(name):
+        try:
+            name = translit(name, 'ru', reversed=True)
+        except Exception:
+            pass
+    tokens = _PUNCTUATION_PATTERN.sub(" ", name.lower()).split()
+    return " ".join(token for token in tokens if token not in LEGAL_FORMS)
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _similarity(grams_a, grams_b):
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+class CompanyRegistry:
+    """
+    Persistent registry of canonical companies and the raw names seen for them.
+
+    Exact raw names are memoized in memory and on disk, so a name seen in any earlier
+    run resolves with one dict lookup. A new name is matched by its key (see
+    company_key); failing that, approximately against the companies that share
+    trigrams with it (the blocking index), and otherwise registered as a new company.
+
+    A one-word name may also stand for the only company whose key starts with that
+    word ("UZUM" for "Uzum Market"). Such aliases are dropped again once a second
+    company with the same first word is registered, as the word is then ambiguous.
+
+    Args:
+        path (str): SQLite file kept across runs.
+        threshold (float): Minimum trigram similarity (Dice) for a fuzzy match.
+        min_prefix_len (int): Shortest one-word name accepted as an abbreviation,
+            e.g. "UZUM" for "Uzum Market".
+    """
+
+    def __init__(self, path=os.path.join('Data', 'company_registry.sqlite'), threshold=0.8, min_prefix_len=4):
+        self.path = path
+        self.threshold = threshold
+        self.min_prefix_len = min_prefix_len
+        self._lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS companies (
+                id INTEGER PRIMARY KEY,
+                canonical_name TEXT NOT NULL,
+                name_key TEXT NOT NULL UNIQUE,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS company_aliases (
+                alias TEXT PRIMARY KEY,
+                company_id INTEGER NOT NULL REFERENCES companies (id),
+                created_at REAL NOT NULL,
+                prefix_word TEXT NULL
+            )
+        """)
+        # Registries written before abbreviation aliases were tracked
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(company_aliases)")}
+        if 'prefix_word' not in columns:
+            self._conn.execute("ALTER TABLE company_aliases ADD COLUMN prefix_word TEXT NULL")
+        self._conn.commit()
+        self._load()
+
+    def _load(self):
+        self.names = {}      # company id -> canonical name
+        self._aliases = {}   # raw name -> company id
+        self._keys = {}      # name key -> company id
+        self._company_keys = {}  # company id -> name key
+        self._index = defaultdict(set)  # trigram -> company ids
+        self._by_first_word = defaultdict(set)  # first word of the key -> company ids
+        self._prefix_aliases = defaultdict(set)  # word -> raw names matched as its abbreviation
+        for company_id, canonical_name, key in self._conn.execute("SELECT id, canonical_name, name_key FROM companies"):
+            self._index_company(company_id, canonical_name, key)
+        for alias, company_id, prefix_word in self._conn.execute(
+                "SELECT alias, company_id, prefix_word FROM company_aliases"):
+            self._aliases[alias] = company_id
+            if prefix_word is not None:
+                self._prefix_aliases[prefix_word].add(alias)
+
+    def _index_company(self, company_id, canonical_name, key):
+        self.names[company_id] = canonical_name
+        self._keys[key] = company_id
+        self._company_keys[company_id] = key
+        for gram in _trigrams(key):
+            self._index[gram].add(company_id)
+        if key:
+            self._by_first_word[key.split()[0]].add(company_id)
+
+    def _fuzzy_match(self, key):
+        grams = _trigrams(key)
+        candidates = set()
+        for gram in grams:
+            candidates |= self._index.get(gram, set())
+
+        best_id, best_score = None, self.threshold
+        for company_id in candidates:
+            score = _similarity(grams, _trigrams(self._company_keys[company_id]))
+            if score >= best_score:
+                best_id, best_score = company_id, score
+        return best_id
+
+    def _prefix_match(self, key):
+        """
+        "UZUM" -> "uzum market": a one-word key stands for the only company whose key
+        starts with that word. A longer name never matches a shorter key ("Uzum Bank"
+        is not "UZUM"), and two candidates ("Uzum Market", "Uzum Bank") mean no match.
+        """
+        if " " in key or len(key) < self.min_prefix_len:
+            return None
+        matches = self._by_first_word.get(key, set())
+        return next(iter(matches)) if len(matches) == 1 else None
+
+    def resolve(self, name):
+        """
+        Returns (company_id, canonical_name) for a raw company name, registering it
+        as a new company if nothing matches. Returns (None, name) for empty or "N/A".
+        """
+        if not isinstance(name, str) or not name.strip() or name == "N/A":
+            return None, name
+        name = " ".join(name.split())
+        with self._lock:
+            company_id = self._aliases.get(name)
+            if company_id is None:
+                company_id = self._resolve_new(name)
+            return company_id, self.names[company_id]
+
+    def _resolve_new(self, name):
+        key = company_key(name) or name.lower()
+        company_id = self._keys.get(key)
+        if company_id is None:
+            company_id = self._fuzzy_match(key)
+        prefix_word = None
+        if company_id is None:
+            company_id = self._prefix_match(key)
+            prefix_word = key if company_id is not None else None
+        now = time.time()
+        if company_id is None:
+            cursor = self._conn.execute(
+                "INSERT INTO companies (canonical_name, name_key, created_at) VALUES (?, ?, ?)", (name, key, now)
+            )
+            company_id = cursor.lastrowid
+            self._index_company(company_id, name, key)
+            self._drop_ambiguous_prefix_aliases(key.split()[0])
+        self._conn.execute(
+            "INSERT OR REPLACE INTO company_aliases (alias, company_id, created_at, prefix_word) VALUES (?, ?, ?, ?)",
+            (name, company_id, now, prefix_word)
+        )
+        self._conn.commit()
+        self._aliases[name] = company_id
+        if prefix_word is not None:
+            self._prefix_aliases[prefix_word].add(name)
+        return company_id
+
+    def _drop_ambiguous_prefix_aliases(self, word):
+        """Forgets the abbreviation matches of `word` once two companies start with it."""
+        if len(self._by_first_word.get(word, ())) < 2 or not self._prefix_aliases.get(word):
+            return
+        aliases = self._prefix_aliases.pop(word)
+        self._conn.executemany("DELETE FROM company_aliases WHERE alias = ?", [(alias,) for alias in aliases])
+        for alias in aliases:
+            self._aliases.pop(alias, None)
+        print(f"  ⚠️ '{word}' now starts {len(self._by_first_word[word])} company names; "
+              f"{len(aliases)} abbreviation matches will be resolved again.")
+
+    def add_alias(self, name, company_id):
+        """Manually maps a raw name to an existing company, overriding any earlier match."""
+        name = " ".join(name.split())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO company_aliases (alias, company_id, created_at) VALUES (?, ?, ?)",
+                (name, company_id, time.time())
+            )
+            self._conn.commit()
+            self._aliases[name] = company_id
+            for aliases in self._prefix_aliases.values():
+                aliases.discard(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+def resolve_companies(df: pd.DataFrame, column='Company', registry=None) -> pd.DataFrame:
+    """
+    Replaces every name in `column` with its canonical name and adds a Company_ID
+    column. Each distinct name is resolved once.
+    """
+    if df.empty:
+        return df
+
+    print("\n--- Resolving company names ---")
+    owns_registry = registry is None
+    registry = CompanyRegistry() if owns_registry else registry
+    known = len(registry)
+    try:
+        resolved = {name: registry.resolve(name) for name in df[column].unique()}
+    finally:
+        if owns_registry:
+            registry.close()
+
+    df['Company_ID'] = pd.array([resolved[name][0] for name in df[column]], dtype='Int64')
+    df[column] = [resolved[name][1] for name in df[column]]
+    canonical = len({company_id for company_id, _ in resolved.values() if company_id is not None})
+    print(f"Resolved {len(resolved)} distinct names to {canonical} companies "
+          f"({len(registry) - known} new in the registry).")
+    return df
@@ -1,26 +1,29 @@
 # database.py
-import pandas as pd
-import pyodbc
+import time
+import queue
+import hashlib
+import sqlite3
+import threading
 import traceback
+from contextlib import contextmanager
+from functools import lru_cache
+import pandas as pd
 import config
+import migrations
 
-def insert_to_sql(df: pd.DataFrame, db_config: dict):
-    """
-    Connects to SQL Server and inserts the DataFrame data.
-    Deletes existing records with the same ID before inserting.
+try:
+    import pyodbc
+except ImportError:  # optional: only SQL Server needs it, SQLite works without
+    pyodbc = None
 
-    Args:
-        df (pd.DataFrame): The DataFrame to insert.
-        db_config (dict): Contains connection parameters and target table name.
-
-    Returns:
-        None
-    """
-    if df.empty:
-        print("⚠️ DataFrame is empty. No data to insert into the database.")
-        return
+# Errors of either driver; db_config['dialect'] picks SQL Server (default) or SQLite
+DB_ERRORS = (sqlite3.Error,) + ((pyodbc.Error,) if pyodbc else ())
+# Errors caused by the rows themselves; anything else (lost connection, locks, bad SQL)
+# would fail for every row and leaves the connection suspect
+DATA_ERRORS = (sqlite3.DataError, sqlite3.IntegrityError) + ((pyodbc.DataError, pyodbc.IntegrityError) if pyodbc else ())
 
-    conn_str = (
+def _connection_string(db_config: dict) -> str:
+    return (
         f"DRIVER={db_config['driver']};"
         f"SERVER={db_config['server']};"
         f"DATABASE={db_config['database']};"
@@ -29,78 +32,450 @@ def insert_to_sql(df: pd.DataFrame, db_config: dict):
         "Connection Timeout=30;"
     )
 
+def _table_exists(cursor, dialect: str, table_name: str) -> bool:
+    if dialect == 'sqlite':
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,))
+    else:
+        cursor.execute("SELECT COUNT(*) FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = ?", (table_name,))
+    return cursor.fetchone()[0] > 0
+
+class DatabaseSession:
+    """
+    Process-wide access to one database: a pool of open connections and a schema
+    that is migrated once per table and process (see migrations.py).
+
+    Use get_session() rather than building sessions directly, so every stage and
+    worker of a run shares the same pool.
+
+    Args:
+        db_config (dict): Connection parameters and default table name, as in config.DB_CONFIG.
+        pool_size (int): Idle connections kept open (config.DB_POOL_SIZE, default 4).
+    """
+
+    def __init__(self, db_config: dict, pool_size=None):
+        self.db_config = dict(db_config)
+        self.dialect = self.db_config.get('dialect', 'mssql')
+        self.pool_size = pool_size or getattr(config, 'DB_POOL_SIZE', 4)
+        self.opened = 0
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._migrated = set()
+
+    def _open(self):
+        if self.dialect == 'sqlite':
+            conn = sqlite3.connect(self.db_config['database'], timeout=30, check_same_thread=False)
+        else:
+            if pyodbc is None:
+                raise ImportError("SQL Server connections require the 'pyodbc' package")
+            conn = pyodbc.connect(_connection_string(self.db_config))
+        self.opened += 1
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """
+        Lends a pooled connection, opening one if none is idle. It goes back to the
+        pool afterwards, or is closed if it failed with a driver error.
+        """
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+        try:
+            yield conn
+        except DB_ERRORS:
+            conn.close()
+            raise
+        except BaseException:
+            conn.rollback()
+            self._release(conn)
+            raise
+        self._release(conn)
+
+    def _release(self, conn):
+        if self._idle.qsize() < self.pool_size:
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+    def ensure_schema(self, table_name=None) -> str:
+        """
+        Migrates `table_name` (default: the configured table) to the latest schema
+        the first time it is used in this process.
+
+        Returns:
+            str: The table name to use in SQL (schema-qualified on SQL Server).
+        """
+        table_name = table_name or self.db_config['table_name']
+        if table_name not in self._migrated:
+            with self._lock:
+                if table_name not in self._migrated:
+                    with self.connection() as conn:
+                        migrations.apply_migrations(conn, self.dialect, table_name)
+                    self._migrated.add(table_name)
+        return table_name if self.dialect == 'sqlite' else f"dbo.{table_name}"
+
+    def close(self):
+        """Closes the idle connections; connections on loan are closed when returned."""
+        self.pool_size = 0
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(db_config=None) -> DatabaseSession:
+    """
+    The shared DatabaseSession for `db_config` (default config.DB_CONFIG), created on first use.
+    """
+    db_config = db_config or config.DB_CONFIG
+    key = tuple(sorted((name, str(value)) for name, value in db_config.items()))
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = DatabaseSession(db_config)
+        return _sessions[key]
+
+def load_known_ids(db_config=None) -> set:
+    """
+    Loads the IDs already stored in the target table (used by incremental scraping).
+
+    Args:
+        db_config (dict): Contains connection parameters and target table name
+            (default config.DB_CONFIG).
+
+    Returns:
+        set: Stored vacancy IDs as strings. Empty if the table is missing or unreachable.
+    """
+    session = get_session(db_config)
+    table_name = session.db_config['table_name']
+    try:
+        with session.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                if not _table_exists(cursor, session.dialect, table_name):
+                    return set()
+                cursor.execute(f"SELECT ID FROM {table_name}")
+                known_ids = {str(row[0]) for row in cursor.fetchall()}
+            finally:
+                cursor.close()
+        print(f"Loaded {len(known_ids)} known IDs from '{table_name}'.")
+        return known_ids
+    except DB_ERRORS as db_error:
+        print(f"⚠️ Could not load known IDs from the database: {db_error}")
+        return set()
+
+# Structured salary fields (see salary.py), typed so range queries can use the index
+SALARY_SQL_COLUMNS = migrations.SALARY_COLUMNS
+
+# Columns written by insert_to_sql, in table order
+TABLE_COLUMNS = [
+    'ID', 'Posted_date', 'Job_Title_from_List', 'Job_Title', 'Company',
+    'Company_Logo_URL', 'Country', 'Location', 'Skills', 'Salary_Info', 'Source'
+] + list(SALARY_SQL_COLUMNS) + ['Company_ID']
+
+# Nullable numeric columns whose missing values arrive as NaN / pd.NA
+_NUMERIC_COLUMNS = list(SALARY_SQL_COLUMNS) + ['Company_ID']
+
+@lru_cache(maxsize=64)
+def upsert_sql(dialect: str, table: str, columns: list, key='ID') -> dict:
+    """
+    SQL for a staged upsert of `columns` (a tuple) into `table`, keyed by `key`.
+    Built once per process and argument set, so every chunk and connection sends
+    identical statement text and hits the driver's and server's statement caches.
+
+    Returns:
+        dict: 'create_staging' (an empty copy of the target's columns), 'insert_staging'
+        (one parameterized row), 'merge' (set-based insert-or-update from the staging
+        table) and 'drop_staging'.
+    """
+    column_list = ", ".join(columns)
+    placeholders = ", ".join(["?"] * len(columns))
+    updates = [column for column in columns if column != key]
+    if dialect == 'sqlite':
+        staging = "temp.upsert_staging"
+        return {
+            'create_staging': f"CREATE TEMP TABLE upsert_staging AS SELECT {column_list} FROM {table} WHERE 0",
+            'insert_staging': f"INSERT INTO {staging} ({column_list}) VALUES ({placeholders})",
+            # "WHERE true" keeps SQLite from reading ON CONFLICT as a join constraint
+            'merge': f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} WHERE true "
+                     f"ON CONFLICT ({key}) DO UPDATE SET "
+                     + ", ".join(f"{column} = excluded.{column}" for column in updates),
+            'drop_staging': f"DROP TABLE IF EXISTS {staging}",
+        }
+
+    staging = "#upsert_staging"
+    return {
+        'create_staging': f"SELECT TOP 0 {column_list} INTO {staging} FROM {table}",
+        'insert_staging': f"INSERT INTO {staging} ({column_list}) VALUES ({placeholders})",
+        'merge': f"""
+        MERGE {table} WITH (HOLDLOCK) AS target
+        USING {staging} AS source
+        ON target.{key} = source.{key}
+        WHEN MATCHED THEN UPDATE SET {', '.join(f'target.{column} = source.{column}' for column in updates)}
+        WHEN NOT MATCHED BY TARGET THEN INSERT ({column_list})
+            VALUES ({', '.join(f'source.{column}' for column in columns)});
+        """,
+        'drop_staging': f"IF OBJECT_ID('tempdb..{staging}') IS NOT NULL DROP TABLE {staging}",
+    }
+
+def upsert_rows(conn, dialect: str, table: str, columns: list, rows: list, key='ID') -> int:
+    """
+    Inserts or updates `rows` (sequences in `columns` order) in one transaction:
+    rows are bulk-loaded into a temporary staging table, then merged into `table`
+    with a single set-based statement. Nothing is committed if any step fails.
+
+    Returns:
+        int: Number of distinct keys written.
+    """
+    key_index = columns.index(key)
+    # The last row wins for a repeated key, as MERGE rejects duplicate source keys
+    rows = list({row[key_index]: row for row in rows if row[key_index] is not None}.values())
+    if not rows:
+        return 0
+
+    sql = upsert_sql(dialect, table, tuple(columns), key)
+    cursor = conn.cursor()
+    try:
+        # A staging table left over from a failed call on this connection
+        cursor.execute(sql['drop_staging'])
+        cursor.execute(sql['create_staging'])
+        if dialect != 'sqlite':
+            cursor.fast_executemany = True
+        cursor.executemany(sql['insert_staging'], rows)
+        cursor.execute(sql['merge'])
+        cursor.execute(sql['drop_staging'])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+    return len(rows)
+
+def _iter_chunks(rows, chunk_size):
+    """Regroups an iterable of row tuples and/or DataFrame chunks into lists of `chunk_size` rows."""
+    chunk = []
+    for item in rows:
+        items = item.itertuples(index=False, name=None) if isinstance(item, pd.DataFrame) else [item]
+        for row in items:
+            chunk.append(tuple(row))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def _write_chunk(conn, dialect, table, columns, chunk, key, stats):
+    """
+    Upserts one chunk; if a row is rejected, retries each half, down to the single
+    bad rows. Other driver errors are raised, as no split would get past them.
+    """
     try:
-        conn = pyodbc.connect(conn_str)
-        cursor = conn.cursor()
-        print("\n--- ✅ Connected to SQL Server ---")
-
-        # Ensure table exists
-        create_table_query = f"""
-        IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = '{db_config['table_name']}')
-        BEGIN
-            CREATE TABLE dbo.{db_config['table_name']} (
-                ID NVARCHAR(100) PRIMARY KEY,
-                Posted_date DATE NULL,
-                Job_Title_from_List NVARCHAR(255) NULL,
-                Job_Title NVARCHAR(255) NULL,
-                Company NVARCHAR(255) NULL,
-                Company_Logo_URL NVARCHAR(MAX) NULL,
-                Country NVARCHAR(100) NULL,
-                Location NVARCHAR(255) NULL,
-                Skills NVARCHAR(MAX) NULL,
-                Salary_Info NVARCHAR(255) NULL,
-                Source NVARCHAR(255) NULL,
-                IngestionTimestamp DATETIME2 DEFAULT GETDATE()
+        stats['written'] += upsert_rows(conn, dialect, table, columns, chunk, key)
+        stats['keys'].extend(row[columns.index(key)] for row in chunk)
+    except DATA_ERRORS as db_error:
+        if len(chunk) == 1:
+            stats['failed'] += 1
+            print(f"  ❌ Skipping row {chunk[0][columns.index(key)]}: {db_error}")
+            return
+        half = len(chunk) // 2
+        _write_chunk(conn, dialect, table, columns, chunk[:half], key, stats)
+        _write_chunk(conn, dialect, table, columns, chunk[half:], key, stats)
+
+# Stored with every row by write_rows (migration 4)
+FINGERPRINT_COLUMN = 'Row_Hash'
+LAST_SEEN_COLUMN = 'Last_Seen'
+
+# Scraped content of a vacancy: the same for every loader (insert_to_sql writes more
+# columns than push_to_data_base), so a row written by one is unchanged for the other.
+# Salary_* and Company_ID are derived from these columns.
+FINGERPRINTED_COLUMNS = [
+    'Posted_date', 'Job_Title_from_List', 'Job_Title', 'Company', 'Company_Logo_URL',
+    'Country', 'Location', 'Skills', 'Salary_Info', 'Source'
+]
+
+# Keeps IN lists under the parameter limits of both SQLite and SQL Server (2100)
+_KEYS_PER_STATEMENT = 500
+
+def _fingerprint_value(value) -> str:
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return " ".join(str(value).split())
+
+def row_fingerprint(row, columns) -> str:
+    """SHA-1 of the FINGERPRINTED_COLUMNS of a row in `columns` order (missing ones
+    count as empty), normalized so that whitespace, 5 vs 5.0 and NaN vs None do not
+    count as changes."""
+    values = dict(zip(columns, row))
+    return hashlib.sha1(
+        "\x1f".join(_fingerprint_value(values.get(column)) for column in FINGERPRINTED_COLUMNS).encode('utf-8')
+    ).hexdigest()
+
+def _key_slices(keys):
+    for start in range(0, len(keys), _KEYS_PER_STATEMENT):
+        yield keys[start:start + _KEYS_PER_STATEMENT]
+
+def _stored_fingerprints(conn, table: str, key: str, keys: list) -> dict:
+    """Returns {key: stored fingerprint} for the `keys` already in `table`."""
+    stored = {}
+    cursor = conn.cursor()
+    try:
+        for keys_slice in _key_slices(keys):
+            cursor.execute(
+                f"SELECT {key}, {FINGERPRINT_COLUMN} FROM {table} WHERE {key} IN ({', '.join(['?'] * len(keys_slice))})",
+                keys_slice
+            )
+            stored.update((str(row[0]), row[1]) for row in cursor.fetchall())
+    finally:
+        cursor.close()
+    return stored
+
+def _touch_rows(conn, table: str, key: str, keys: list, seen_at: str):
+    """Sets only the last-seen time of unchanged rows."""
+    cursor = conn.cursor()
+    try:
+        for keys_slice in _key_slices(keys):
+            cursor.execute(
+                f"UPDATE {table} SET {LAST_SEEN_COLUMN} = ? WHERE {key} IN ({', '.join(['?'] * len(keys_slice))})",
+                [seen_at] + keys_slice
             )
-        END
-        """
-        cursor.execute(create_table_query)
         conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
 
-        # Delete existing records to prevent primary key violations
-        ids_to_insert = df['ID'].dropna().tolist()
-        if ids_to_insert:
-            placeholders = ','.join(['?'] * len(ids_to_insert))
-            delete_query = f"DELETE FROM {db_config['table_name']} WHERE ID IN ({placeholders})"
-            cursor.execute(delete_query, *ids_to_insert)
-            conn.commit()
-            print(f"Deleted {cursor.rowcount} old records to prepare for new insertion.")
-
-        # Ensure correct column order
-        columns = [
-            'ID', 'Posted_date', 'Job_Title_from_List', 'Job_Title', 'Company',
-            'Company_Logo_URL', 'Country', 'Location', 'Skills', 'Salary_Info', 'Source'
-        ]
-        df = df[columns]
+def _split_unchanged(conn, table, columns, key, chunk, seen_at):
+    """
+    Fingerprints `chunk` and compares it with the stored fingerprints in bulk.
+
+    Returns:
+        tuple: (rows to upsert with fingerprint and last-seen appended, keys of unchanged rows)
+    """
+    key_index = columns.index(key)
+    # The last row wins for a repeated key, as in upsert_rows
+    rows = {row[key_index]: row for row in chunk if row[key_index] is not None}
+    stored = _stored_fingerprints(conn, table, key, list(rows))
+
+    changed, unchanged = [], []
+    for row_key, row in rows.items():
+        fingerprint = row_fingerprint(row, columns)
+        if stored.get(str(row_key)) == fingerprint:
+            unchanged.append(row_key)
+        else:
+            changed.append(tuple(row) + (fingerprint, seen_at))
+    return changed, unchanged
+
+def write_rows(conn, dialect: str, table: str, columns: list, rows, chunk_size=None, key='ID') -> dict:
+    """
+    Streams rows into `table`, upserting and committing one chunk at a time, so
+    memory and driver buffers stay bounded by the chunk size, and one bad row only
+    costs its own chunk a few retries. Connection and other operational errors are
+    raised, leaving the chunks committed so far in place.
+
+    Each row is fingerprinted (see row_fingerprint) and compared with the stored
+    fingerprints: only new and changed rows are upserted, unchanged rows just get
+    their Last_Seen time updated. `table` needs the Row_Hash and Last_Seen columns.
+
+    Args:
+        rows: Iterable of row tuples in `columns` order, or of DataFrame chunks
+            with those columns (e.g. pd.read_csv(..., chunksize=...)).
+        chunk_size (int): Rows per transaction (config.DB_CHUNK_SIZE, default 1000).
+
+    Returns:
+        dict: Rows 'written', 'unchanged' and 'failed', 'rows_per_sec' (rows handled)
+        and 'keys', the keys of every row now stored (written or unchanged).
+    """
+    chunk_size = chunk_size or getattr(config, 'DB_CHUNK_SIZE', 1000)
+    write_columns = list(columns) + [FINGERPRINT_COLUMN, LAST_SEEN_COLUMN]
+    seen_at = time.strftime('%Y-%m-%d %H:%M:%S')
+    stats = {'written': 0, 'unchanged': 0, 'failed': 0, 'keys': []}
+    started = time.perf_counter()
+    for chunk_number, chunk in enumerate(_iter_chunks(rows, chunk_size), start=1):
+        changed, unchanged = _split_unchanged(conn, table, columns, key, chunk, seen_at)
+        if changed:
+            _write_chunk(conn, dialect, table, write_columns, changed, key, stats)
+        if unchanged:
+            # Already stored with this content, whether or not the touch below succeeds
+            stats['keys'].extend(unchanged)
+            try:
+                _touch_rows(conn, table, key, unchanged, seen_at)
+                stats['unchanged'] += len(unchanged)
+            except DATA_ERRORS as db_error:
+                print(f"  ⚠️ Could not update Last_Seen of {len(unchanged)} unchanged rows: {db_error}")
+        handled = stats['written'] + stats['unchanged']
+        elapsed = time.perf_counter() - started
+        print(f"  Chunk {chunk_number}: {stats['written']} rows written, {stats['unchanged']} unchanged, "
+              f"{stats['failed']} failed ({handled / max(elapsed, 1e-9):.0f} rows/sec)")
+    handled = stats['written'] + stats['unchanged']
+    stats['rows_per_sec'] = round(handled / max(time.perf_counter() - started, 1e-9), 1)
+    return stats
+
+def _prepare_chunks(df: pd.DataFrame, dialect: str, chunk_size: int):
+    """Yields `df` in table column order, converted for the driver one chunk at a time."""
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size].reindex(columns=TABLE_COLUMNS)
+
+        # Numeric salary and company id columns: NaN / pd.NA are not valid SQL values
+        for column in _NUMERIC_COLUMNS:
+            chunk[column] = chunk[column].astype(object).where(chunk[column].notna(), None)
+
+        # Skills arrive as lists from the scraper
+        chunk['Skills'] = chunk['Skills'].map(lambda skills: ", ".join(skills) if isinstance(skills, list) else skills)
 
         # Clean Posted_date column
-        df['Posted_date'] = pd.to_datetime(df['Posted_date'], errors='coerce')
-        df['Posted_date'] = df['Posted_date'].apply(lambda x: x.date() if pd.notnull(x) else None)
+        dates = pd.to_datetime(chunk['Posted_date'], errors='coerce')
+        chunk['Posted_date'] = [
+            (x.date().isoformat() if dialect == 'sqlite' else x.date()) if pd.notnull(x) else None
+            for x in dates
+        ]
+        yield chunk
 
-        # Prepare data for insertion
-        rows_to_insert = df.values.tolist()
+def insert_to_sql(df: pd.DataFrame, db_config=None, chunk_size=None):
+    """
+    Upserts the DataFrame data by ID through the shared session for `db_config`,
+    one committed chunk at a time (see write_rows).
 
-        insert_query = f"""
-        INSERT INTO {db_config['table_name']} (
-            ID, Posted_date, Job_Title_from_List, Job_Title, Company, 
-            Company_Logo_URL, Country, Location, Skills, Salary_Info, Source
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
+    Args:
+        df (pd.DataFrame): The DataFrame to insert.
+        db_config (dict): Contains connection parameters and target table name
+            (default config.DB_CONFIG); 'dialect': 'sqlite' with 'database' as the
+            file path for a local SQLite copy.
+        chunk_size (int): Rows per transaction (config.DB_CHUNK_SIZE, default 1000).
 
-        cursor.fast_executemany = True
-        cursor.executemany(insert_query, rows_to_insert)
-        conn.commit()
-        print(f"✅ Successfully inserted {len(rows_to_insert)} rows into the database.")
+    Returns:
+        dict: write_rows statistics, including the 'keys' now stored; None if the
+        load failed.
+    """
+    if df.empty:
+        print("⚠️ DataFrame is empty. No data to insert into the database.")
+        return {'written': 0, 'unchanged': 0, 'failed': 0, 'keys': [], 'rows_per_sec': 0.0}
+
+    session = get_session(db_config)
+    dialect = session.dialect
+    chunk_size = chunk_size or getattr(config, 'DB_CHUNK_SIZE', 1000)
+    try:
+        target = session.ensure_schema()
+        with session.connection() as conn:
+            print(f"\n--- ✅ Connected to {'SQLite' if dialect == 'sqlite' else 'SQL Server'} "
+                  f"({session.opened} connections opened this run) ---")
+            stats = write_rows(conn, dialect, target, TABLE_COLUMNS, _prepare_chunks(df, dialect, chunk_size), chunk_size)
+        print(f"✅ Upserted {stats['written']} new or changed rows and touched {stats['unchanged']} unchanged "
+              f"rows at {stats['rows_per_sec']} rows/sec"
+              + (f"; {stats['failed']} rows rejected." if stats['failed'] else "."))
+        return stats
 
-    except pyodbc.Error as db_error:
+    except DB_ERRORS as db_error:
         print(f"❌ Database Error: {db_error}")
         traceback.print_exc()
     except Exception as e:
         print(f"❌ An unexpected error occurred during database operation: {e}")
         traceback.print_exc()
-    finally:
-        if 'cursor' in locals():
-            cursor.close()
-        if 'conn' in locals() and conn:
-            conn.close()
-            print("--- Connection to SQL Server closed. ---")
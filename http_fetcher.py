@@ -0,0 +1,132 @@
+# http_fetcher.py
+import time
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import html as lxml_html
+import locators as sel
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
+}
+
+# Raw vacancy fields and the locator each one is read from (same as GhhScraper._read_fields)
+FIELD_XPATHS = {
+    "company": sel.company_name_xpath,
+    "title": sel.job_title_xpath,
+    "location_date": sel.location_and_date_xpath,
+    "skills": sel.skills_xpath,
+    "salary": sel.salary_info_xpath,
+}
+LOGO_XPATH = sel.company_logo_url_xpath
+
+# A vacancy without these is treated as a locator miss and re-read in the browser.
+# Salary, skills and logo are legitimately absent on many vacancies.
+REQUIRED_FIELDS = ("title", "company", "location_date")
+
+
+def _xpath_text(tree, xpath):
+    """
+    Returns the whitespace-normalized text of the first match, or None.
+
+    Text nodes are joined with spaces: text_content() would glue adjacent elements
+    together ("<li>Python</li><li>SQL</li>" -> "PythonSQL"), where the browser's
+    innerText separates them.
+    """
+    matches = tree.xpath(xpath)
+    if not matches:
+        return None
+    first = matches[0]
+    text = first if isinstance(first, str) else " ".join(first.itertext())
+    text = " ".join(text.split())
+    return text or None
+
+
+def _xpath_attribute(tree, xpath, attribute, page_url):
+    matches = tree.xpath(xpath)
+    if not matches:
+        return None
+    first = matches[0]
+    value = first if isinstance(first, str) else first.get(attribute)
+    if not value:
+        return None
+    # Selenium returns the resolved URL for src/href, so do the same here
+    return urljoin(page_url, value) if page_url else value
+
+
+def extract_fields_from_html(page_source, page_url=None):
+    """
+    Evaluates the vacancy locators on static HTML.
+
+    Args:
+        page_source (str): Raw HTML of a vacancy page.
+        page_url (str): URL the page was loaded from, used to resolve the logo URL.
+
+    Returns:
+        dict: Raw field values keyed like FIELD_XPATHS plus 'logo_url'; missing ones are None.
+    """
+    tree = lxml_html.fromstring(page_source)
+    fields = {name: _xpath_text(tree, xpath) for name, xpath in FIELD_XPATHS.items()}
+    fields["logo_url"] = _xpath_attribute(tree, LOGO_XPATH, "src", page_url)
+    return fields
+
+
+def extract_listing_from_html(page_source, page_url=None):
+    """
+    Returns (vacancy hrefs, has_next_page) for a search results page.
+    """
+    tree = lxml_html.fromstring(page_source)
+    hrefs = []
+    for el in tree.xpath(sel.job_list_urls_xpath):
+        href = el if isinstance(el, str) else el.get("href")
+        if href:
+            hrefs.append(urljoin(page_url, href) if page_url else href)
+    has_next = bool(tree.xpath(sel.next_button_xpath))
+    return hrefs, has_next
+
+
+def has_required_fields(fields):
+    return all(fields.get(name) for name in REQUIRED_FIELDS)
+
+
+class HttpFetcher:
+    """Downloads listing and vacancy pages over a pooled keep-alive session."""
+
+    def __init__(self, pool_size=10, timeout=10, headers=None, rate=None):
+        self.timeout = timeout
+        # Optional rate_control.RateController shared with the browser fetchers
+        self.rate = rate
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url):
+        if self.rate:
+            self.rate.acquire(url)
+        started = time.monotonic()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException:
+            if self.rate:
+                self.rate.record(url, time.monotonic() - started, error=True)
+            raise
+        if self.rate:
+            self.rate.record(url, time.monotonic() - started, status=response.status_code)
+        response.raise_for_status()
+        return response.text
+
+    def fetch_listing(self, url):
+        return extract_listing_from_html(self.get(url), url)
+
+    def fetch_job_fields(self, url):
+        return extract_fields_from_html(self.get(url), url)
+
+    def close(self):
+        self.session.close()
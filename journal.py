@@ -0,0 +1,115 @@
+# journal.py
+import os
+import json
+import threading
+
+RESULT_COLUMNS = [
+    "ID", "Posted_date", "Job_Title", "Company",
+    "Company_Logo_URL", "Location", "Skills", "Salary_Info",
+    "Salary_Min", "Salary_Max", "Salary_Median", "Salary_Currency", "Salary_Is_Gross"
+]
+
+
+class ScrapeJournal:
+    """
+    Crash-safe, append-only JSON Lines log of a scrape.
+
+    Two kinds of lines are written:
+        {"type": "job", "page": 3, "record": {...}}   one extracted vacancy
+        {"type": "page", "page": 3}                   every vacancy of page 3 is finished
+
+    Job lines are fsync'd every `fsync_every` records and at each completed page,
+    so at most one batch is lost on a crash.
+    """
+
+    def __init__(self, path=os.path.join('Data', 'scrape_journal.jsonl'), fsync_every=50):
+        self.path = path
+        self.fsync_every = fsync_every
+        self._file = None
+        self._unsynced = 0
+        self._lock = threading.Lock()
+
+    def open(self, resume=False):
+        """Opens the journal for appending. Without `resume` any previous journal is discarded."""
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+        return self
+
+    def append_record(self, record, page_num):
+        line = self._line({"type": "job", "page": page_num, "record": record})
+        with self._lock:
+            self._file.write(line)
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every:
+                self._sync_locked()
+
+    def mark_page_done(self, page_num):
+        line = self._line({"type": "page", "page": page_num})
+        with self._lock:
+            self._file.write(line)
+            self._sync_locked()
+
+    @staticmethod
+    def _line(entry):
+        return json.dumps(entry, ensure_ascii=False, default=str) + "\n"
+
+    def _sync_locked(self):
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def sync(self):
+        with self._lock:
+            self._sync_locked()
+
+    def close(self):
+        """Flushes, fsyncs and closes the journal; safe to call more than once."""
+        with self._lock:
+            if self._file is not None:
+                self._sync_locked()
+                self._file.close()
+                self._file = None
+
+    def _entries(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from a crash mid-write
+                    continue
+
+    def resume_state(self, start_page=0):
+        """
+        Returns (next_page, done_ids): the first page from `start_page` on that is not
+        fully completed, and the IDs already extracted (including those of a partially
+        finished page).
+        """
+        done_pages = set()
+        done_ids = set()
+        for entry in self._entries():
+            if entry.get("type") == "page":
+                done_pages.add(entry["page"])
+            elif entry.get("type") == "job":
+                done_ids.add(str(entry["record"]["ID"]))
+        next_page = start_page
+        while next_page in done_pages:
+            next_page += 1
+        return next_page, done_ids
+
+    def read_results(self):
+        """Rebuilds the scraper's column dict from every record in the journal."""
+        results = {column: [] for column in RESULT_COLUMNS}
+        for entry in self._entries():
+            if entry.get("type") != "job":
+                continue
+            record = entry["record"]
+            for column in RESULT_COLUMNS:
+                results[column].append(record.get(column))
+        return results
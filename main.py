@@ -1,13 +1,18 @@
 # main.py
 import os
+import argparse
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.support.ui import WebDriverWait
 
 # Import from our refactored modules
 import config
+import browser
 from scraper import GhhScraper
-import ai_processing
+from seen_ids import SeenIdStore
+from journal import ScrapeJournal
+import sharding
+import translation_stage
+import company_registry
+import title_classifier
 import database
 
 def clean_and_prepare_data(df: pd.DataFrame) -> pd.DataFrame:
@@ -27,32 +32,79 @@ def clean_and_prepare_data(df: pd.DataFrame) -> pd.DataFrame:
     print(f"Dropped duplicate listings: {initial_rows} -> {len(df_cleaned)} rows.")
 
     db_columns = [
-        'ID', 'Posted_date', 'Job_Title_from_List', 'Job_Title', 'Company', 
-        'Company_Logo_URL', 'Country', 'Location', 'Skills', 'Salary_Info', 'Source'
+        'ID', 'Posted_date', 'Job_Title_from_List', 'Job_Title', 'Company', 'Company_ID',
+        'Company_Logo_URL', 'Country', 'Location', 'Skills', 'Salary_Info', 'Source',
+        'Salary_Min', 'Salary_Max', 'Salary_Median', 'Salary_Currency', 'Salary_Is_Gross'
     ]
     final_df = df_cleaned.reindex(columns=db_columns, fill_value='N/A')
 
     return final_df
 
-def main():
-    """Main function to orchestrate the scraping and data processing pipeline."""
+def settled_ids(df_raw: pd.DataFrame, df_cleaned: pd.DataFrame, stored_keys) -> list:
+    """
+    IDs of the vacancies that reached a final state and count as seen: stored in the
+    database, or deliberately dropped by clean_and_prepare_data. Jobs the AI could not
+    classify (no Job_Title_from_List) stay unseen, so the next run tries them again.
+    """
+    unclassified = set(df_raw.loc[df_raw['Job_Title_from_List'].isna(), 'ID'].astype(str))
+    dropped = set(df_raw['ID'].astype(str)) - set(df_cleaned['ID'].astype(str)) - unclassified
+    return [str(job_id) for job_id in stored_keys] + sorted(dropped)
+
+def main(resume=False, shards=0):
+    """
+    Main function to orchestrate the scraping and data processing pipeline.
+
+    Args:
+        resume (bool): Continue the crawl recorded in the scrape journal from the last
+            completed page instead of starting from page 0.
+        shards (int): Crawl page ranges on this many worker processes (see sharding.py);
+            at most config.SCRAPER_MAX_CONCURRENCY.
+    """
     print("--- Starting Job Scraper ---")
     if config.SCRAPE_LIMIT:
         print(f"⚠️ Running in test mode. Scrape limit is set to {config.SCRAPE_LIMIT} jobs.")
 
-    driver = webdriver.Chrome()
-    wait = WebDriverWait(driver, 10)
+    known_ids = None
+    seen_store = SeenIdStore()
+    if getattr(config, 'INCREMENTAL', False):
+        known_ids = seen_store.load() | database.load_known_ids(config.DB_CONFIG)
+        print(f"Incremental mode: {len(known_ids)} known vacancy IDs will be skipped.")
 
+    driver = None
+    journal = None
     try:
         # --- 2. SCRAPE DATA ---
-        scraper = GhhScraper(driver, wait, limit=config.SCRAPE_LIMIT)
-        scraped_data = scraper.scrape()
-
-        if not scraped_data or 'ID' not in scraped_data or not scraped_data['ID']:
+        if shards:
+            df_raw = sharding.run_sharded(shards, known_ids=known_ids, resume=resume)
+        else:
+            journal = ScrapeJournal(getattr(config, 'SCRAPE_JOURNAL_PATH', os.path.join('Data', 'scrape_journal.jsonl')))
+            start_page = 0
+            if resume:
+                start_page, done_ids = journal.resume_state()
+                known_ids = (known_ids or set()) | done_ids
+                print(f"Resuming from page {start_page}; {len(done_ids)} vacancies already in the journal.")
+            journal.open(resume=resume)
+
+            driver = browser.create_driver(
+                headless=getattr(config, 'BROWSER_HEADLESS', False),
+                lean=getattr(config, 'BROWSER_LEAN', False),
+                blocked_url_patterns=getattr(config, 'BROWSER_BLOCKED_URLS', None)
+            )
+            scraper = GhhScraper.from_config(driver, known_ids=known_ids, journal=journal, start_page=start_page)
+            scraped_data = scraper.scrape()
+            df_raw = pd.DataFrame(scraped_data)
+
+        if df_raw.empty:
             print("Scraping returned no data. Exiting.")
             return
 
-        df_raw = pd.DataFrame(scraped_data)
+        df_raw = translation_stage.translate_titles(
+            df_raw,
+            batch_size=getattr(config, 'TRANSLATION_BATCH_SIZE', 50),
+            workers=getattr(config, 'TRANSLATION_WORKERS', 4)
+        )
+
+        df_raw = company_registry.resolve_companies(df_raw)
 
         # Save raw data
         data_folder = 'Data'
@@ -65,7 +117,9 @@ def main():
         titles_to_identify = df_raw['Job_Title'].tolist()
         skills_to_identify = df_raw['Skills'].tolist()
 
-        identified_titles = ai_processing.identify_job_titles(titles_to_identify, skills_to_identify)
+        # None marks jobs the AI could not classify (quota, outage), so they stay unseen
+        identified_titles = title_classifier.identify_job_titles(titles_to_identify, skills_to_identify,
+                                                                 failed_label=None)
         if len(identified_titles) != len(df_raw):
             print("❌ AI returned mismatched title count. Exiting.")
             return
@@ -82,15 +136,28 @@ def main():
         print(f"✅ Cleaned data with {len(df_cleaned)} rows saved to '{cleaned_file_path}'")
 
         # --- 5. PUSH TO DATABASE ---
-        database.insert_to_sql(df_cleaned, config.DB_CONFIG)
+        stats = database.insert_to_sql(df_cleaned, config.DB_CONFIG)
+
+        if getattr(config, 'INCREMENTAL', False) and stats is not None:
+            seen_store.add(settled_ids(df_raw, df_cleaned, stats['keys']))
 
     except Exception as e:
         print(f"❌ Fatal error: {e}")
         import traceback
         traceback.print_exc()
     finally:
-        driver.quit()
+        if journal is not None:
+            journal.close()
+        if driver is not None:
+            driver.quit()
         print("\n--- Process complete. Browser closed. ---")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Scrape hh.uz vacancies and load them into SQL Server.")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue the last crawl from its journal instead of starting over")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="crawl page ranges on this many worker processes "
+                             "(at most SCRAPER_MAX_CONCURRENCY)")
+    args = parser.parse_args()
+    main(resume=args.resume, shards=args.shards)
@@ -0,0 +1,170 @@
+# migrations.py
+"""
+Versioned schema of the vacancy table, applied by database.DatabaseSession.
+
+Each migration has a version, a description and, per dialect, a list of steps:
+SQL strings with a {table} placeholder, or callables taking (cursor, table).
+Applied versions are recorded per table in schema_migrations, so a process only
+runs the steps it has not seen. Steps are written so they are also safe on tables
+created before migrations were tracked. Add new migrations at the end; never edit
+an applied one.
+"""
+import time
+
+
+def _sqlite_add_columns(columns):
+    def step(cursor, table):
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row[1] for row in cursor.fetchall()}
+        for column, sql_type in columns.items():
+            if column not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {sql_type}")
+    return step
+
+
+def _mssql_add_columns(columns):
+    return [
+        f"IF COL_LENGTH('dbo.{{table}}', '{column}') IS NULL ALTER TABLE dbo.{{table}} ADD {column} {sql_type}"
+        for column, sql_type in columns.items()
+    ]
+
+
+SALARY_COLUMNS = {
+    'Salary_Min': 'BIGINT NULL',
+    'Salary_Max': 'BIGINT NULL',
+    'Salary_Median': 'BIGINT NULL',
+    'Salary_Currency': 'CHAR(3) NULL',
+    'Salary_Is_Gross': 'BIT NULL',
+}
+
+MIGRATIONS = [
+    (1, "create vacancy table", {
+        'mssql': ["""
+        IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = '{table}')
+        BEGIN
+            CREATE TABLE dbo.{table} (
+                ID NVARCHAR(100) PRIMARY KEY,
+                Posted_date DATE NULL,
+                Job_Title_from_List NVARCHAR(255) NULL,
+                Job_Title NVARCHAR(255) NULL,
+                Company NVARCHAR(255) NULL,
+                Company_Logo_URL NVARCHAR(MAX) NULL,
+                Country NVARCHAR(100) NULL,
+                Location NVARCHAR(255) NULL,
+                Skills NVARCHAR(MAX) NULL,
+                Salary_Info NVARCHAR(255) NULL,
+                Source NVARCHAR(255) NULL,
+                IngestionTimestamp DATETIME2 DEFAULT GETDATE()
+            )
+        END
+        """],
+        'sqlite': ["""
+        CREATE TABLE IF NOT EXISTS {table} (
+            ID TEXT PRIMARY KEY,
+            Posted_date DATE NULL,
+            Job_Title_from_List TEXT NULL,
+            Job_Title TEXT NULL,
+            Company TEXT NULL,
+            Company_Logo_URL TEXT NULL,
+            Country TEXT NULL,
+            Location TEXT NULL,
+            Skills TEXT NULL,
+            Salary_Info TEXT NULL,
+            Source TEXT NULL,
+            IngestionTimestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """],
+    }),
+    (2, "numeric salary columns", {
+        'mssql': _mssql_add_columns(SALARY_COLUMNS) + ["""
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_{table}_Salary_Median')
+            CREATE INDEX IX_{table}_Salary_Median ON dbo.{table} (Salary_Median)
+            INCLUDE (Salary_Min, Salary_Max, Salary_Currency)
+        """],
+        'sqlite': [
+            _sqlite_add_columns(SALARY_COLUMNS),
+            "CREATE INDEX IF NOT EXISTS IX_{table}_Salary_Median ON {table} (Salary_Median)",
+        ],
+    }),
+    (3, "canonical company id", {
+        'mssql': _mssql_add_columns({'Company_ID': 'INT NULL'}) + ["""
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_{table}_Company_ID')
+            CREATE INDEX IX_{table}_Company_ID ON dbo.{table} (Company_ID)
+        """],
+        'sqlite': [
+            _sqlite_add_columns({'Company_ID': 'INTEGER NULL'}),
+            "CREATE INDEX IF NOT EXISTS IX_{table}_Company_ID ON {table} (Company_ID)",
+        ],
+    }),
+    (4, "row fingerprint and last seen", {
+        'mssql': _mssql_add_columns({'Row_Hash': 'CHAR(40) NULL', 'Last_Seen': 'DATETIME2 NULL'}),
+        'sqlite': [_sqlite_add_columns({'Row_Hash': 'TEXT NULL', 'Last_Seen': 'TIMESTAMP NULL'})],
+    }),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+_VERSION_TABLE = {
+    'mssql': """
+    IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = 'schema_migrations')
+        CREATE TABLE dbo.schema_migrations (
+            table_name NVARCHAR(128) NOT NULL,
+            version INT NOT NULL,
+            description NVARCHAR(255) NULL,
+            applied_at DATETIME2 NOT NULL,
+            PRIMARY KEY (table_name, version)
+        )
+    """,
+    'sqlite': """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        table_name TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        description TEXT NULL,
+        applied_at TIMESTAMP NOT NULL,
+        PRIMARY KEY (table_name, version)
+    )
+    """,
+}
+
+
+def current_version(cursor, table):
+    cursor.execute("SELECT MAX(version) FROM schema_migrations WHERE table_name = ?", (table,))
+    row = cursor.fetchone()
+    return row[0] or 0 if row else 0
+
+
+def apply_migrations(conn, dialect, table):
+    """
+    Brings `table` up to LATEST_VERSION, one committed transaction per migration.
+
+    Returns:
+        list: Versions applied by this call.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(_VERSION_TABLE[dialect])
+        conn.commit()
+        applied = []
+        version = current_version(cursor, table)
+        for number, description, steps in MIGRATIONS:
+            if number <= version:
+                continue
+            try:
+                for step in steps[dialect]:
+                    if callable(step):
+                        step(cursor, table)
+                    else:
+                        cursor.execute(step.format(table=table))
+                cursor.execute(
+                    "INSERT INTO schema_migrations (table_name, version, description, applied_at) VALUES (?, ?, ?, ?)",
+                    (table, number, description, time.strftime('%Y-%m-%d %H:%M:%S'))
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            print(f"  Applied migration {number} to '{table}': {description}")
+            applied.append(number)
+        return applied
+    finally:
+        cursor.close()
@@ -1,9 +1,15 @@
 # processing.py
 import re
 import locale
+import threading
+from functools import lru_cache
 from datetime import datetime
 from deep_translator import GoogleTranslator
 from transliterate import translit
+from translation_cache import TranslationCache
+from skills import SkillMatcher
+import salary
+from regions import resolve_region
 
 # Установим локаль, если нужно обрабатывать русские даты (зависит от ОС)
 try:
@@ -11,16 +17,28 @@ try:
 except locale.Error:
     pass  # Windows может не поддерживать ru_RU, обрабатываем через альтернативу
 
+# Скомпилированные шаблоны (общие с processing_vectorized.py)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+LOCATION_PATTERN = re.compile(
+    r"\b(?:в|in|da)\s+([a-zA-Zа-яА-ЯёЁўқғҳʼ\- ]+(?:,?\s?[a-zA-Zа-яА-ЯёЁўқғҳʼ\- ]+)?)\b"
+)
+COMPANY_SUFFIXES = ["ООО", "АО", "ИП", "ЗАО", "ПАО", "ОАО"]
+# Русские месяцы для parse_posted_date, пример: "12 июля 2024"
+RUSSIAN_MONTHS = {
+    'января': 'January', 'февраля': 'February', 'марта': 'March', 'апреля': 'April',
+    'мая': 'May', 'июня': 'June', 'июля': 'July', 'августа': 'August',
+    'сентября': 'September', 'октября': 'October', 'ноября': 'November', 'декабря': 'December'
+}
+
 # --- 1. Company Name Transliteration ---
 def transliterate_company_name(company_name: str) -> str:
-    suffixes = ["ООО", "АО", "ИП", "ЗАО", "ПАО", "ОАО"]
-    for suffix in suffixes:
+    for suffix in COMPANY_SUFFIXES:
         company_name = company_name.replace(suffix, "").strip()
     try:
         transliterated_name = translit(company_name, 'ru', reversed=True)
     except Exception:
         transliterated_name = company_name
-    return re.sub(r'\s+', ' ', transliterated_name).strip()
+    return WHITESPACE_PATTERN.sub(' ', transliterated_name).strip()
 
 # --- 2. Date Parsing ---
 def parse_posted_date(raw_date: str) -> str:
@@ -33,13 +51,7 @@ def parse_posted_date(raw_date: str) -> str:
             try:
                 date_obj = datetime.strptime(raw_date, "%d %B %Y")
             except:
-                # Пример: "12 июля 2024"
-                month_map = {
-                    'января': 'January', 'февраля': 'February', 'марта': 'March', 'апреля': 'April',
-                    'мая': 'May', 'июня': 'June', 'июля': 'July', 'августа': 'August',
-                    'сентября': 'September', 'октября': 'October', 'ноября': 'November', 'декабря': 'December'
-                }
-                for ru, en in month_map.items():
+                for ru, en in RUSSIAN_MONTHS.items():
                     if ru in raw_date.lower():
                         raw_date = raw_date.lower().replace(ru, en)
                         break
@@ -49,60 +61,61 @@ def parse_posted_date(raw_date: str) -> str:
         return None
 
 # --- 3. Skills Extraction ---
-def extract_skills(text: str, skill_list: list) -> list:
-    found_skills = set()
+def extract_skills(text: str, skills) -> list:
+    """
+    Returns the sorted canonical skill names found in `text`.
+    `skills` is a skills.SkillMatcher, or a plain list of skill names.
+    """
     if not text:
         return []
-    text_lower = text.lower()
-    for skill in skill_list:
-        if skill.lower() in text_lower:
-            found_skills.add(skill)
-    return sorted(found_skills)
+    if not isinstance(skills, SkillMatcher):
+        skills = _matcher_for_list(tuple(skills))
+    return skills.match(text)
+
+@lru_cache(maxsize=32)
+def _matcher_for_list(skill_names: tuple) -> SkillMatcher:
+    return SkillMatcher.from_list(skill_names)
 
 # --- 4. Location Extraction ---
 def extract_location_from_text(text: str) -> str:
     if not text:
         return "N/A"
-    location_pattern = r"\b(?:в|in|da)\s+([a-zA-Zа-яА-ЯёЁўқғҳʼ\- ]+(?:,?\s?[a-zA-Zа-яА-ЯёЁўқғҳʼ\- ]+)?)\b"
-    match = re.search(location_pattern, text)
+    match = LOCATION_PATTERN.search(text)
     if match:
         return match.group(1).strip()
     return "N/A"
 
-# --- 5. Salary Extraction ---
-def extract_salary(salary_text: str, usd_to_uzs=13000, rub_to_uzs=150) -> str:
-    if not salary_text:
+def identify_region(location: str) -> str:
+    """
+    Region code (e.g. "UZ-TK") of a location from extract_location_from_text. Places
+    outside the gazetteer ("Moscow", "Remote") are kept as they are; empty is "N/A".
+    """
+    if not location or location == "N/A":
         return "N/A"
+    return resolve_region(location) or location
 
-    salary_text_clean = salary_text.replace(",", "").replace(" ", "").lower()
+# --- 5. Salary Extraction ---
+def extract_salary(salary_text: str, posted_date=None) -> str:
+    """Median salary in UZS as a string, or "N/A". See salary.salary_fields for all fields."""
+    return salary.salary_fields(salary_text, posted_date)["Salary_Info"]
 
-    try:
-        # Диапазон: от ... до ...
-        range_match = re.search(r'(?:from|от)(\d+)(?:to|до)(\d+)', salary_text_clean)
-        if range_match:
-            min_salary = int(range_match.group(1))
-            max_salary = int(range_match.group(2))
-            median_salary = (min_salary + max_salary) // 2
-        else:
-            # Одиночная сумма
-            single_match = re.search(r'(\d+)', salary_text_clean)
-            if not single_match:
-                return "N/A"
-            median_salary = int(single_match.group(1))
+# --- 6. Text Translation ---
+_translation_cache = None
+_cache_lock = threading.Lock()
+_translators = threading.local()  # GoogleTranslator keeps per-request state, so one per thread
 
-        # Определение валюты
-        if "$" in salary_text or "usd" in salary_text.lower():
-            return str(int(median_salary * usd_to_uzs))
-        if "₽" in salary_text or "rub" in salary_text.lower():
-            return str(int(median_salary * rub_to_uzs))
-        if "so'm" in salary_text.lower() or "сум" in salary_text.lower() or "uzs" in salary_text.lower():
-            return str(median_salary)
+def get_translation_cache() -> TranslationCache:
+    global _translation_cache
+    with _cache_lock:
+        if _translation_cache is None:
+            _translation_cache = TranslationCache()
+        return _translation_cache
 
-        return "N/A"
-    except:
-        return "N/A"
+def _get_translator() -> GoogleTranslator:
+    if not hasattr(_translators, 'translator'):
+        _translators.translator = GoogleTranslator(source='auto', target='en')
+    return _translators.translator
 
-# --- 6. Text Translation ---
 def translate_to_english(text: str) -> str:
     try:
         cleaned_text = text.strip()
@@ -111,7 +124,13 @@ def translate_to_english(text: str) -> str:
         # Ограничим длину для устойчивости
         if len(cleaned_text) > 1000:
             cleaned_text = cleaned_text[:1000]
-        translated = GoogleTranslator(source='auto', target='en').translate(cleaned_text)
+        cache = get_translation_cache()
+        cached = cache.get(cleaned_text)
+        if cached is not None:
+            return cached
+        translated = _get_translator().translate(cleaned_text)
+        if translated:
+            cache.put(cleaned_text, translated)
         return translated
     except Exception:
         return text  # Возвращаем оригинал, если не удалось перевести
@@ -0,0 +1,258 @@
+# processing_vectorized.py
+"""
+Column-wise versions of the scalar helpers in processing.py, for re-processing
+large frames (e.g. replayed snapshots or historic CSVs).
+
+Every function takes a pandas Series of the raw strings the scraper produces
+("N/A" for missing values) and returns exactly what mapping the scalar
+function over the Series would return. Each column is factorized, the patterns
+shared with processing.py, salary.py and regions.py run over its distinct
+values with .str operations, and the results are broadcast back to every row.
+tests/benchmark_processing_vectorized.py compares the speed with the scalar code.
+"""
+import re
+from datetime import datetime
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from transliterate import translit
+import processing as proc
+import regions
+import salary
+
+# Longer amounts could overflow int64 once converted; those rows take salary.salary_fields
+MAX_VECTOR_AMOUNT_DIGITS = 12
+# Shapes "%d %B %Y" and "%B %d, %Y" can match once stripped. Only rows of that shape
+# are handed to strptime, which still decides whether they are dates.
+_DAY_FIRST_SHAPE = re.compile(r"\d{1,2}\s+.+\s+\d{4}")
+_MONTH_FIRST_SHAPE = re.compile(r".+\s+\d{1,2},\s+\d{4}")
+
+
+def _factorize(series: pd.Series):
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return codes, pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+
+
+def _broadcast(codes, unique_results, index) -> pd.Series:
+    results = np.empty(len(unique_results), dtype=object)
+    # Element-wise so list values (skills) are not broadcast into a 2-D array
+    for i, value in enumerate(unique_results):
+        results[i] = value
+    return pd.Series(results[codes], index=index, dtype=object)
+
+
+def _map_unique(series: pd.Series, func) -> pd.Series:
+    """Applies scalar `func` once per distinct value."""
+    codes, uniques = _factorize(series)
+    return _broadcast(codes, [func(value) for value in uniques], series.index)
+
+
+def _columnwise_on_unique(series: pd.Series, column_func) -> pd.Series:
+    """Runs a Series -> Series function over the distinct values only."""
+    codes, uniques = _factorize(series)
+    return pd.Series(column_func(uniques).to_numpy(dtype=object)[codes], index=series.index, dtype=object)
+
+
+@lru_cache(maxsize=1)
+def _translit_table():
+    """
+    translit(text, 'ru', reversed=True) as a str.translate table. Every rule of the
+    reversed Russian pack replaces a single Cyrillic letter, so the rules compose
+    into one table.
+    """
+    letters = [chr(code) for code in range(ord('А'), ord('я') + 1)] + ['Ё', 'ё']
+    return str.maketrans({letter: translit(letter, 'ru', reversed=True) for letter in letters})
+
+
+# --- 1. Company Name Transliteration ---
+def transliterate_company_name(names: pd.Series) -> pd.Series:
+    return _columnwise_on_unique(names, _transliterate_company_names)
+
+
+def _transliterate_company_names(names: pd.Series) -> pd.Series:
+    stripped = names
+    for suffix in proc.COMPANY_SUFFIXES:
+        stripped = stripped.str.replace(suffix, "", regex=False).str.strip()
+    transliterated = stripped.str.translate(_translit_table())
+    return transliterated.str.replace(proc.WHITESPACE_PATTERN, ' ', regex=True).str.strip()
+
+
+# --- 2. Date Parsing ---
+def parse_posted_date(raw_dates: pd.Series) -> pd.Series:
+    return _columnwise_on_unique(raw_dates, _parse_posted_dates)
+
+
+def _parse_posted_dates(raw_dates: pd.Series) -> pd.Series:
+    texts = raw_dates.str.strip()
+    has_comma = texts.str.contains(",", regex=False, na=False)
+    # Positions and labels coincide: `raw_dates` holds the distinct values from _factorize
+    result = np.full(len(texts), None, dtype=object)
+
+    month_first = texts[has_comma & texts.str.fullmatch(_MONTH_FIRST_SHAPE, na=False)]
+    result[month_first.index] = _strptime(month_first, "%B %d, %Y")
+    day_first = texts[~has_comma & texts.str.fullmatch(_DAY_FIRST_SHAPE, na=False)]
+    result[day_first.index] = _strptime(day_first, "%d %B %Y")
+
+    # Russian fallback: the first month of proc.RUSSIAN_MONTHS found in the
+    # lowercased text is replaced by its English name
+    lowered = texts.str.lower()
+    pending = ~has_comma & pd.isna(result)
+    for russian, english in proc.RUSSIAN_MONTHS.items():
+        found = pending & lowered.str.contains(russian, regex=False, na=False)
+        pending &= ~found
+        translated = lowered[found].str.replace(russian, english, regex=False)
+        translated = translated[translated.str.fullmatch(_DAY_FIRST_SHAPE).astype(bool)]
+        result[translated.index] = _strptime(translated, "%d %B %Y")
+    return pd.Series(result, dtype=object)
+
+
+def _strptime(texts: pd.Series, date_format) -> list:
+    """ISO dates of `texts` in `date_format`, None where strptime rejects them."""
+    def parse(text):
+        try:
+            return datetime.strptime(text, date_format).date().isoformat()
+        except ValueError:
+            return None
+    return _map_unique(texts, parse).tolist()
+
+
+# --- 4. Location Extraction ---
+def extract_location_from_text(texts: pd.Series) -> pd.Series:
+    return _columnwise_on_unique(texts, _extract_locations)
+
+
+def _extract_locations(texts: pd.Series) -> pd.Series:
+    locations = texts.str.extract(proc.LOCATION_PATTERN, expand=False).str.strip()
+    return locations.where(locations.notna(), "N/A").astype(object)
+
+
+def identify_region(locations: pd.Series) -> pd.Series:
+    return _columnwise_on_unique(locations, _identify_regions)
+
+
+def _identify_regions(locations: pd.Series) -> pd.Series:
+    gazetteer = regions.get_gazetteer()
+    # regions.text_keys, with token_key run once per distinct token
+    texts = locations.str.translate(regions.UZBEK_CYRILLIC).str.translate(_translit_table())
+    tokens = texts.str.lower().str.replace(regions.APOSTROPHES, "", regex=True).str.findall(regions.TOKEN_PATTERN)
+    keys = {token: regions.token_key(token) for token in tokens.explode().dropna().unique()}
+    codes = tokens.map(lambda row: gazetteer.resolve_keys([keys[token] for token in row]), na_action='ignore')
+    # Places outside the gazetteer keep their text, as in proc.identify_region
+    codes = codes.where(codes.notna(), locations)
+    return codes.mask(locations.isin(["", "N/A"]), "N/A")
+
+
+# --- 5. Salary Extraction ---
+def _parse_salaries(texts: pd.Series) -> pd.DataFrame:
+    """
+    salary.parse_salary over a Series: columns min and max (digit strings, NaN when
+    absent), currency and gross. Rows without an amount have neither bound.
+    """
+    text = texts.str.replace(salary.DIGIT_GROUP_PATTERN, "", regex=True)
+    low = text.str.extract(salary.FROM_PATTERN, expand=False)
+    high = text.str.extract(salary.TO_PATTERN, expand=False)
+    single = low.isna() & high.isna()
+    amount = text[single].str.extract(salary.AMOUNT_PATTERN, expand=False)
+    low[single] = amount
+    high[single] = amount
+    # As in parse_salary, each row is only searched until its first currency matches
+    currency = np.full(len(texts), None, dtype=object)
+    unmatched = texts[low.notna() | high.notna()]
+    for code, pattern in salary.CURRENCY_PATTERNS:
+        found = unmatched.str.contains(pattern)
+        currency[unmatched.index[found]] = code
+        unmatched = unmatched[~found]
+    gross = np.full(len(texts), None, dtype=object)
+    unmatched = texts[low.notna() | high.notna()]
+    for value, pattern in ((True, salary.GROSS_PATTERN), (False, salary.NET_PATTERN)):
+        found = unmatched.str.contains(pattern)
+        gross[unmatched.index[found]] = value
+        unmatched = unmatched[~found]
+    return pd.DataFrame({"min": low, "max": high, "currency": currency, "gross": gross}, dtype=object)
+
+
+def _ints_or_none(values, mask):
+    column = np.full(len(values), None, dtype=object)
+    column[mask] = values[mask].astype(np.int64).tolist()
+    return column
+
+
+def salary_frame(salary_texts: pd.Series, posted_dates=None, rates=None) -> pd.DataFrame:
+    """
+    Column-wise salary.salary_fields: one column per salary.SALARY_COLUMNS.
+    Texts are parsed once per distinct value; rates and conversion work on arrays.
+    """
+    rates = rates or salary.get_exchange_rates()
+    if posted_dates is None:
+        posted_dates = pd.Series(None, index=salary_texts.index, dtype=object)
+    texts = salary_texts.where(salary_texts.notna(), "")
+    codes, uniques = _factorize(texts)
+    parsed = _parse_salaries(uniques)
+    digit_counts = parsed[["min", "max"]].map(len, na_action='ignore')
+    too_long = (digit_counts > MAX_VECTOR_AMOUNT_DIGITS).any(axis=1).to_numpy()
+    amounts, present = {}, {}
+    for bound in ("min", "max"):
+        usable = parsed[bound].notna().to_numpy() & ~too_long
+        values = np.zeros(len(parsed), dtype=np.int64)
+        values[usable] = [int(digits) for digits in parsed[bound][usable]]
+        amounts[bound], present[bound] = values[codes], usable[codes]
+    currency = parsed["currency"].to_numpy()[codes]
+    gross = parsed["gross"].to_numpy()[codes]
+    too_long = too_long[codes]
+
+    # salary.to_uzs
+    rate = rates.rates_for(currency, posted_dates.tolist())
+    known = ~np.isnan(rate)
+    both = present["min"] & present["max"]
+    low = _ints_or_none(np.trunc(amounts["min"] * rate), present["min"] & known)
+    high = _ints_or_none(np.trunc(amounts["max"] * rate), present["max"] & known)
+    median = _ints_or_none(np.trunc((amounts["min"] + amounts["max"]) // 2 * rate), both & known)
+    median = np.where(both, median, np.where(present["min"], low, high))
+
+    result = pd.DataFrame({
+        "Salary_Info": [str(value) if value is not None else "N/A" for value in median],
+        "Salary_Min": low,
+        "Salary_Max": high,
+        "Salary_Median": median,
+        "Salary_Currency": currency,
+        "Salary_Is_Gross": gross,
+    }, index=salary_texts.index, dtype=object)
+
+    texts, posted_dates = texts.tolist(), posted_dates.tolist()
+    for i in np.flatnonzero(too_long):
+        fields = salary.salary_fields(texts[i], posted_dates[i], rates)
+        for column, value in fields.items():
+            result.iat[i, result.columns.get_loc(column)] = value
+    return result[salary.SALARY_COLUMNS]
+
+
+def extract_salary(salary_texts: pd.Series, posted_dates=None) -> pd.Series:
+    return salary_frame(salary_texts, posted_dates)["Salary_Info"]
+
+
+def process_frame(raw: pd.DataFrame, skill_matcher) -> pd.DataFrame:
+    """
+    Column-wise equivalent of scraper.build_record over many vacancies.
+
+    Args:
+        raw (pd.DataFrame): 'ID' plus the raw field columns read by http_fetcher
+            (company, title, location_date, skills, salary, logo_url).
+        skill_matcher (skills.SkillMatcher): Taxonomy to match, as in GhhScraper.skill_matcher.
+
+    Returns:
+        pd.DataFrame: The scraper's results columns.
+    """
+    fields = raw.drop(columns=['ID']).astype(object)
+    # build_record treats every empty value as "N/A"
+    fields = fields.where(fields.notna() & (fields != ""), "N/A")
+    posted_dates = parse_posted_date(fields['location_date'])
+    frame = pd.DataFrame({
+        "ID": raw['ID'],
+        "Posted_date": posted_dates,
+        "Job_Title": fields['title'],
+        "Company": transliterate_company_name(fields['company']),
+        "Company_Logo_URL": fields['logo_url'],
+        "Location": identify_region(extract_location_from_text(fields['location_date'])),
+        "Skills": _map_unique(fields['skills'], lambda text: proc.extract_skills(text, skill_matcher)),
+    })
+    return pd.concat([frame, salary_frame(fields['salary'], posted_dates)], axis=1)
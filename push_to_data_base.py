@@ -3,13 +3,12 @@ import pyodbc
 import sys
 import os
 import traceback
+import config
+from database import get_session, write_rows
 
 def insert_data_to_sql():
     csv_file = os.path.join("Data", "cleaned_job_titles_final.csv")  # ✅ путь к Data/
 
-    conn = None
-    cursor = None
-
     try:
         print(f"\n--- Loading data from {csv_file} ---")
         if not os.path.exists(csv_file):
@@ -41,61 +40,8 @@ def insert_data_to_sql():
              if csv_col_name in job_data.columns:
                  job_data[csv_col_name] = job_data[csv_col_name].astype(str).fillna('N/A').replace('', 'N/A')
 
-        print("\n--- Connecting to SQL Server ---")
-        conn = pyodbc.connect(
-            'Driver={ODBC Driver 17 for SQL Server};' # <<< MODIFIED: USING MODERN DRIVER
-            # If you installed ODBC Driver 18, use 'Driver={ODBC Driver 18 for SQL Server};'
-            # If you don't have 17 or 18, you MUST install one. Fallback to {SQL Server} is last resort.
-            'Server=POWERBI-1\\IT_JOBS;'
-            'Database=IT_JOBS;'
-            'UID=sa;'
-            'PWD=maab2024;'
-            'Connection Timeout=30;'
-        )
-        cursor = conn.cursor()
-        print("✅ Connected.")
-
-        create_table_query = """
-        IF NOT EXISTS (SELECT * FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = 'dbo' AND TABLE_NAME = 'JobListings')
-        BEGIN
-            CREATE TABLE dbo.JobListings (
-                ID NVARCHAR(100) PRIMARY KEY, Posted_date DATE NULL, Job_Title_from_List NVARCHAR(255) NULL,
-                Job_Title NVARCHAR(255) NULL, Company NVARCHAR(255) NULL, Company_Logo_URL NVARCHAR(MAX) NULL,
-                Country NVARCHAR(100) NULL, Location NVARCHAR(255) NULL, Skills NVARCHAR(MAX) NULL,
-                Salary_Info NVARCHAR(255) NULL, Source NVARCHAR(255) NULL, IngestionTimestamp DATETIME2 DEFAULT GETDATE()
-            )
-            PRINT 'Table dbo.JobListings created.'
-        END
-        """
-        cursor.execute(create_table_query)
-        conn.commit()
-
-        if not job_data.empty:
-            existing_ids_to_check = job_data['ID'].astype(str).unique().tolist()
-            if existing_ids_to_check:
-                placeholders = ','.join(['?'] * len(existing_ids_to_check))
-                # Ensure IDs are not empty strings or problematic before adding to query
-                valid_ids_to_delete = [id_val for id_val in existing_ids_to_check if id_val and id_val.strip()]
-                if valid_ids_to_delete:
-                    placeholders = ','.join(['?'] * len(valid_ids_to_delete))
-                    delete_query = f"DELETE FROM dbo.JobListings WHERE ID IN ({placeholders})"
-                    try:
-                        print(f"Attempting to delete {len(valid_ids_to_delete)} existing valid IDs before insert...")
-                        cursor.execute(delete_query, *valid_ids_to_delete)
-                        conn.commit()
-                        print(f"Deleted {cursor.rowcount} rows for IDs to be inserted.")
-                    except pyodbc.Error as del_err:
-                        conn.rollback()
-                        print(f"❌ Error deleting existing IDs: {del_err}")
-                else:
-                    print("No valid IDs found in CSV to perform pre-deletion.")
-
-
-        insert_query = """
-        INSERT INTO dbo.JobListings
-        (ID, Posted_date, Job_Title_from_List, Job_Title, Company, Company_Logo_URL, Country, Location, Skills, Salary_Info, Source)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
+        # Only new or changed rows are written, one committed chunk at a time (see database.write_rows)
+        table_columns = list(column_mapping.values())
         rows_to_insert = []
         print("\n--- Preparing data for insertion ---")
 
@@ -151,26 +97,26 @@ def insert_data_to_sql():
                  continue
 
         if rows_to_insert:
-            print(f"\n--- Inserting {len(rows_to_insert)} prepared rows into SQL Server ---")
+            print(f"\n--- Upserting {len(rows_to_insert)} prepared rows into SQL Server ---")
             try:
-                cursor.fast_executemany = True # <<< MODIFIED: SET BACK TO TRUE
-                cursor.executemany(insert_query, rows_to_insert)
-                conn.commit()
-                print(f"✅ Successfully inserted/committed {len(rows_to_insert)} rows.")
+                # Shared pooled session; the table is created/migrated once per process
+                session = get_session(config.DB_CONFIG)
+                target = session.ensure_schema('JobListings')
+                with session.connection() as conn:
+                    stats = write_rows(conn, session.dialect, target, table_columns, rows_to_insert)
+                print(f"✅ Successfully inserted/updated {stats['written']} rows, {stats['unchanged']} unchanged "
+                      f"({stats['failed']} rejected).")
             except pyodbc.IntegrityError as ie:
-                conn.rollback()
                 print(f"❌ Database Integrity Error during batch insert: {ie}")
                 print(f"   SQLSTATE: {ie.args[0]}")
                 print(f"   Message: {ie.args[1]}")
             except pyodbc.Error as db_error:
-                conn.rollback()
                 print(f"❌ Database Error during batch insert: {db_error}")
                 if db_error.args:
                     print(f"   SQLSTATE: {db_error.args[0]}")
                     if len(db_error.args) > 1:
                          print(f"   Message: {db_error.args[1]}")
             except Exception as exec_error:
-                 conn.rollback()
                  print(f"❌ Unexpected Error during batch insert (executemany): {exec_error}")
                  traceback.print_exc()
         else:
@@ -192,10 +138,6 @@ def insert_data_to_sql():
         print(f"❌ An unexpected error occurred in insert_data_to_sql: {e}")
         traceback.print_exc()
 
-    finally:
-        if cursor: cursor.close()
-        if conn: conn.close(); print("✅ Connection closed.")
-
 # Example call (if running this script directly):
 # if __name__ == "__main__":
 #    insert_data_to_sql()
\ No newline at end of file
@@ -0,0 +1,174 @@
+# rate_control.py
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+
+
+def host_of(url_or_host):
+    """Returns the host part of a URL (or the argument itself if it is already a host)."""
+    if "://" in url_or_host:
+        return urlsplit(url_or_host).hostname or url_or_host
+    return url_or_host
+
+
+class _HostState:
+    def __init__(self, rate):
+        self.rate = rate
+        self.next_allowed = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+
+
+class RateController:
+    """
+    Adaptive request pacing shared by every fetcher (browser and HTTP), tracked per host.
+
+    The rate grows additively while responses are fast and clean, and is cut
+    multiplicatively on errors, 429/5xx responses or slow pages (AIMD). It never
+    exceeds the per-host maximum.
+
+    Args:
+        initial_rate (float): Starting requests per second for a new host.
+        min_rate (float): Floor the rate never drops below.
+        max_rate (float): Default per-host ceiling.
+        host_max_rates (dict): Optional per-host ceilings, e.g. {"hh.uz": 1.0}.
+        increase_step (float): Requests/second added after each good response.
+        decrease_factor (float): Multiplier applied after a bad or slow response.
+        slow_latency (float): Seconds after which a response counts as "slow".
+        jitter (float): Random spread added to each interval, as a fraction of it.
+    """
+
+    def __init__(self, initial_rate=0.5, min_rate=0.05, max_rate=2.0, host_max_rates=None,
+                 increase_step=0.05, decrease_factor=0.5, slow_latency=4.0, jitter=0.2):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.host_max_rates = host_max_rates or {}
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.slow_latency = slow_latency
+        self.jitter = jitter
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(min(self.initial_rate, self._max_for(host)))
+            self._hosts[host] = state
+        return state
+
+    def _max_for(self, host):
+        return self.host_max_rates.get(host, self.max_rate)
+
+    def acquire(self, url):
+        """Blocks until the next request to this URL's host may be sent."""
+        host = host_of(url)
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            # Reserve the slot under the lock so concurrent workers queue up behind each other
+            start = max(now, state.next_allowed)
+            interval = 1.0 / state.rate
+            state.next_allowed = start + interval * (1 + random.uniform(0, self.jitter))
+            delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def record(self, url, latency, status=None, error=False):
+        """
+        Feeds back the outcome of one request.
+
+        Args:
+            url (str): Requested URL (or host).
+            latency (float): Seconds the request took until the page was usable.
+            status (int): HTTP status code, if known (Selenium does not expose it).
+            error (bool): True for timeouts, connection failures and driver errors.
+        """
+        host = host_of(url)
+        throttled = status == 429 or (status is not None and status >= 500)
+        with self._lock:
+            state = self._state(host)
+            state.requests += 1
+            state.total_latency += latency
+            if error or throttled:
+                state.errors += 1
+                state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+                if throttled:
+                    # Back off immediately instead of waiting for the next interval to shrink
+                    state.next_allowed = max(state.next_allowed, time.monotonic() + 1.0 / state.rate)
+            elif latency > self.slow_latency:
+                state.rate = max(self.min_rate, state.rate * self.decrease_factor)
+            else:
+                state.rate = min(self._max_for(host), state.rate + self.increase_step)
+
+    def current_rate(self, url):
+        """Current effective requests/second for a URL's host."""
+        with self._lock:
+            return self._state(host_of(url)).rate
+
+    def snapshot(self):
+        """Per-host rate and counters, for logging/monitoring."""
+        with self._lock:
+            return {
+                host: {
+                    "rate": round(state.rate, 3),
+                    "requests": state.requests,
+                    "errors": state.errors,
+                    "avg_latency": round(state.total_latency / state.requests, 3) if state.requests else None,
+                }
+                for host, state in self._hosts.items()
+            }
+
+
+class QuotaLimiter:
+    """
+    Sliding-window limiter for APIs with per-minute quotas on both requests and tokens
+    (e.g. Gemini's RPM and TPM limits), shared by every worker thread.
+
+    Args:
+        requests_per_minute (int): Maximum requests started in any 60 s window.
+        tokens_per_minute (int): Maximum estimated tokens sent in any 60 s window;
+            None disables the token limit.
+        window (float): Window length in seconds.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute=None, window=60.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window = window
+        self._events = []  # (monotonic time, tokens), oldest first
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_time(self, tokens, now):
+        while self._events and now - self._events[0][0] >= self.window:
+            self._events.pop(0)
+        if now < self._paused_until:
+            return self._paused_until - now
+        if len(self._events) >= self.requests_per_minute:
+            return self._events[0][0] + self.window - now
+        if self.tokens_per_minute is not None and self._events:
+            # A request larger than the whole quota still goes out once the window is empty
+            used = sum(event_tokens for _, event_tokens in self._events)
+            if used + tokens > self.tokens_per_minute:
+                return self._events[0][0] + self.window - now
+        return 0.0
+
+    def acquire(self, tokens=0):
+        """Blocks until a request of `tokens` estimated tokens fits in both quotas."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                delay = self._wait_time(tokens, now)
+                if delay <= 0:
+                    self._events.append((now, tokens))
+                    return
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        """Holds every caller for `seconds`, e.g. after the API answered 429."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
@@ -0,0 +1,116 @@
+# regions.py
+import os
+import re
+from functools import lru_cache
+from transliterate import translit
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'regions_gazetteer.txt')
+
+# Uzbek Cyrillic letters the Russian transliteration table does not know
+UZBEK_CYRILLIC = str.maketrans({'ў': 'о', 'Ў': 'О', 'қ': 'к', 'Қ': 'К', 'ғ': 'г', 'Ғ': 'Г', 'ҳ': 'х', 'Ҳ': 'Х'})
+CYRILLIC_PATTERN = re.compile(r"[а-яА-ЯёЁ]")
+TOKEN_PATTERN = re.compile(r"[^\W\d_]+")
+APOSTROPHES = re.compile(r"['ʻʼ‘’`]")
+# Russian transliteration and Uzbek Latin spell the same sounds differently
+SPELLING_FOLDS = [("dzh", "j"), ("zh", "j"), ("kh", "h"), ("x", "h"), ("q", "k"), ("y", "j"), ("o", "a"), ("e", "a")]
+DOUBLE_LETTERS = re.compile(r"(.)\1+")
+ENDING_PATTERN = re.compile(r"[aiuj]+$")
+
+
+def token_key(token: str) -> str:
+    """
+    Spelling-independent key of one Latin word: "tashkente", "tashkent" and
+    "toshkent" all give "tashkant".
+    """
+    for source, target in SPELLING_FOLDS:
+        token = token.replace(source, target)
+    token = DOUBLE_LETTERS.sub(r"\1", token)
+    # Case endings: "Бухара"/"Бухаре"/"Buxoro" -> "buhar"
+    return ENDING_PATTERN.sub("", token) or token
+
+
+def text_keys(text: str) -> list:
+    """Token keys of `text` after transliterating it to Latin."""
+    text = text.translate(UZBEK_CYRILLIC)
+    if CYRILLIC_PATTERN.search(text):
+        try:
+            text = translit(text, 'ru', reversed=True)
+        except Exception:
+            pass
+    text = APOSTROPHES.sub("", text.lower())
+    return [token_key(token) for token in TOKEN_PATTERN.findall(text)]
+
+
+class RegionGazetteer:
+    """
+    Resolves free-text locations to region codes with an index of place names.
+
+    Every name is stored in a trie keyed by its sequence of token keys, so a lookup
+    walks the text's tokens once and takes the longest name starting at the earliest
+    position ("Ташкентская область" beats "Ташкент").
+
+    Args:
+        places (list): (region code, name) pairs. The first name seen for a code is
+            its display name.
+    """
+
+    def __init__(self, places):
+        self.names = {}
+        self._trie = {}
+        for code, name in places:
+            self.names.setdefault(code, name)
+            keys = text_keys(name)
+            if not keys:
+                continue
+            node = self._trie
+            for key in keys:
+                node = node.setdefault(key, {})
+            node[None] = code
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_GAZETTEER_PATH):
+        """Loads a gazetteer file: "CODE | name | name ..." per line, '#' comments."""
+        places = []
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                code, *names = [part.strip() for part in line.split('|')]
+                places.extend((code, name) for name in names if name)
+        return cls(places)
+
+    def resolve(self, text):
+        """Returns the region code of the first place named in `text`, or None."""
+        if not text:
+            return None
+        return self.resolve_keys(text_keys(text))
+
+    def resolve_keys(self, keys):
+        """resolve() for text already split into token keys (see text_keys)."""
+        for start in range(len(keys)):
+            node, code = self._trie, None
+            for key in keys[start:]:
+                node = node.get(key)
+                if node is None:
+                    break
+                code = node.get(None, code)
+            if code is not None:
+                return code
+        return None
+
+
+_default_gazetteer = None
+
+
+def get_gazetteer():
+    global _default_gazetteer
+    if _default_gazetteer is None:
+        _default_gazetteer = RegionGazetteer.from_file()
+    return _default_gazetteer
+
+
+@lru_cache(maxsize=4096)
+def resolve_region(text):
+    """Memoized RegionGazetteer.resolve on the default gazetteer."""
+    return get_gazetteer().resolve(text)
@@ -0,0 +1,72 @@
+# replay.py
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+from snapshots import SnapshotStore
+from journal import RESULT_COLUMNS
+import http_fetcher
+import scraper
+import processing_vectorized
+
+
+def _reparse_chunk(args):
+    """Re-runs locator extraction on a chunk of snapshot index entries (worker process)."""
+    root, entries = args
+    store = SnapshotStore(root)
+    rows = []
+    for entry in entries:
+        try:
+            page_source = store.get(entry["digest"], entry.get("codec"))
+            fields = http_fetcher.extract_fields_from_html(page_source, entry.get("url"))
+            rows.append({"ID": entry["id"], **fields})
+        except Exception as e:
+            print(f"  ❌ Could not re-parse snapshot of job {entry['id']}: {e}")
+    return rows
+
+
+def replay_snapshots(root=os.path.join('Data', 'snapshots'), workers=None, latest_only=True, chunk_size=200):
+    """
+    Re-processes stored vacancy pages without a browser or network. Titles are left
+    untranslated; run translation_stage.translate_titles on the result if needed.
+
+    Args:
+        root (str): SnapshotStore directory.
+        workers (int): Worker processes (defaults to the CPU count).
+        latest_only (bool): Only the most recent snapshot of each vacancy.
+        chunk_size (int): Snapshots handed to a worker at a time.
+
+    Returns:
+        pd.DataFrame: Same columns as the scraper's raw output.
+    """
+    entries = SnapshotStore(root).entries(latest_only=latest_only)
+    print(f"--- Replaying {len(entries)} snapshots from '{root}' ---")
+    if not entries:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    chunks = [(root, entries[i:i + chunk_size]) for i in range(0, len(entries), chunk_size)]
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_rows in executor.map(_reparse_chunk, chunks):
+            rows.extend(chunk_rows)
+    if not rows:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    # HTML parsing is per page; the processing step runs column-wise over all of them
+    df = processing_vectorized.process_frame(pd.DataFrame(rows), scraper.SKILL_MATCHER)
+    print(f"✅ Re-parsed {len(df)} vacancies.")
+    return df[RESULT_COLUMNS]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-run extraction and processing over stored page snapshots.")
+    parser.add_argument("--root", default=os.path.join('Data', 'snapshots'))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--all-versions", action="store_true",
+                        help="replay every stored fetch instead of only the latest per vacancy")
+    parser.add_argument("--out", default=os.path.join('Data', 'job_data_replayed.csv'))
+    args = parser.parse_args()
+
+    df = replay_snapshots(args.root, workers=args.workers, latest_only=not args.all_versions)
+    df.to_csv(args.out, index=False, encoding='utf-8')
+    print(f"✅ Replayed data saved to '{args.out}'")
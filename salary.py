@@ -0,0 +1,169 @@
+# salary.py
+import os
+import re
+import csv
+import bisect
+import threading
+from itertools import repeat
+from datetime import date
+import numpy as np
+
+DEFAULT_RATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'exchange_rates.csv')
+
+# Digits grouped with spaces, NBSPs or commas: "10 000 000" -> "10000000"
+DIGIT_GROUP_PATTERN = re.compile(r"(?<=\d)[\s  ,](?=\d{3}\b)")
+FROM_PATTERN = re.compile(r"\b(?:from|от)\s*(\d+)", re.IGNORECASE)
+TO_PATTERN = re.compile(r"\b(?:to|до)\s*(\d+)", re.IGNORECASE)
+AMOUNT_PATTERN = re.compile(r"(\d+)")
+CURRENCY_PATTERNS = [
+    ("USD", re.compile(r"\$|\busd\b", re.IGNORECASE)),
+    ("EUR", re.compile(r"€|\beur\b", re.IGNORECASE)),
+    ("RUB", re.compile(r"₽|\brub|\bруб", re.IGNORECASE)),
+    ("UZS", re.compile(r"so['ʻ‘’]m|\bсум|\buzs\b", re.IGNORECASE)),
+]
+GROSS_PATTERN = re.compile(r"before tax|до вычета", re.IGNORECASE)
+NET_PATTERN = re.compile(r"after tax|на руки|после вычета", re.IGNORECASE)
+
+# Columns added to every record by salary_fields()
+SALARY_COLUMNS = ["Salary_Info", "Salary_Min", "Salary_Max", "Salary_Median", "Salary_Currency", "Salary_Is_Gross"]
+
+
+def parse_salary(salary_text):
+    """
+    Parses a salary line in its original currency.
+
+    Returns:
+        dict or None: {"min", "max", "currency", "gross"}; either bound may be None
+        ("до 1 000 $"), gross is None when the text does not say. None if the text
+        holds no amount.
+    """
+    if not salary_text or salary_text == "N/A":
+        return None
+    text = DIGIT_GROUP_PATTERN.sub("", salary_text)
+
+    from_match = FROM_PATTERN.search(text)
+    to_match = TO_PATTERN.search(text)
+    low = int(from_match.group(1)) if from_match else None
+    high = int(to_match.group(1)) if to_match else None
+    if low is None and high is None:
+        amount = AMOUNT_PATTERN.search(text)
+        if not amount:
+            return None
+        low = high = int(amount.group(1))
+
+    currency = next((code for code, pattern in CURRENCY_PATTERNS if pattern.search(salary_text)), None)
+    gross = True if GROSS_PATTERN.search(salary_text) else False if NET_PATTERN.search(salary_text) else None
+    return {"min": low, "max": high, "currency": currency, "gross": gross}
+
+
+class ExchangeRates:
+    """
+    Dated table of conversion rates to UZS, read from a CSV with the columns
+    date,currency,rate_to_uzs. A conversion uses the latest rate on or before the
+    vacancy's date, or the earliest known rate for older dates.
+    """
+
+    def __init__(self, path=DEFAULT_RATES_PATH):
+        self.path = path
+        self._dates = {}  # currency -> sorted ISO dates
+        self._rates = {}  # currency -> rates, aligned with _dates
+        rows = []
+        with open(path, encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(line for line in f if not line.startswith('#')):
+                rows.append((row['currency'].strip().upper(), row['date'].strip(), float(row['rate_to_uzs'])))
+        for currency, day, rate in sorted(rows):
+            self._dates.setdefault(currency, []).append(day)
+            self._rates.setdefault(currency, []).append(rate)
+
+    def rate(self, currency, on_date=None):
+        """Rate of `currency` to UZS on `on_date` (ISO string or date; default today), or None."""
+        if currency == "UZS":
+            return 1.0
+        dates = self._dates.get(currency)
+        if not dates:
+            return None
+        if isinstance(on_date, date):
+            on_date = on_date.isoformat()
+        elif not isinstance(on_date, str) or not on_date:
+            on_date = date.today().isoformat()  # None, or NaN from a frame
+        position = bisect.bisect_right(dates, on_date) - 1
+        return self._rates[currency][max(position, 0)]
+
+    def rates_for(self, currencies, on_dates):
+        """
+        Column-wise rate(): one float per (currency, date) pair, NaN where rate()
+        returns None. One binary search over the whole column per currency.
+        """
+        currencies = np.asarray(currencies, dtype=object)
+        on_dates = list(on_dates)
+        days = np.empty(len(on_dates), dtype=object)
+        days[:] = on_dates
+        is_date = np.fromiter(map(isinstance, on_dates, repeat(date)), dtype=bool, count=len(on_dates))
+        is_text = np.fromiter(map(isinstance, on_dates, repeat(str)), dtype=bool, count=len(on_dates))
+        days[is_date] = [day.isoformat() for day in days[is_date]]
+        days[~is_date & ~(is_text & (days != ""))] = date.today().isoformat()  # None, or NaN from a frame
+        result = np.full(len(currencies), np.nan)
+        result[currencies == "UZS"] = 1.0
+        for currency, dates in self._dates.items():
+            rows = np.flatnonzero(currencies == currency)
+            if currency == "UZS" or not rows.size:
+                continue
+            positions = np.searchsorted(np.array(dates, dtype=object), days[rows], side='right') - 1
+            result[rows] = np.array(self._rates[currency])[np.maximum(positions, 0)]
+        return result
+
+
+_default_rates = None
+_rates_lock = threading.Lock()
+
+
+def get_exchange_rates():
+    global _default_rates
+    with _rates_lock:
+        if _default_rates is None:
+            _default_rates = ExchangeRates()
+        return _default_rates
+
+
+def to_uzs(parsed, on_date=None, rates=None):
+    """
+    Converts a parse_salary() result to UZS at the rate for `on_date`.
+
+    Returns:
+        tuple: (min, max, median) as ints or None; all None for an unknown currency.
+    """
+    rate = (rates or get_exchange_rates()).rate(parsed["currency"], on_date) if parsed["currency"] else None
+    if rate is None:
+        return None, None, None
+    low = int(parsed["min"] * rate) if parsed["min"] is not None else None
+    high = int(parsed["max"] * rate) if parsed["max"] is not None else None
+    if low is not None and high is not None:
+        median = int((parsed["min"] + parsed["max"]) // 2 * rate)
+    else:
+        median = low if low is not None else high
+    return low, high, median
+
+
+def salary_fields(salary_text, posted_date=None, rates=None):
+    """
+    Structured salary columns of a results record. Amounts are UZS at the rate for
+    the vacancy's posted date; Salary_Info keeps the median as a string ("N/A" if
+    unknown) for the existing text column.
+    """
+    parsed = parse_salary(salary_text)
+    if parsed is None:
+        return empty_salary_fields()
+    low, high, median = to_uzs(parsed, posted_date, rates)
+    return {
+        "Salary_Info": str(median) if median is not None else "N/A",
+        "Salary_Min": low,
+        "Salary_Max": high,
+        "Salary_Median": median,
+        "Salary_Currency": parsed["currency"],
+        "Salary_Is_Gross": parsed["gross"],
+    }
+
+
+def empty_salary_fields():
+    return {"Salary_Info": "N/A", "Salary_Min": None, "Salary_Max": None,
+            "Salary_Median": None, "Salary_Currency": None, "Salary_Is_Gross": None}
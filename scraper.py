@@ -1,131 +1,473 @@
 # scraper.py
 import time
-import random
+import queue
+import threading
+from functools import partial
+import requests
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import locators as sel
 import processing as proc
 import config
+import browser
+import http_fetcher
+from rate_control import RateController
+from snapshots import SnapshotStore
+from skills import SkillMatcher, DEFAULT_TAXONOMY_PATH
+from journal import RESULT_COLUMNS
+import salary
+
+SKILL_MATCHER = SkillMatcher.from_file(getattr(config, 'SKILLS_FILE', DEFAULT_TAXONOMY_PATH))
+
+# Evaluates every vacancy locator in the page and returns {field: value or null}.
+# arguments[0]: {field: xpath} read as text; arguments[1]: {field: [xpath, attribute]};
+# arguments[2]: also return the page source as _page_source (snapshot mode).
+READ_FIELDS_JS = """
+const first = (xpath) => document.evaluate(
+    xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const fields = {};
+for (const [name, xpath] of Object.entries(arguments[0])) {
+    const node = first(xpath);
+    const text = node ? (node.nodeType === 1 ? node.innerText : node.textContent) : null;
+    fields[name] = text && text.trim() ? text.trim() : null;
+}
+for (const [name, [xpath, attribute]] of Object.entries(arguments[1])) {
+    const node = first(xpath);
+    let value = null;
+    if (node) {
+        // Same as Selenium's get_attribute: prefer the resolved property (absolute src/href)
+        value = (attribute in node && node[attribute]) ? node[attribute] : node.getAttribute(attribute);
+    }
+    fields[name] = value || null;
+}
+if (arguments[2]) {
+    fields._page_source = document.documentElement.outerHTML;
+}
+return fields;
+"""
+
+def build_record(job_id, fields, skill_matcher):
+    """
+    Turns raw vacancy fields (from the browser, static HTML or a stored snapshot)
+    into a results record. Job_Title keeps the original text; translation runs
+    later as its own stage (translation_stage.translate_titles).
+    """
+    fields = {name: value if value else "N/A" for name, value in fields.items()}
+    record = {"ID": job_id}
+
+    record["Company"] = proc.transliterate_company_name(fields["company"])
+    record["Job_Title"] = fields["title"]
+
+    location_date_text = fields["location_date"]
+    record["Posted_date"] = proc.parse_posted_date(location_date_text)
+
+    raw_location = proc.extract_location_from_text(location_date_text)
+    record["Location"] = proc.identify_region(raw_location)
+
+    record["Skills"] = proc.extract_skills(fields["skills"], skill_matcher)
+    record.update(salary.salary_fields(fields["salary"], record["Posted_date"]))
+    record["Company_Logo_URL"] = fields["logo_url"]
+
+    return record
 
 class GhhScraper:
-    def __init__(self, driver, wait, limit=None):
+    def __init__(self, driver, wait, limit=None, workers=1, max_concurrency=None,
+                 driver_factory=None, base_url=None, timeout=10, fetch_mode="browser",
+                 rate=None, known_ids=None, stale_page_limit=None, journal=None, start_page=0,
+                 snapshots=None, end_page=None, blocked_urls=None, job_budget=None):
         self.driver = driver
         self.wait = wait
         self.limit = limit
-        self.results = {
-            "ID": [], "Posted_date": [], "Job_Title": [], "Company": [],
-            "Company_Logo_URL": [], "Location": [], "Skills": [], "Salary_Info": []
-        }
-        self.technical_skills_list = [
-            ".NET", "SQL", "Python", "Java", "C++", "JavaScript", "React",
-            "Angular", "Vue.js", "Node.js", "Docker", "Kubernetes",
-            "AWS", "Azure", "GCP", "Terraform", "Git"
-        ]
+        # Limit shared with other scrapers (sharding.JobBudget): claim(n) -> jobs granted
+        self.job_budget = job_budget
+        # Why the last scrape() stopped: "end", "range", "limit", "stale" or "timeout"
+        self.stop_reason = None
+        # Incremental mode: vacancies with these IDs are skipped before any page is opened
+        self.known_ids = set(known_ids) if known_ids is not None else None
+        # Stop after this many consecutive listing pages without a single new ID
+        self.stale_page_limit = stale_page_limit
+        # journal.ScrapeJournal: records go to disk instead of self.results
+        self.journal = journal
+        self.start_page = start_page
+        # Exclusive upper bound on page_num (sharded crawls); None walks to the last page
+        self.end_page = end_page
+        # snapshots.SnapshotStore: keeps each vacancy's raw page for offline re-parsing
+        self.snapshots = snapshots
+        # Lean mode: URL patterns blocked in every tab opened on the main driver
+        self.blocked_urls = blocked_urls
+        # page_num -> [jobs still running, all of the page's jobs were submitted]
+        self._open_pages = {}
+        self.workers = workers
+        self.timeout = timeout
+        self.driver_factory = driver_factory or browser.create_driver
+        self.base_url = base_url or config.BASE_URL
+        # One pacing controller for every fetcher, so HTTP and browser requests share the budget
+        self.rate = rate or RateController()
+        # "http" reads pages from static HTML and only opens the browser when a locator misses
+        self.http = http_fetcher.HttpFetcher(pool_size=max(workers, 1) + 1, timeout=timeout, rate=self.rate) \
+            if fetch_mode == "http" else None
+        # Global cap on pages loading at the same time (listing producer + all workers)
+        self.page_slots = threading.BoundedSemaphore(max_concurrency or max(workers, 1))
+        self._results_lock = threading.Lock()
+        self.results = {column: [] for column in RESULT_COLUMNS}
+        self.skill_matcher = SKILL_MATCHER
+
+    @classmethod
+    def from_config(cls, driver, **overrides):
+        """Builds a scraper from the settings in config.py; keyword arguments override them."""
+        lean_browser = getattr(config, 'BROWSER_LEAN', False)
+        blocked_urls = (getattr(config, 'BROWSER_BLOCKED_URLS', None) or browser.BLOCKED_URL_PATTERNS) \
+            if lean_browser else None
+        settings = dict(
+            limit=config.SCRAPE_LIMIT,
+            workers=getattr(config, 'SCRAPER_WORKERS', 1),
+            max_concurrency=getattr(config, 'SCRAPER_MAX_CONCURRENCY', None),
+            driver_factory=partial(browser.create_driver, headless=True, lean=lean_browser,
+                                   blocked_url_patterns=blocked_urls),
+            timeout=getattr(config, 'PAGE_TIMEOUT', 10),
+            fetch_mode=getattr(config, 'FETCH_MODE', 'browser'),
+            rate=RateController(**getattr(config, 'RATE_LIMIT', {})),
+            stale_page_limit=getattr(config, 'INCREMENTAL_STALE_PAGES', 3) if getattr(config, 'INCREMENTAL', False) else None,
+            snapshots=SnapshotStore() if getattr(config, 'STORE_SNAPSHOTS', False) else None,
+            blocked_urls=blocked_urls,
+        )
+        settings.update(overrides)
+        return cls(driver, WebDriverWait(driver, settings['timeout']), **settings)
 
     def scrape(self):
-        page_num = 0
+        page_num = self.start_page
+        self.stop_reason = None
         jobs_processed_count = 0
+        stale_pages = 0
 
-        while True:
-            if self.limit is not None and jobs_processed_count >= self.limit:
-                print(f"\n--- Reached scrape limit of {self.limit} jobs. ---")
-                break
+        pool = None
+        if self.workers > 1:
+            pool = VacancyWorkerPool(self, self.workers)
+            pool.start()
+            print(f"--- Started {self.workers} vacancy workers ---")
 
-            paginated_url = config.BASE_URL.format(page_num=page_num)
-            print(f"\n--- Navigating to page {page_num} ---")
-            self.driver.get(paginated_url)
+        try:
+            while True:
+                if (self.limit is not None and jobs_processed_count >= self.limit) or \
+                        (self.job_budget is not None and self.job_budget.exhausted()):
+                    print(f"\n--- Reached scrape limit of {self.limit or self.job_budget.limit} jobs. ---")
+                    self.stop_reason = "limit"
+                    break
+                if self.end_page is not None and page_num >= self.end_page:
+                    print(f"\n--- Reached the end of the assigned page range ({self.end_page}). ---")
+                    self.stop_reason = "range"
+                    break
 
-            try:
-                self.wait.until(EC.presence_of_element_located((By.XPATH, sel.job_list_urls_xpath)))
-                time.sleep(random.uniform(2, 4))
-                job_elements = self.driver.find_elements(By.XPATH, sel.job_list_urls_xpath)
+                paginated_url = self.base_url.format(page_num=page_num)
+                print(f"\n--- Navigating to page {page_num} ---")
 
-                if not job_elements:
+                try:
+                    hrefs, has_next = self._fetch_listing(paginated_url)
+                except TimeoutException:
+                    print(f"Timed out waiting for job listings on page {page_num}. Ending scrape.")
+                    self.stop_reason = "timeout"
+                    break
+
+                if not hrefs:
                     print("No more job listings found. Ending scrape.")
+                    self.stop_reason = "end"
                     break
 
                 job_links = []
-                for el in job_elements:
-                    href = el.get_attribute('href')
+                for href in hrefs:
                     if href and '/vacancy/' in href:
                         job_id = href.split('/vacancy/')[1].split('?')[0]
                         job_links.append({'url': href, 'id': job_id})
 
-                main_window = self.driver.current_window_handle
-                for job_info in job_links:
-                    if self.limit is not None and jobs_processed_count >= self.limit:
+                if self.known_ids is not None:
+                    listed = len(job_links)
+                    job_links = [job for job in job_links if job['id'] not in self.known_ids]
+                    # Listings shift while we paginate, so also skip IDs queued earlier in this run
+                    self.known_ids.update(job['id'] for job in job_links)
+                    print(f"  {len(job_links)} new of {listed} listed vacancies.")
+                    stale_pages = 0 if job_links else stale_pages + 1
+                    if self.stale_page_limit and stale_pages >= self.stale_page_limit:
+                        print(f"\n--- No new vacancies on the last {stale_pages} pages. Stopping incremental scrape. ---")
+                        self.stop_reason = "stale"
                         break
-                    
+
+                batch = job_links
+                if self.limit is not None:
+                    batch = job_links[:max(self.limit - jobs_processed_count, 0)]
+                if self.job_budget is not None:
+                    batch = batch[:self.job_budget.claim(len(batch))]
+                self._open_page(page_num, len(batch), complete=len(batch) == len(job_links))
+
+                for job_info in batch:
                     jobs_processed_count += 1
                     print(f"\nProcessing Job #{jobs_processed_count} | ID: {job_info['id']}")
 
-                    self.driver.execute_script("window.open(arguments[0], '_blank');", job_info['url'])
-                    self.driver.switch_to.window(self.driver.window_handles[-1])
-
-                    try:
-                        self.wait.until(EC.presence_of_element_located((By.XPATH, sel.job_title_xpath)))
-                        time.sleep(random.uniform(1, 2))
-                        self._extract_job_details(job_info['id'])
-                    except (TimeoutException, WebDriverException) as e:
-                        print(f"  ❌ Error loading job detail page. Skipping. Error: {e}")
-                    finally:
-                        self.driver.close()
-                        self.driver.switch_to.window(main_window)
-
-                # Next page
-                self.driver.find_element(By.XPATH, sel.next_button_xpath)
-                page_num += 1
+                    job_info['page'] = page_num
+                    if pool:
+                        pool.submit(job_info)
+                    else:
+                        self._process_job(job_info, self._browser_fields_in_tab)
 
-            except NoSuchElementException:
-                print("\n--- No 'Next' button found. Reached the end of search results. ---")
-                break
-            except TimeoutException:
-                print(f"Timed out waiting for job listings on page {page_num}. Ending scrape.")
-                break
+                print(f"  Current request rate: {self.rate.current_rate(paginated_url):.2f} req/s")
+                if not has_next:
+                    print("\n--- No 'Next' button found. Reached the end of search results. ---")
+                    self.stop_reason = "end"
+                    break
+                page_num += 1
+        finally:
+            try:
+                if pool:
+                    pool.close()
+                if self.http:
+                    self.http.close()
+            finally:
+                # Also on errors: everything extracted so far must be on disk for --resume
+                if self.journal:
+                    self.journal.close()
 
         print(f"\n--- Scraping finished. Total jobs processed: {jobs_processed_count} ---")
+        print(f"Request pacing: {self.rate.snapshot()}")
+        if self.journal:
+            return self.journal.read_results()
         return self.results
 
-    def _extract_job_details(self, job_id):
-        self.results["ID"].append(job_id)
+    def _open_page(self, page_num, job_count, complete):
+        """Starts tracking a listing page; `complete` is False when the scrape limit cut it short."""
+        with self._results_lock:
+            self._open_pages[page_num] = [job_count, complete]
+        if job_count == 0:
+            self._close_page_if_done(page_num)
+
+    def _process_job(self, job_info, browser_fields):
+        try:
+            self._scrape_job(job_info, browser_fields)
+        finally:
+            with self._results_lock:
+                self._open_pages[job_info['page']][0] -= 1
+            self._close_page_if_done(job_info['page'])
+
+    def _close_page_if_done(self, page_num):
+        # A page is only journaled as done once every one of its vacancies has finished,
+        # so --resume never skips jobs that were still queued in the worker pool
+        with self._results_lock:
+            remaining, complete = self._open_pages[page_num]
+            if remaining > 0:
+                return
+            del self._open_pages[page_num]
+        if complete and self.journal:
+            self.journal.mark_page_done(page_num)
 
-        company_raw = self._get_text(sel.company_name_xpath)
-        self.results["Company"].append(proc.transliterate_company_name(company_raw))
+    def _fetch_listing(self, url):
+        """Returns (vacancy hrefs, has_next_page) for one search results page."""
+        if self.http:
+            try:
+                with self.page_slots:
+                    hrefs, has_next = self.http.fetch_listing(url)
+                if hrefs:
+                    return hrefs, has_next
+                print("  ↪ No listings in static HTML. Falling back to browser.")
+            except requests.RequestException as e:
+                print(f"  ↪ HTTP listing fetch failed ({e}). Falling back to browser.")
 
-        job_title_raw = self._get_text(sel.job_title_xpath)
-        self.results["Job_Title"].append(proc.translate_to_english(job_title_raw))
+        self._timed_load(url, self.driver.get, self.wait, sel.job_list_urls_xpath)
+        hrefs = [el.get_attribute('href') for el in self.driver.find_elements(By.XPATH, sel.job_list_urls_xpath)]
+        has_next = bool(self.driver.find_elements(By.XPATH, sel.next_button_xpath))
+        return hrefs, has_next
 
-        location_date_text = self._get_text(sel.location_and_date_xpath)
-        self.results["Posted_date"].append(proc.parse_posted_date(location_date_text))
+    def _scrape_job(self, job_info, browser_fields):
+        """
+        Reads one vacancy and stores its record.
 
-        raw_location = proc.extract_location_from_text(location_date_text)
-        self.results["Location"].append(raw_location)  # simplified, no identify_region()
+        In HTTP mode the static page is tried first; `browser_fields(job_info)` is only
+        called when a required locator misses there.
+        """
+        static_fields = None
+        if self.http:
+            try:
+                with self.page_slots:
+                    page_source = self.http.get(job_info['url'])
+                static_fields = http_fetcher.extract_fields_from_html(page_source, job_info['url'])
+            except requests.RequestException as e:
+                print(f"  ↪ HTTP fetch failed ({e}). Falling back to browser.")
+            if static_fields and http_fetcher.has_required_fields(static_fields):
+                if self.snapshots:
+                    self.snapshots.put(job_info['id'], page_source, url=job_info['url'])
+                self._store(self._build_record(job_info['id'], static_fields), job_info.get('page'))
+                return
+            if static_fields:
+                print("  ↪ Locator missed in static HTML. Falling back to browser.")
 
-        skills_text = self._get_text(sel.skills_xpath)
-        self.results["Skills"].append(proc.extract_skills(skills_text, self.technical_skills_list))
+        fields = browser_fields(job_info)
+        if fields is None:
+            return
+        page_source = fields.pop("_page_source", None)
+        if self.snapshots and page_source:
+            self.snapshots.put(job_info['id'], page_source, url=job_info['url'])
+        if static_fields:
+            fields = {name: fields.get(name) or static_fields.get(name) for name in fields}
+        self._store(self._build_record(job_info['id'], fields), job_info.get('page'))
 
-        salary_text = self._get_text(sel.salary_info_xpath)
-        self.results["Salary_Info"].append(proc.extract_salary(salary_text))
+    def _browser_fields_in_tab(self, job_info):
+        """Opens a vacancy in a new tab of the main driver (single-driver mode)."""
+        main_window = self.driver.current_window_handle
 
-        logo_url = self._get_attribute(sel.company_logo_url_xpath, 'src')
-        self.results["Company_Logo_URL"].append(logo_url)
+        def open_in_tab(url):
+            # Open blank first so resource blocking is in place and get() honours the page load strategy
+            self.driver.execute_script("window.open('about:blank', '_blank');")
+            self.driver.switch_to.window(self.driver.window_handles[-1])
+            browser.block_resources(self.driver, self.blocked_urls)
+            self.driver.get(url)
 
-    def _get_text(self, xpath):
         try:
-            element = self.wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-            if element:
-                return element.text.strip()
-        except:
-            pass
-        return "N/A"
-
-    def _get_attribute(self, xpath, attribute):
+            self._timed_load(job_info['url'], open_in_tab, self.wait, sel.job_title_xpath)
+            return self._read_fields(self.driver)
+        except (TimeoutException, WebDriverException) as e:
+            print(f"  ❌ Error loading job detail page. Skipping. Error: {e}")
+            return None
+        finally:
+            if self.driver.current_window_handle != main_window:
+                self.driver.close()
+                self.driver.switch_to.window(main_window)
+
+    def _browser_fields_in_driver(self, job_info, driver, wait):
+        """Loads a vacancy directly in a worker's own driver (pool mode)."""
+        try:
+            self._timed_load(job_info['url'], driver.get, wait, sel.job_title_xpath)
+            return self._read_fields(driver)
+        except (TimeoutException, WebDriverException) as e:
+            print(f"  ❌ Error loading job {job_info['id']}. Skipping. Error: {e}")
+            return None
+
+    def _timed_load(self, url, load, wait, ready_xpath):
+        """
+        Loads `url` with `load(url)` under the rate controller and the page-slot cap,
+        waits for `ready_xpath` and reports the latency/outcome back to the controller.
+        """
+        self.rate.acquire(url)
+        self.page_slots.acquire()
+        # Timed from here: waiting for a free slot is not page latency
+        started = time.monotonic()
+        try:
+            try:
+                load(url)
+            finally:
+                self.page_slots.release()
+            wait.until(EC.presence_of_element_located((By.XPATH, ready_xpath)))
+        except (TimeoutException, WebDriverException):
+            self.rate.record(url, time.monotonic() - started, error=True)
+            raise
+        self.rate.record(url, time.monotonic() - started)
+
+    def _store(self, record, page_num=None):
+        if self.journal:
+            self.journal.append_record(record, page_num)
+            return
+        # Workers finish in any order, so a record is appended to every column at once
+        with self._results_lock:
+            for key, value in record.items():
+                self.results[key].append(value)
+
+    def _read_fields(self, driver):
+        """
+        Reads the raw vacancy fields from the page loaded in `driver` in one round trip;
+        missing ones are None. The caller has already waited for the title.
+        """
+        return driver.execute_script(
+            READ_FIELDS_JS,
+            http_fetcher.FIELD_XPATHS,
+            {"logo_url": [http_fetcher.LOGO_XPATH, "src"]},
+            self.snapshots is not None,
+        )
+
+    def _build_record(self, job_id, fields):
+        return build_record(job_id, fields, self.skill_matcher)
+
+
+class VacancyWorkerPool:
+    """
+    A fixed number of headless drivers that pull vacancy URLs from a shared queue.
+
+    Pagination stays in GhhScraper.scrape (single producer); workers write into the
+    scraper's results through GhhScraper._store.
+    """
+
+    def __init__(self, scraper, size):
+        self.scraper = scraper
+        self.size = size
+        # Bounded so the producer cannot run many pages ahead of the workers
+        self.jobs = queue.Queue(maxsize=size * 4)
+        self.threads = []
+
+    def start(self):
+        for n in range(self.size):
+            thread = threading.Thread(target=self._run, name=f"vacancy-worker-{n}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+    def submit(self, job_info):
+        # Re-checks the workers while the queue is full, so a dead pool cannot block the producer
+        while True:
+            try:
+                self.jobs.put(job_info, timeout=1)
+                return
+            except queue.Full:
+                if not any(thread.is_alive() for thread in self.threads):
+                    raise RuntimeError("All vacancy workers have stopped")
+
+    def close(self):
+        """Signals end of input and waits for all queued vacancies to finish."""
+        for _ in self.threads:
+            self.jobs.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def _run(self):
+        worker_browser = _WorkerBrowser(self.scraper)
         try:
-            element = self.wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-            if element:
-                return element.get_attribute(attribute)
-        except:
-            pass
-        return "N/A"
+            while True:
+                job_info = self.jobs.get()
+                if job_info is None:
+                    break
+                try:
+                    self.scraper._process_job(job_info, worker_browser.fetch_fields)
+                except Exception as e:
+                    print(f"  ❌ Unexpected error on job {job_info['id']}: {e}")
+        finally:
+            worker_browser.quit()
+
+
+class _WorkerBrowser:
+    """Driver owned by one pool worker, started on first use (never, if HTTP mode never misses)."""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.driver = None
+        self.wait = None
+        self.failed = False
+
+    def fetch_fields(self, job_info):
+        if self.driver is None:
+            if self.failed:
+                print(f"  ❌ No browser for job {job_info['id']}. Skipping.")
+                return None
+            try:
+                self.driver = self.scraper.driver_factory()
+                self.wait = WebDriverWait(self.driver, self.scraper.timeout)
+            except Exception as e:
+                # Any factory failure (missing binary, bad options, ...) fails this worker's
+                # browser jobs instead of killing the thread
+                print(f"  ❌ {threading.current_thread().name} could not start a browser: {e}")
+                self.failed = True
+                return None
+        return self.scraper._browser_fields_in_driver(job_info, self.driver, self.wait)
+
+    def quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException as e:
+                print(f"  ⚠️ Could not quit worker browser: {e}")
+            self.driver = None
@@ -0,0 +1,31 @@
+# seen_ids.py
+import os
+
+
+class SeenIdStore:
+    """
+    Local append-only record of vacancy IDs that were already scraped.
+
+    One ID per line, so the file can be appended to after every run and
+    inspected or trimmed by hand.
+    """
+
+    def __init__(self, path=os.path.join('Data', 'seen_ids.txt')):
+        self.path = path
+
+    def load(self) -> set:
+        if not os.path.exists(self.path):
+            return set()
+        with open(self.path, encoding='utf-8') as f:
+            return {line.strip() for line in f if line.strip()}
+
+    def add(self, ids):
+        ids = [str(job_id) for job_id in ids if job_id]
+        if not ids:
+            return
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(f"{job_id}\n" for job_id in ids)
+        print(f"Recorded {len(ids)} IDs in '{self.path}'.")
@@ -0,0 +1,237 @@
+# sharding.py
+import os
+import glob
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import pandas as pd
+import config
+import browser
+from scraper import GhhScraper
+from journal import ScrapeJournal, RESULT_COLUMNS
+from rate_control import RateController
+
+SHARD_DIR = os.path.join('Data', 'shards')
+
+
+def plan_shards(max_pages, pages_per_shard, start_page=0):
+    """Splits listing pages [start_page, max_pages) into (shard_id, start, stop) ranges."""
+    return [
+        (shard_id, start, min(start + pages_per_shard, max_pages))
+        for shard_id, start in enumerate(range(start_page, max_pages, pages_per_shard))
+    ]
+
+
+def shard_journal_path(shard_id, out_dir=SHARD_DIR):
+    return os.path.join(out_dir, f"shard_{shard_id:03d}.jsonl")
+
+
+class JobBudget:
+    """
+    SCRAPE_LIMIT shared by every shard process: shards claim vacancies from one counter
+    held by a multiprocessing manager, so the limit applies to the whole crawl.
+    """
+
+    def __init__(self, limit, manager):
+        self.limit = limit
+        self._used = manager.Value('i', 0)
+        self._lock = manager.Lock()
+
+    def claim(self, count):
+        """Reserves up to `count` vacancies and returns how many were granted."""
+        with self._lock:
+            granted = max(0, min(count, self.limit - self._used.value))
+            self._used.value += granted
+        return granted
+
+    def exhausted(self):
+        return self._used.value >= self.limit
+
+
+def shard_settings(processes):
+    """
+    GhhScraper.from_config overrides giving each of `processes` concurrent shards an
+    equal share of the per-host request rate and page concurrency, so the crawl as a
+    whole stays within the single-process budget (RATE_LIMIT, SCRAPER_WORKERS,
+    SCRAPER_MAX_CONCURRENCY).
+    """
+    rate_limit = dict(getattr(config, 'RATE_LIMIT', {}))
+    defaults = RateController()
+    for name in ('initial_rate', 'min_rate', 'max_rate'):
+        rate_limit[name] = rate_limit.get(name, getattr(defaults, name)) / processes
+    rate_limit['host_max_rates'] = {
+        host: rate / processes for host, rate in rate_limit.get('host_max_rates', {}).items()
+    }
+    workers = getattr(config, 'SCRAPER_WORKERS', 1)
+    max_concurrency = getattr(config, 'SCRAPER_MAX_CONCURRENCY', None) or workers
+    return dict(
+        rate=RateController(**rate_limit),
+        workers=max(1, workers // processes),
+        max_concurrency=max(1, max_concurrency // processes),
+    )
+
+
+def max_processes():
+    """Shard processes that fit in the page concurrency budget (one page each at minimum)."""
+    return getattr(config, 'SCRAPER_MAX_CONCURRENCY', None) or getattr(config, 'SCRAPER_WORKERS', 1)
+
+
+def run_shard(shard_id, start_page, stop_page, out_dir=SHARD_DIR, known_ids=None, resume=False,
+              processes=1, job_budget=None, limit=None):
+    """
+    Scrapes listing pages [start_page, stop_page) into this shard's own journal.
+
+    Runs in a worker process (or on another host via the CLI below), with its own browser
+    and a 1/`processes` share of the rate and concurrency budget. SCRAPE_LIMIT comes from
+    `job_budget` when the coordinator shares one, else from `limit` (CLI workers).
+
+    Returns:
+        tuple: (shard_id, journal path, number of records in the shard, stop reason);
+        a stop reason other than "range" means the crawl should not go past this shard.
+    """
+    journal = ScrapeJournal(shard_journal_path(shard_id, out_dir))
+    if resume:
+        start_page, done_ids = journal.resume_state(start_page)
+        known_ids = (set(known_ids) if known_ids is not None else set()) | done_ids
+    journal.open(resume=resume)
+
+    print(f"--- Shard {shard_id}: pages {start_page}-{stop_page - 1} ---")
+    driver = browser.create_driver(headless=True, lean=getattr(config, 'BROWSER_LEAN', False),
+                                   blocked_url_patterns=getattr(config, 'BROWSER_BLOCKED_URLS', None))
+    try:
+        overrides = shard_settings(processes)
+        if job_budget is not None:
+            overrides.update(limit=None, job_budget=job_budget)
+        elif limit is not None:
+            overrides.update(limit=limit)
+        scraper = GhhScraper.from_config(
+            driver, journal=journal, start_page=start_page, end_page=stop_page, known_ids=known_ids,
+            **overrides
+        )
+        results = scraper.scrape()
+    finally:
+        driver.quit()
+    return shard_id, journal.path, len(results["ID"]), scraper.stop_reason
+
+
+def merge_shards(out_dir=SHARD_DIR):
+    """
+    Combines every shard journal in `out_dir` into one raw frame, deduplicated by ID.
+
+    Pages shift while shards run in parallel, so the same vacancy can appear in two
+    neighbouring shards; the first occurrence (lowest shard) is kept.
+    """
+    frames = []
+    for path in sorted(glob.glob(os.path.join(out_dir, "shard_*.jsonl"))):
+        frames.append(pd.DataFrame(ScrapeJournal(path).read_results(), columns=RESULT_COLUMNS))
+    if not frames:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    merged = pd.concat(frames, ignore_index=True)
+    total = len(merged)
+    merged = merged.drop_duplicates(subset=['ID'], keep='first').reset_index(drop=True)
+    print(f"Merged {len(frames)} shards: {total} -> {len(merged)} rows after deduplicating by ID.")
+    return merged
+
+
+def run_sharded(workers, max_pages=None, pages_per_shard=None, out_dir=SHARD_DIR, known_ids=None, resume=False):
+    """
+    Coordinator: runs page-range shards on a pool of `workers` processes and returns
+    the merged raw frame that main.main expects.
+
+    Shards are scheduled in page order, at most `workers` at a time, until one of them
+    stops before the end of its range (last results page, scrape limit, incremental
+    stale pages or a timeout) or fails, or `max_pages` (config.MAX_PAGES, unlimited by
+    default) is reached.
+
+    Every shard needs at least one page of the concurrency budget, so `workers` may not
+    exceed max_processes(); raise SCRAPER_MAX_CONCURRENCY to run more shards.
+    """
+    max_pages = max_pages or getattr(config, 'MAX_PAGES', None)
+    pages_per_shard = pages_per_shard or getattr(config, 'SHARD_PAGES', 5)
+    if workers > max_processes():
+        raise ValueError(f"{workers} shard processes exceed the page concurrency budget of {max_processes()}; "
+                         f"raise SCRAPER_MAX_CONCURRENCY to at least {workers} to shard the crawl")
+    os.makedirs(out_dir, exist_ok=True)
+    if not resume:
+        # Stale journals from an earlier crawl would otherwise be merged in
+        for path in glob.glob(os.path.join(out_dir, "shard_*.jsonl")):
+            os.remove(path)
+
+    print(f"--- Running shards of {pages_per_shard} pages on {workers} processes ---")
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=workers) as executor:
+        job_budget = JobBudget(config.SCRAPE_LIMIT, manager) if config.SCRAPE_LIMIT else None
+        next_shard = 0
+        finished = False
+        running = set()
+        while running or not finished:
+            while not finished and len(running) < workers:
+                start = next_shard * pages_per_shard
+                if max_pages is not None and start >= max_pages:
+                    finished = True
+                    break
+                stop = start + pages_per_shard if max_pages is None else min(start + pages_per_shard, max_pages)
+                running.add(executor.submit(
+                    run_shard, next_shard, start, stop, out_dir, known_ids, resume, workers, job_budget
+                ))
+                next_shard += 1
+            if not running:
+                break
+
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    shard_id, path, rows, stop_reason = future.result()
+                    print(f"✅ Shard {shard_id} finished with {rows} rows ({path}, stopped: {stop_reason}).")
+                    if stop_reason != "range":
+                        finished = True
+                except Exception as e:
+                    # Whatever broke this shard (no browser, no network) would break the next ones too
+                    print(f"❌ Shard failed, no new shards will be started: {e}")
+                    finished = True
+
+    return merge_shards(out_dir)
+
+
+if __name__ == "__main__":
+    # Multi-host usage: run `plan` once, start one `worker` per line of its output on any
+    # host sharing out_dir (or copy the shard files back), then `merge`.
+    parser = argparse.ArgumentParser(description="Sharded hh.uz crawl by listing page range.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    plan_cmd = sub.add_parser("plan", help="print worker commands for each page range")
+    plan_cmd.add_argument("--pages", type=int, default=getattr(config, 'MAX_PAGES', 100))
+    plan_cmd.add_argument("--pages-per-shard", type=int, default=getattr(config, 'SHARD_PAGES', 5))
+    plan_cmd.add_argument("--processes", type=int, default=1,
+                          help="shard workers that will run at the same time on all hosts")
+
+    worker_cmd = sub.add_parser("worker", help="scrape one page range")
+    worker_cmd.add_argument("--shard-id", type=int, required=True)
+    worker_cmd.add_argument("--start", type=int, required=True)
+    worker_cmd.add_argument("--stop", type=int, required=True)
+    worker_cmd.add_argument("--resume", action="store_true")
+    worker_cmd.add_argument("--processes", type=int, default=1,
+                            help="shard workers running at the same time on all hosts; each gets 1/N of the budget")
+    worker_cmd.add_argument("--limit", type=int, default=None,
+                            help="this shard's share of SCRAPE_LIMIT (hosts cannot share one counter)")
+
+    merge_cmd = sub.add_parser("merge", help="merge shard outputs into Data/job_data_raw.csv")
+
+    for cmd in (worker_cmd, merge_cmd):
+        cmd.add_argument("--out-dir", default=SHARD_DIR)
+    args = parser.parse_args()
+
+    if args.command == "plan":
+        shards = plan_shards(args.pages, args.pages_per_shard)
+        limit = f" --limit {-(-config.SCRAPE_LIMIT // len(shards))}" if config.SCRAPE_LIMIT and shards else ""
+        for shard_id, start, stop in shards:
+            print(f"python sharding.py worker --shard-id {shard_id} --start {start} --stop {stop} "
+                  f"--processes {args.processes}{limit}")
+    elif args.command == "worker":
+        run_shard(args.shard_id, args.start, args.stop, args.out_dir, resume=args.resume,
+                  processes=args.processes, limit=args.limit)
+    else:
+        df = merge_shards(args.out_dir)
+        raw_file_path = os.path.join('Data', 'job_data_raw.csv')
+        df.to_csv(raw_file_path, index=False, encoding='utf-8')
+        print(f"✅ Merged raw data with {len(df)} rows saved to '{raw_file_path}'")
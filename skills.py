@@ -0,0 +1,97 @@
+# skills.py
+import os
+import re
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills_taxonomy.txt')
+
+# A skill must not be glued to a word character on either side, so "Java" does not
+# match inside "JavaScript" nor "Git" inside "GitLab". '+' and '#' also block the right
+# edge so "C" does not match "C++" or "C#".
+_LEFT_BOUNDARY = r"(?<!\w)"
+_RIGHT_BOUNDARY = r"(?![\w+#])"
+
+
+def _trie_pattern(words):
+    """
+    Builds one regex alternation for `words`, nested by shared prefix.
+
+    re tries alternatives one by one, so a flat "a|b|c|..." of thousands of skills
+    costs thousands of checks per text position; the nested form only follows the
+    branches whose prefix actually matches.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = []
+        optional = "" in node
+        for char in sorted(key for key in node if key):
+            branches.append(re.escape(char) + build(node[char]))
+        if not branches:
+            return ""
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        body = "(?:" + "|".join(branches) + ")"
+        return body + "?" if optional else body
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """
+    Finds skills from a taxonomy in free text in a single regex pass.
+
+    Args:
+        taxonomy (dict): Canonical skill name -> list of aliases. The canonical
+            name itself always matches.
+    """
+
+    def __init__(self, taxonomy):
+        self.aliases = {}
+        for canonical, aliases in taxonomy.items():
+            for alias in [canonical, *aliases]:
+                alias = alias.strip()
+                if alias:
+                    self.aliases[alias.lower()] = canonical
+        if not self.aliases:
+            self.pattern = None
+            return
+        self.pattern = re.compile(
+            _LEFT_BOUNDARY + _trie_pattern(self.aliases) + _RIGHT_BOUNDARY,
+            re.IGNORECASE
+        )
+
+    @classmethod
+    def from_list(cls, skills):
+        return cls({skill: [] for skill in skills})
+
+    @classmethod
+    def from_file(cls, path=DEFAULT_TAXONOMY_PATH):
+        """
+        Loads a taxonomy file: one skill per line, aliases separated by '|',
+        e.g. "JavaScript | JS | ECMAScript". Blank lines and lines starting with '#'
+        are ignored.
+        """
+        taxonomy = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                # Only whole-line comments: '#' is part of names like C# and F#
+                if not line or line.startswith('#'):
+                    continue
+                names = [name.strip() for name in line.split('|')]
+                taxonomy.setdefault(names[0], []).extend(names[1:])
+        return cls(taxonomy)
+
+    def match(self, text):
+        """Returns the sorted canonical names of every skill mentioned in `text`."""
+        if not text or self.pattern is None:
+            return []
+        return sorted({self.aliases[m.group(0).lower()] for m in self.pattern.finditer(text)})
+
+    def __len__(self):
+        return len(set(self.aliases.values()))
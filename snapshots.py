@@ -0,0 +1,104 @@
+# snapshots.py
+import os
+import gzip
+import json
+import hashlib
+import threading
+from datetime import datetime, timezone
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is used when zstandard is not installed
+    zstandard = None
+
+
+class SnapshotStore:
+    """
+    Content-addressed, compressed store of raw vacancy pages.
+
+    Layout under `root`:
+        objects/ab/abcdef....html.zst (or .html.gz)   page source, named by its SHA-256
+        index.jsonl                                   {"id", "fetched_at", "digest", "codec", "url"}
+
+    Identical pages are stored once; every fetch still gets an index line, so the
+    history of a vacancy is kept without duplicating its bytes.
+    """
+
+    def __init__(self, root=os.path.join('Data', 'snapshots'), codec=None):
+        self.root = root
+        self.codec = codec or ('zstd' if zstandard else 'gzip')
+        if self.codec == 'zstd' and zstandard is None:
+            raise ImportError("codec='zstd' requires the 'zstandard' package")
+        self.index_path = os.path.join(root, 'index.jsonl')
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+
+    def _object_path(self, digest, codec):
+        extension = 'zst' if codec == 'zstd' else 'gz'
+        return os.path.join(self.root, 'objects', digest[:2], f"{digest}.html.{extension}")
+
+    def put(self, job_id, page_source, url=None, fetched_at=None):
+        """Stores one page and returns its digest."""
+        data = page_source.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest, self.codec)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if self.codec == 'zstd':
+                compressed = zstandard.ZstdCompressor(level=10).compress(data)
+            else:
+                compressed = gzip.compress(data, compresslevel=6)
+            # Write then rename, so a crash never leaves a truncated object under its final name
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+
+        entry = {
+            "id": str(job_id),
+            "fetched_at": fetched_at or datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            "digest": digest,
+            "codec": self.codec,
+            "url": url,
+        }
+        with self._lock:
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return digest
+
+    def get(self, digest, codec=None):
+        """Returns the page source stored under `digest`."""
+        codec = codec or self.codec
+        with open(self._object_path(digest, codec), 'rb') as f:
+            data = f.read()
+        if codec == 'zstd':
+            if zstandard is None:
+                raise ImportError("Reading zstd snapshots requires the 'zstandard' package")
+            data = zstandard.ZstdDecompressor().decompress(data)
+        else:
+            data = gzip.decompress(data)
+        return data.decode('utf-8')
+
+    def entries(self, latest_only=True):
+        """
+        Returns index entries in fetch order. With `latest_only`, only the most
+        recent snapshot of each vacancy ID is kept.
+        """
+        if not os.path.exists(self.index_path):
+            return []
+        entries = []
+        with open(self.index_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        if not latest_only:
+            return entries
+        latest = {}
+        for entry in entries:
+            previous = latest.get(entry["id"])
+            if previous is None or entry["fetched_at"] >= previous["fetched_at"]:
+                latest[entry["id"]] = entry
+        return sorted(latest.values(), key=lambda e: e["fetched_at"])
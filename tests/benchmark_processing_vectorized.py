@@ -0,0 +1,76 @@
+# tests/benchmark_processing_vectorized.py
+"""
+Times processing_vectorized against mapping the scalar functions of processing.py
+over the same column, and checks that both give the same result.
+
+    python tests/benchmark_processing_vectorized.py [rows]
+
+"distinct" columns have no repeated value, the worst case for factorizing;
+"repeated" columns draw their rows from 2,000 distinct values, as scraped text
+repeats. The last lines time the two shortcuts processing_vectorized keeps
+against the plain version they replace.
+"""
+import os
+import sys
+import time
+import random
+import pandas as pd
+from transliterate import translit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import processing as proc
+import processing_vectorized as pv
+from regions import resolve_region
+from test_processing_vectorized import _unique_corpus
+
+FUNCTIONS = [
+    ("company", proc.transliterate_company_name, pv.transliterate_company_name),
+    ("location_date", proc.parse_posted_date, pv.parse_posted_date),
+    ("location_date", proc.extract_location_from_text, pv.extract_location_from_text),
+    ("location", proc.identify_region, pv.identify_region),
+    ("salary", proc.extract_salary, pv.extract_salary),
+]
+
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def compare(series):
+    print(f"\n{series['label']}: {series['rows']} rows")
+    for column, scalar, vectorized in FUNCTIONS:
+        values = pd.Series(series[column], dtype=object)
+        resolve_region.cache_clear()
+        expected, scalar_seconds = _timed(lambda: [scalar(value) for value in values])
+        actual, vector_seconds = _timed(vectorized, values)
+        assert actual.tolist() == expected, f"{vectorized.__name__} differs from processing.{scalar.__name__}"
+        print(f"  {vectorized.__name__:28} scalar {scalar_seconds:6.2f}s  column-wise {vector_seconds:6.2f}s  "
+              f"{scalar_seconds / vector_seconds:5.1f}x")
+
+
+def compare_shortcuts(corpus):
+    names = pd.Series(corpus["company"], dtype=object)
+    _, plain = _timed(lambda: names.map(lambda name: translit(name, 'ru', reversed=True)))
+    _, table = _timed(lambda: names.str.translate(pv._translit_table()))
+    print(f"\n  translit per value {plain:.2f}s, translate table {table:.2f}s")
+
+    dates = pd.Series(corpus["location_date"], dtype=object).str.strip()
+    _, plain = _timed(pv._strptime, dates, "%d %B %Y")
+    _, filtered = _timed(lambda: pv._strptime(dates[dates.str.fullmatch(pv._DAY_FIRST_SHAPE)], "%d %B %Y"))
+    print(f"  strptime on every date {plain:.2f}s, on date-shaped rows only {filtered:.2f}s")
+
+
+def main(rows):
+    distinct = _unique_corpus(rows, seed=1)
+    pool = _unique_corpus(2000, seed=2)
+    rng = random.Random(3)
+    repeated = {column: rng.choices(values, k=rows) for column, values in pool.items()}
+    compare({"label": "distinct", "rows": rows, **distinct})
+    compare({"label": "repeated (2,000 distinct values)", "rows": rows, **repeated})
+    compare_shortcuts(distinct)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,87 @@
+# tests/conftest.py
+"""
+Shared test setup.
+
+config.py and locators.py are local, untracked files, so the tests install their
+own versions of both before any project module is imported. The locators match
+the fixture pages served by `fixture_site`.
+"""
+import os
+import sys
+import types
+import threading
+import http.server
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, ROOT)
+
+config = types.ModuleType('config')
+config.BASE_URL = "http://127.0.0.1:0/list?page={page_num}"
+config.SCRAPE_LIMIT = None
+config.VALID_JOB_TITLES = ["Backend Developer", "Frontend Developer", "Data Analyst", "QA Engineer"]
+config.API_KEY = "test"
+config.DB_CONFIG = {'dialect': 'sqlite', 'database': ':memory:', 'table_name': 'JobListings'}
+sys.modules['config'] = config
+
+locators = types.ModuleType('locators')
+locators.job_list_urls_xpath = "//a[@data-qa='serp-item__title']"
+locators.next_button_xpath = "//a[@data-qa='pager-next']"
+locators.job_title_xpath = "//h1[@data-qa='vacancy-title']"
+locators.company_name_xpath = "//a[@data-qa='vacancy-company-name']"
+locators.location_and_date_xpath = "//p[@class='vacancy-creation-time-redesigned']"
+locators.skills_xpath = "//ul[@class='vacancy-skill-list']"
+locators.salary_info_xpath = "//div[@data-qa='vacancy-salary']"
+locators.company_logo_url_xpath = "//img[@data-qa='vacancy-company-logo']"
+sys.modules['locators'] = locators
+
+
+def fixture_page(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+class _FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """
+    /list?page=N: three vacancy links per page for pages 0-2, a 'next' link on 0-1.
+    /vacancy/<id>: fixtures/vacancy.html with the id filled in.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.startswith('/list'):
+            page = int(self.path.split('page=')[1])
+            links = "".join(
+                f'<a data-qa="serp-item__title" href="/vacancy/{page * 3 + k}?from=list">job</a>'
+                for k in range(3)
+            ) if page < 3 else ""
+            next_link = '<a data-qa="pager-next" href="#">next</a>' if page < 2 else ""
+            body = f"<html><body>{links}{next_link}</body></html>"
+        elif self.path.startswith('/vacancy/'):
+            job_id = self.path.split('/vacancy/')[1].split('?')[0]
+            body = fixture_page('vacancy.html').replace('{job_id}', job_id)
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def fixture_site():
+    """Local HTTP server with listing and vacancy fixture pages; yields its base URL."""
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,96 @@
+# tests/fake_webdriver.py
+"""
+A minimal stand-in for a Selenium WebDriver, backed by requests and lxml.
+
+It covers what the scraper uses: get(), find_element(s) by XPath, get_attribute
+and execute_script(READ_FIELDS_JS, ...). Element text follows the browser's
+innerText rule that block and list items are separated by line breaks.
+"""
+from urllib.parse import urljoin
+import requests
+from lxml import html as lxml_html
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+_BLOCK_TAGS = {'p', 'div', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'br', 'tr', 'section', 'article'}
+
+
+def inner_text(element):
+    """Approximates HTMLElement.innerText: block-level children start a new line."""
+    parts = []
+
+    def walk(node):
+        if node.tag in _BLOCK_TAGS and parts:
+            parts.append("\n")
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if node.tag in _BLOCK_TAGS:
+            parts.append("\n")
+
+    walk(element)
+    lines = [" ".join(line.split()) for line in "".join(parts).split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+class FakeElement:
+    def __init__(self, element, page_url):
+        self.element = element
+        self.page_url = page_url
+
+    @property
+    def text(self):
+        return inner_text(self.element)
+
+    def get_attribute(self, name):
+        value = self.element.get(name)
+        if value and name in ('href', 'src'):
+            return urljoin(self.page_url, value)
+        return value
+
+
+class FakeDriver:
+    def __init__(self):
+        self.session = requests.Session()
+        self.tree = None
+        self.current_url = None
+        self.loads = 0
+        self.quit_called = False
+
+    def get(self, url):
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        self.tree = lxml_html.fromstring(response.text)
+        self.current_url = url
+        self.loads += 1
+
+    def find_elements(self, by, xpath):
+        assert by == By.XPATH
+        if self.tree is None:
+            return []
+        return [FakeElement(node, self.current_url) for node in self.tree.xpath(xpath)]
+
+    def find_element(self, by, xpath):
+        found = self.find_elements(by, xpath)
+        if not found:
+            raise NoSuchElementException(xpath)
+        return found[0]
+
+    def execute_script(self, script, text_xpaths, attribute_xpaths, with_source=False):
+        fields = {}
+        for name, xpath in text_xpaths.items():
+            found = self.find_elements(By.XPATH, xpath)
+            fields[name] = found[0].text.strip() or None if found else None
+        for name, (xpath, attribute) in attribute_xpaths.items():
+            found = self.find_elements(By.XPATH, xpath)
+            fields[name] = found[0].get_attribute(attribute) if found else None
+        if with_source:
+            fields['_page_source'] = lxml_html.tostring(self.tree, encoding='unicode')
+        return fields
+
+    def quit(self):
+        self.quit_called = True
+        self.session.close()
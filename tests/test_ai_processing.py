@@ -0,0 +1,258 @@
+# tests/test_ai_processing.py
+import json
+import threading
+import time
+import types
+import pytest
+import ai_processing
+from classification_cache import ClassificationCache
+from rate_control import QuotaLimiter
+
+
+class _ApiError(Exception):
+    """Stands in for google.api_core exceptions, which carry the HTTP status as `code`."""
+
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class _FakeModel:
+    """
+    Labels each job from its title and records how many calls overlap.
+    `failures` is a list of status codes raised by the first calls, one per call.
+    """
+    model_name = "fake-model"
+
+    def __init__(self, failures=(), delay=0.05):
+        self.failures = list(failures)
+        self.delay = delay
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.prompts.append(prompt)
+            if self.failures:
+                raise _ApiError(self.failures.pop(0))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        jobs = json.loads(prompt.split("### New Input to Process:")[1].split("### Output:")[0])
+        answer = [[job_id, "Backend Developer" if "java" in title.lower() else "Data Analyst"]
+                  for job_id, title, _ in jobs]
+        with self._lock:
+            self.in_flight -= 1
+        return types.SimpleNamespace(text=json.dumps(answer), usage_metadata=None)
+
+
+class _RecordingLimiter(QuotaLimiter):
+    def __init__(self, requests_per_minute=1000):
+        super().__init__(requests_per_minute)
+        self.acquired = 0
+        self.pauses = []
+
+    def acquire(self, tokens=0):
+        self.acquired += 1
+        super().acquire(tokens)
+
+    def pause(self, seconds):
+        self.pauses.append(seconds)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ClassificationCache(str(tmp_path / 'classifications.sqlite'))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Retry back-off delays of ai_processing, recorded instead of slept."""
+    recorded = []
+    monkeypatch.setattr(ai_processing, 'time', types.SimpleNamespace(sleep=recorded.append))
+    return recorded
+
+
+def _titles(n):
+    return [f"{'Java' if i % 2 else 'Data'} job {i}" for i in range(n)]
+
+
+def test_batches_run_concurrently_and_line_up_with_their_jobs(cache):
+    model = _FakeModel()
+    titles = _titles(8)
+
+    labels = ai_processing.identify_job_titles(titles, [["sql"]] * 8, batch_size=1, model=model,
+                                               workers=4, limiter=_RecordingLimiter(), cache=cache)
+
+    assert labels == ["Backend Developer" if i % 2 else "Data Analyst" for i in range(8)]
+    assert len(model.prompts) == 8
+    assert 1 < model.max_in_flight <= 4
+
+
+def test_cached_keys_are_not_sent_again(cache):
+    titles = _titles(4)
+    ai_processing.identify_job_titles(titles, [[]] * 4, model=_FakeModel(), limiter=_RecordingLimiter(), cache=cache)
+    model = _FakeModel()
+
+    labels = ai_processing.identify_job_titles(titles + ["Java job 9"], [[]] * 5, model=model,
+                                               limiter=_RecordingLimiter(), cache=cache)
+
+    assert labels[-1] == "Backend Developer"
+    assert len(model.prompts) == 1
+    assert "Data job 0" not in model.prompts[0]
+
+
+def test_workers_wait_for_the_request_quota(cache):
+    model = _FakeModel(delay=0)
+    limiter = QuotaLimiter(requests_per_minute=2, window=0.3)
+    started = time.monotonic()
+
+    ai_processing.identify_job_titles(_titles(5), [[]] * 5, batch_size=1, model=model,
+                                      workers=5, limiter=limiter, cache=cache)
+
+    # Five requests at two per window need the third window
+    assert time.monotonic() - started >= 0.6
+    assert len(model.prompts) == 5
+
+
+def test_429_pauses_the_shared_quota_and_retries(cache, sleeps):
+    model = _FakeModel(failures=[429, 503])
+    limiter = _RecordingLimiter()
+
+    labels = ai_processing.identify_job_titles(_titles(2), [[]] * 2, model=model, workers=1,
+                                               limiter=limiter, max_retries=2, cache=cache)
+
+    assert labels == ["Data Analyst", "Backend Developer"]
+    assert len(model.prompts) == 3
+    assert len(sleeps) == 2
+    # Only the 429 holds every worker; a 5xx backs off this batch alone
+    assert limiter.pauses == [sleeps[0]]
+    assert limiter.acquired == 3
+
+
+def test_failed_requests_are_not_cached(cache, sleeps):
+    model = _FakeModel(failures=[429, 429])
+
+    labels = ai_processing.identify_job_titles(_titles(2), [[]] * 2, model=model, workers=1,
+                                               limiter=_RecordingLimiter(), max_retries=1, cache=cache)
+
+    assert labels == ["unknown", "unknown"]
+    assert len(model.prompts) == 2
+    assert cache.get_many([(ai_processing.normalize_title(t), "") for t in _titles(2)],
+                          model.model_name, ai_processing.prompt_version()) == {}
+
+
+def test_failed_jobs_can_be_told_apart_from_unknown_answers(cache, sleeps):
+    model = _FakeModel(failures=[503])
+
+    labels = ai_processing.identify_job_titles(_titles(2), [[]] * 2, model=model, workers=1, max_retries=0,
+                                               limiter=_RecordingLimiter(), cache=cache, failed_label=None)
+
+    assert labels == [None, None]
+
+
+def test_prompts_carry_the_original_title_not_the_cache_key(cache):
+    model = _FakeModel()
+
+    ai_processing.identify_job_titles(["C++ developer", "C# developer", " .NET developer"], [[]] * 3,
+                                      model=model, limiter=_RecordingLimiter(), cache=cache)
+
+    jobs = json.loads(model.prompts[0].split("### New Input to Process:")[1].split("### Output:")[0])
+    # "C++ developer" and "C# developer" share the key "c developer", so one of them stands for both
+    assert [title for _, title, _ in jobs] == ["C++ developer", ".NET developer"]
+
+
+class _ScriptedModel:
+    """Answers each prompt with `respond(jobs)`, jobs being the [id, title, skills] items sent."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.sent = []
+
+    def generate_content(self, prompt):
+        jobs = json.loads(prompt.split("### New Input to Process:")[1].split("### Output:")[0])
+        self.sent.append([title for _, title, _ in jobs])
+        answer = self.respond(jobs)
+        if isinstance(answer, Exception):
+            raise answer
+        return types.SimpleNamespace(text=answer if isinstance(answer, str) else json.dumps(answer))
+
+
+def _classify(model, titles, max_retries=0):
+    return ai_processing._classify_batch(model, _RecordingLimiter(), ai_processing._TokenUsage(), 1,
+                                         titles, [""] * len(titles), 8, max_retries=max_retries)
+
+
+def test_partial_answers_are_kept_and_only_the_rest_resent():
+    def respond(jobs):
+        # First call: one valid label, one invalid title, one item missing
+        if len(jobs) == 3:
+            return [[0, "Data Analyst"], [1, "Astronaut"]]
+        return [[job_id, "QA Engineer"] for job_id, _, _ in jobs]
+
+    model = _ScriptedModel(respond)
+
+    labels = _classify(model, ["analyst", "tester", "qa"])
+
+    assert labels == ["Data Analyst", "QA Engineer", "QA Engineer"]
+    assert model.sent == [["analyst", "tester", "qa"], ["tester", "qa"]]
+
+
+def test_unusable_answers_are_halved_down_to_single_items():
+    def respond(jobs):
+        if len(jobs) > 1:
+            return "not json"
+        title = jobs[0][1]
+        return "[]" if title == "hopeless" else [[0, "Backend Developer"]]
+
+    model = _ScriptedModel(respond)
+
+    labels = _classify(model, ["java", "go", "hopeless", "php"])
+
+    assert labels == ["Backend Developer", "Backend Developer", None, "Backend Developer"]
+    assert model.sent == [["java", "go", "hopeless", "php"], ["java", "go"], ["java"], ["go"],
+                          ["hopeless", "php"], ["hopeless"], ["php"]]
+
+
+def test_failed_api_calls_are_not_split():
+    model = _ScriptedModel(lambda jobs: _ApiError(400))
+
+    labels = _classify(model, ["java", "go"])
+
+    assert labels == [None, None]
+    assert len(model.sent) == 1
+
+
+def test_fenced_and_object_answers_are_read():
+    assert ai_processing._parse_labels('```json\n[[0, "QA Engineer"], [5, "QA Engineer"]]\n```', 2) == {0: "QA Engineer"}
+    assert ai_processing._parse_labels('{"jobs": [{"id": 1, "title": "unknown"}]}', 2) == {1: "unknown"}
+
+
+def test_batches_are_packed_under_the_token_budget_and_item_limit():
+    jobs = {(f"key {i}", ""): (f"Разработчик номер {i} " * 3, ["python", "sql"]) for i in range(40)}
+    overhead = ai_processing.estimate_tokens(ai_processing._build_prompt([]))
+    budget = overhead + 200
+
+    batches = ai_processing._pack_batches(jobs, budget, max_items=6, max_skills=8)
+
+    assert [key for batch in batches for key in batch] == list(jobs)
+    assert max(len(batch) for batch in batches) <= 6
+    for batch in batches:
+        prompt = ai_processing._build_prompt([
+            ai_processing._encode_job(i, *jobs[key], 8) for i, key in enumerate(batch)
+        ])
+        sent = ai_processing.estimate_tokens(prompt) + ai_processing.OUTPUT_TOKENS_PER_ITEM * len(batch)
+        assert sent <= budget or len(batch) == 1
+    assert len(ai_processing._pack_batches(jobs, 10 ** 6, max_items=100, max_skills=8)) == 1
+
+
+def test_a_job_larger_than_the_budget_still_gets_its_own_batch():
+    jobs = {("big", ""): ("x" * 2000, []), ("small", ""): ("qa", [])}
+
+    batches = ai_processing._pack_batches(jobs, token_budget=50, max_items=10, max_skills=8)
+
+    assert batches == [[("big", "")], [("small", "")]]
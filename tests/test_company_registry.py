@@ -0,0 +1,93 @@
+# tests/test_company_registry.py
+import sqlite3
+import pandas as pd
+import pytest
+from company_registry import CompanyRegistry, company_key, resolve_companies
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'companies.sqlite')
+
+
+@pytest.fixture
+def registry(path):
+    registry = CompanyRegistry(path)
+    yield registry
+    registry.close()
+
+
+def test_company_key_drops_legal_forms_case_and_script():
+    assert company_key("ООО «Uzum Market»") == "uzum market"
+    assert company_key("Uzum market LLC") == "uzum market"
+    assert company_key("АО Узбектелеком") == "uzbektelekom"
+
+
+def test_variants_of_one_company_resolve_to_one_id(registry):
+    first, canonical = registry.resolve("ООО Uzum Market")
+
+    assert registry.resolve("Uzum market LLC") == (first, canonical)
+    assert registry.resolve("UZUM") == (first, canonical)
+    assert registry.resolve("N/A") == (None, "N/A")
+    assert len(registry) == 1
+
+
+def test_longer_names_do_not_match_a_shorter_company(registry):
+    uzum, _ = registry.resolve("UZUM")
+    artel, _ = registry.resolve("Artel")
+
+    ids = {registry.resolve(name)[0] for name in ["Uzum Market", "Uzum Bank", "Uzum Tezkor"]}
+
+    assert len(ids) == 3 and uzum not in ids
+    assert registry.resolve("Artel Electronics")[0] != registry.resolve("Artel Group")[0] != artel
+
+
+def test_abbreviation_is_not_resolved_when_ambiguous(registry):
+    market, _ = registry.resolve("Uzum Market")
+    bank, _ = registry.resolve("Uzum Bank")
+
+    uzum, canonical = registry.resolve("UZUM")
+
+    assert uzum not in (market, bank)
+    assert canonical == "UZUM"
+
+
+def test_abbreviation_matches_are_dropped_when_a_second_company_arrives(path):
+    registry = CompanyRegistry(path)
+    market, _ = registry.resolve("Uzum Market")
+    assert registry.resolve("UZUM")[0] == market
+
+    bank, _ = registry.resolve("Uzum Bank")
+
+    assert registry.resolve("UZUM")[0] not in (market, bank)
+    registry.close()
+    reopened = CompanyRegistry(path)
+    assert reopened.resolve("Uzum market LLC")[0] == market
+    assert reopened.resolve("UZUM")[0] not in (market, bank)
+    reopened.close()
+
+
+def test_registries_without_prefix_tracking_are_upgraded(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE company_aliases (alias TEXT PRIMARY KEY, company_id INTEGER NOT NULL, "
+                 "created_at REAL NOT NULL)")
+    conn.commit()
+    conn.close()
+
+    registry = CompanyRegistry(path)
+    assert registry.resolve("Uzum Market")[0] == registry.resolve("UZUM")[0]
+    registry.close()
+
+
+def test_resolve_companies_adds_canonical_names_and_ids(registry, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = pd.DataFrame({'Company': ["ООО Uzum Market", "Uzum market LLC", "Artel", "N/A"]})
+
+    resolved = resolve_companies(df, registry=registry)
+
+    assert resolved['Company'].tolist()[:3] == ["ООО Uzum Market", "ООО Uzum Market", "Artel"]
+    assert resolved['Company_ID'].tolist()[:3] == [1, 1, 2]
+    assert pd.isna(resolved['Company_ID'][3])
+    # An empty registry is still the one to use, not the default file
+    assert len(registry) == 2
+    assert not (tmp_path / 'Data').exists()
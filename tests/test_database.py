@@ -0,0 +1,182 @@
+# tests/test_database.py
+import sqlite3
+import pandas as pd
+import pytest
+import database
+
+
+@pytest.fixture
+def db_config(tmp_path):
+    return {'dialect': 'sqlite', 'database': str(tmp_path / 'jobs.sqlite'), 'table_name': 'JobListings'}
+
+
+def _frame(ids, **columns):
+    data = {'ID': ids, 'Posted_date': ['2024-07-12'] * len(ids), 'Job_Title': [f"Job {i}" for i in ids]}
+    data.update(columns)
+    return pd.DataFrame(data)
+
+
+def test_insert_to_sql_reports_the_stored_keys(db_config):
+    stats = database.insert_to_sql(_frame(['1', '2']), db_config)
+    assert sorted(stats['keys']) == ['1', '2']
+
+    stats = database.insert_to_sql(_frame(['1', '2', '3']), db_config)
+    assert stats['written'] == 1 and stats['unchanged'] == 2
+    assert sorted(stats['keys']) == ['1', '2', '3']
+
+
+def reject_id(db_config, job_id):
+    """Makes the target table refuse one ID, as a constraint violation would."""
+    conn = sqlite3.connect(db_config['database'])
+    conn.execute(f"""
+        CREATE TRIGGER reject_{job_id} BEFORE INSERT ON JobListings WHEN NEW.ID = '{job_id}'
+        BEGIN SELECT RAISE(ABORT, 'rejected row'); END
+    """)
+    conn.commit()
+    conn.close()
+
+
+def test_rejected_rows_are_not_reported_as_stored(db_config):
+    database.insert_to_sql(_frame(['1']), db_config)
+    reject_id(db_config, '3')
+
+    stats = database.insert_to_sql(_frame(['2', '3', '4']), db_config)
+
+    assert stats['failed'] == 1
+    assert sorted(stats['keys']) == ['2', '4']
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    database.migrations.apply_migrations(conn, 'sqlite', 'JobListings')
+    yield conn
+    conn.close()
+
+
+def _stored(conn):
+    return conn.execute("SELECT ID, Job_Title, Company FROM JobListings ORDER BY ID").fetchall()
+
+
+def test_upsert_sql_is_built_once_per_argument_set():
+    first = database.upsert_sql('sqlite', 'JobListings', ('ID', 'Job_Title'))
+
+    assert database.upsert_sql('sqlite', 'JobListings', ('ID', 'Job_Title')) is first
+    assert database.upsert_sql('sqlite', 'JobListings', ('ID', 'Company')) is not first
+
+
+def test_upsert_rows_inserts_and_updates_existing_ids(conn):
+    columns = ['ID', 'Job_Title', 'Company']
+    assert database.upsert_rows(conn, 'sqlite', 'JobListings', columns, [('1', 'Dev', 'A'), ('2', 'QA', 'B')]) == 2
+
+    written = database.upsert_rows(conn, 'sqlite', 'JobListings', columns, [('2', 'Senior QA', 'B'), ('3', 'PM', 'C')])
+
+    assert written == 2
+    assert _stored(conn) == [('1', 'Dev', 'A'), ('2', 'Senior QA', 'B'), ('3', 'PM', 'C')]
+
+
+def test_upsert_rows_keeps_the_last_row_of_a_repeated_key(conn):
+    rows = [('1', 'Dev', 'A'), ('1', 'Lead Dev', 'A'), (None, 'No ID', 'X'), ('2', 'QA', 'B')]
+
+    written = database.upsert_rows(conn, 'sqlite', 'JobListings', ['ID', 'Job_Title', 'Company'], rows)
+
+    assert written == 2
+    assert _stored(conn) == [('1', 'Lead Dev', 'A'), ('2', 'QA', 'B')]
+
+
+def test_upsert_rows_rolls_back_the_batch_when_one_row_fails(conn):
+    columns = ['ID', 'Job_Title', 'Company']
+    database.upsert_rows(conn, 'sqlite', 'JobListings', columns, [('1', 'Dev', 'A')])
+    conn.execute("""
+        CREATE TRIGGER reject_3 BEFORE INSERT ON JobListings WHEN NEW.ID = '3'
+        BEGIN SELECT RAISE(ABORT, 'rejected row'); END
+    """)
+
+    with pytest.raises(sqlite3.IntegrityError):
+        database.upsert_rows(conn, 'sqlite', 'JobListings', columns, [('1', 'Lead Dev', 'A'), ('2', 'QA', 'B'), ('3', 'PM', 'C')])
+
+    assert _stored(conn) == [('1', 'Dev', 'A')]
+    # Nothing left behind by the failed batch blocks the next one on this connection
+    assert database.upsert_rows(conn, 'sqlite', 'JobListings', columns, [('2', 'QA', 'B')]) == 1
+
+
+class _FailingConnection:
+    """SQLite connection whose bulk inserts fail with `error`, counting the attempts."""
+
+    def __init__(self, conn, error):
+        self._conn = conn
+        self.error = error
+        self.attempts = 0
+
+    def cursor(self):
+        connection, cursor = self, self._conn.cursor()
+
+        class Cursor:
+            def __getattr__(self, name):
+                return getattr(cursor, name)
+
+            def executemany(self, sql, rows):
+                connection.attempts += 1
+                raise connection.error
+
+        return Cursor()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def test_write_rows_raises_operational_errors_without_splitting(conn):
+    failing = _FailingConnection(conn, sqlite3.OperationalError("disk I/O error"))
+    rows = [(str(i), f"Job {i}") for i in range(8)]
+
+    with pytest.raises(sqlite3.OperationalError):
+        database.write_rows(failing, 'sqlite', 'JobListings', ['ID', 'Job_Title'], rows)
+
+    assert failing.attempts == 1
+
+
+def test_write_rows_splits_chunks_on_rejected_rows(conn):
+    failing = _FailingConnection(conn, sqlite3.IntegrityError("constraint failed"))
+    rows = [(str(i), f"Job {i}") for i in range(4)]
+
+    stats = database.write_rows(failing, 'sqlite', 'JobListings', ['ID', 'Job_Title'], rows)
+
+    assert stats['failed'] == 4
+    assert failing.attempts == 7
+
+
+def test_broken_connections_are_not_returned_to_the_pool(db_config, monkeypatch):
+    session = database.get_session(db_config)
+    session.ensure_schema()
+
+    def broken_write(conn, *args, **kwargs):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(database, 'write_rows', broken_write)
+
+    assert database.insert_to_sql(_frame(['1']), db_config) is None
+    assert session._idle.qsize() == 0
+
+
+def test_fingerprint_read_errors_are_raised(conn, monkeypatch):
+    def lost_connection(*args):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(database, '_stored_fingerprints', lost_connection)
+
+    with pytest.raises(sqlite3.OperationalError):
+        database.write_rows(conn, 'sqlite', 'JobListings', ['ID', 'Job_Title'], [('1', 'Dev')])
+    assert _stored(conn) == []
+
+
+def test_rows_loaded_by_either_path_share_a_fingerprint(conn):
+    scraped = ('7', '2024-07-12', 'Backend Developer', 'Java dev', 'Uzum', 'N/A', 'Uzbekistan',
+               'Tashkent', 'Java, SQL', '1 000 $', 'hh.uz')
+    # push_to_data_base writes the scraped columns only, insert_to_sql adds the derived ones
+    scraped_columns = database.TABLE_COLUMNS[:len(scraped)]
+    derived = (1000, 1000, 1000, 'USD', None, 3)
+    database.write_rows(conn, 'sqlite', 'JobListings', scraped_columns, [scraped])
+
+    stats = database.write_rows(conn, 'sqlite', 'JobListings', database.TABLE_COLUMNS, [scraped + derived])
+
+    assert stats['unchanged'] == 1 and stats['written'] == 0
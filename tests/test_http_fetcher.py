@@ -0,0 +1,52 @@
+# tests/test_http_fetcher.py
+import pytest
+from selenium.webdriver.support.ui import WebDriverWait
+from conftest import fixture_page
+from fake_webdriver import FakeDriver
+import http_fetcher
+import scraper
+from rate_control import RateController
+
+
+def _normalized(fields):
+    return {name: " ".join(value.split()) if isinstance(value, str) else value for name, value in fields.items()}
+
+
+def _selenium_fields(driver, url):
+    scrape = scraper.GhhScraper(driver, WebDriverWait(driver, 5), base_url=url,
+                                rate=RateController(initial_rate=200, max_rate=500))
+    scrape._timed_load(url, driver.get, scrape.wait, http_fetcher.FIELD_XPATHS['title'])
+    return scrape._read_fields(driver)
+
+
+def test_adjacent_elements_are_separated():
+    page = "<html><body><ul class='vacancy-skill-list'><li><span>Python</span></li><li><span>SQL</span></li></ul></body></html>"
+    assert http_fetcher.extract_fields_from_html(page)['skills'] == "Python SQL"
+
+
+def test_static_fields_match_browser_fields(fixture_site):
+    url = fixture_site + "/vacancy/7"
+    static = http_fetcher.extract_fields_from_html(fixture_page('vacancy.html').replace('{job_id}', '7'), url)
+    browser_fields = _selenium_fields(FakeDriver(), url)
+
+    assert _normalized(static) == _normalized(browser_fields)
+    static_record = scraper.build_record('7', static, scraper.SKILL_MATCHER)
+    browser_record = scraper.build_record('7', browser_fields, scraper.SKILL_MATCHER)
+    assert static_record == browser_record
+    assert static_record['Skills'] == ["Git", "Python", "SQL"]
+
+
+def test_static_fields_match_chrome(fixture_site):
+    """Same comparison against a real headless Chrome, where one is installed."""
+    browser = pytest.importorskip('browser')
+    try:
+        driver = browser.create_driver(headless=True)
+    except Exception as e:
+        pytest.skip(f"Chrome is not available: {e}")
+    url = fixture_site + "/vacancy/7"
+    try:
+        browser_fields = _selenium_fields(driver, url)
+    finally:
+        driver.quit()
+    static = http_fetcher.extract_fields_from_html(fixture_page('vacancy.html').replace('{job_id}', '7'), url)
+    assert _normalized(static) == _normalized(browser_fields)
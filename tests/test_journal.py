@@ -0,0 +1,52 @@
+# tests/test_journal.py
+import threading
+import pytest
+from selenium.webdriver.support.ui import WebDriverWait
+from fake_webdriver import FakeDriver
+import scraper
+from journal import ScrapeJournal
+from rate_control import RateController
+
+
+def test_concurrent_appends_are_all_synced(tmp_path):
+    journal = ScrapeJournal(str(tmp_path / 'journal.jsonl'), fsync_every=7).open()
+
+    def append(worker):
+        for n in range(100):
+            journal.append_record({"ID": f"{worker}-{n}"}, page_num=0)
+
+    threads = [threading.Thread(target=append, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 0 <= journal._unsynced < journal.fsync_every
+    journal.close()
+
+    assert len(journal.read_results()['ID']) == 800
+
+
+def test_journal_is_closed_when_the_scrape_fails(fixture_site, tmp_path):
+    journal = ScrapeJournal(str(tmp_path / 'journal.jsonl')).open()
+    driver = FakeDriver()
+    scrape = scraper.GhhScraper(
+        driver, WebDriverWait(driver, 5), base_url=fixture_site + "/list?page={page_num}",
+        rate=RateController(initial_rate=200, max_rate=500), journal=journal
+    )
+    fetch_listing = scrape._fetch_listing
+
+    def failing_listing(url):
+        if url.endswith("page=1"):
+            raise RuntimeError("browser crashed")
+        return fetch_listing(url)
+
+    scrape._fetch_listing = failing_listing
+    scrape._browser_fields_in_tab = lambda job_info: scrape._browser_fields_in_driver(job_info, driver, scrape.wait)
+
+    with pytest.raises(RuntimeError):
+        scrape.scrape()
+
+    assert journal._file is None
+    next_page, done_ids = ScrapeJournal(journal.path).resume_state()
+    assert next_page == 1
+    assert done_ids == {"0", "1", "2"}
@@ -0,0 +1,16 @@
+# tests/test_main.py
+import pandas as pd
+import main
+
+
+def test_unclassified_jobs_are_not_recorded_as_seen():
+    df_raw = pd.DataFrame({
+        'ID': ['1', '2', '3', '4'],
+        'Job_Title_from_List': ["Backend Developer", "unknown", None, "Data Analyst"],
+    })
+    df_cleaned = df_raw[df_raw['ID'].isin(['1'])]
+
+    seen = main.settled_ids(df_raw, df_cleaned, stored_keys=['1'])
+
+    # '2' was answered "unknown" and '4' dropped while cleaning; '3' got no answer at all
+    assert seen == ['1', '2', '4']
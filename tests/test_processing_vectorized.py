@@ -0,0 +1,122 @@
+# tests/test_processing_vectorized.py
+import random
+import pandas as pd
+import pytest
+import processing as proc
+import processing_vectorized as pv
+import salary
+
+# Hand-picked cases per column, extended below with generated rows that are all distinct
+SAMPLE_CORPUS = {
+    "company": [
+        "ООО Uzum Market", "Uzum market LLC", "АО Узбектелеком", "ИП Иванов", "N/A", "",
+        "ЗАО  Рога   и копыта", "EPAM Systems", "ООО \"Яндекс\"", "  ПАО Сбербанк  ", "   ",
+        "ОООАО Щука и Ёж", "Объединение «Чайхана»\tплюс", "ОАО", "Ўзбекистон темир йўллари",
+    ],
+    "location_date": [
+        "Вакансия опубликована 12 июля 2024 в Ташкенте", "12 июля 2024", "July 12, 2024",
+        "Job posted on 3 March 2024 in Tashkent", "N/A", "", "e'lon 2024 da Toshkent, Chilonzor",
+        "05 января 2025", "31 December 2023", "  7 MAY 2024 ", "29 февраля 2024", "29 февраля 2023",
+        "31 апреля 2024", "February 30, 2024", "march  1,  2020", "1 March 0000", "12 Июля 2024",
+        "12 июля 2024, Ташкент", "12 july 2024 в Самарканде", "Мая 5 2024", "в Бухаре", "in Namangan region",
+        "10 сентября 2024 в Ташкентской области, Чирчик", " 5 June 2024", "05 may 2024 май",
+    ],
+    "location": [
+        "Ташкенте", "Toshkent, Chilonzor", "Ташкентской области", "Tashkent", "Бухаре",
+        "Samarqand", "Москве", "N/A", "", "Toshkent viloyati, Chirchiq", "Мирзо-Улугбекский район",
+        "Mirzo Ulug'bek", "Тошкент вилояти", "Фергана", "Qo'qon", "a", "Самарканд Бухара", "Yangiyo'l",
+    ],
+    "salary": [
+        "from 800 to 2 000 $ after taxes", "from 10 000 000 to 25 000 000 so'm after taxes",
+        "2 000 $ before tax", "15 000 ₽ after taxes", "до 1 000 $ до вычета налогов",
+        "от 10 000 000 до 20 000 000 so'm до вычета налогов", "от 3 000 000 до 5 000 000 сум на руки",
+        "N/A", "", "договорная", "1 500 EUR", "from 1000 to 2000 USD", "99999999999999999 UZS",
+        "от 1 000 000 до 99999999999999999 сум", "1,500 usd after tax before tax", "from 7 to 3 RUB",
+        "от 500", "to 900 $", "3 000 000 UZS на руки", "1000 rubles", "1000 usdt", "10 000 000 сум",
+    ],
+}
+
+_MONTHS = ["января", "февраля", "марта", "апреля", "мая", "июня", "июля", "августа",
+           "сентября", "октября", "ноября", "декабря", "January", "July", "december", "Sept"]
+_PLACES = ["Ташкенте", "Toshkent", "Бухаре", "Samarqand", "Фергане", "Chilonzor", "Москве",
+           "Ташкентской области", "Qo'qon", "Нукусе", "Andijon", "Termiz"]
+_CURRENCIES = ["$", "USD", "so'm", "сум", "₽", "EUR", "руб.", ""]
+
+
+def _unique_corpus(n, seed=0):
+    """`n` distinct rows per column, as the 100k-row benchmark uses."""
+    rng = random.Random(seed)
+    corpus = {column: [] for column in SAMPLE_CORPUS}
+    for i in range(n):
+        day, month, year = rng.randint(0, 32), rng.choice(_MONTHS), rng.randint(1999, 2026)
+        place = rng.choice(_PLACES)
+        corpus["company"].append(f"{rng.choice(['ООО ', 'АО ', '', 'ИП '])}Компания {i} {rng.choice(['Щит', 'Uzum', 'Ёлка'])}")
+        corpus["location_date"].append(rng.choice([
+            f"{day} {month} {year}",
+            f"Вакансия опубликована {day} {month} {year} в {place} {i}",
+            f"{month.capitalize()} {day}, {year}",
+            f"Job {i} posted on {day} {month} {year} in {place}",
+        ]))
+        corpus["location"].append(rng.choice([f"{place}", f"{place}, {rng.choice(_PLACES)}", f"{place} {i}"]))
+        low, high = rng.randint(1, 9_999) * 1000, rng.randint(10_000, 99_999) * 1000
+        corpus["salary"].append(rng.choice([
+            f"от {low:,} до {high:,} {rng.choice(_CURRENCIES)} на руки".replace(",", " "),
+            f"from {low} to {high} {rng.choice(_CURRENCIES)} before tax",
+            f"до {high:,} {rng.choice(_CURRENCIES)}",
+            f"{low + i} {rng.choice(_CURRENCIES)}",
+        ]))
+    return corpus
+
+
+CORPUS = {column: values + _unique_corpus(2000)[column] for column, values in SAMPLE_CORPUS.items()}
+
+
+@pytest.mark.parametrize("column, scalar, vectorized", [
+    ("company", proc.transliterate_company_name, pv.transliterate_company_name),
+    ("location_date", proc.parse_posted_date, pv.parse_posted_date),
+    ("location_date", proc.extract_location_from_text, pv.extract_location_from_text),
+    ("location", proc.identify_region, pv.identify_region),
+    ("salary", proc.extract_salary, pv.extract_salary),
+])
+def test_column_wise_matches_scalar(column, scalar, vectorized):
+    series = pd.Series(CORPUS[column], dtype=object)
+
+    actual = vectorized(series)
+
+    expected = [scalar(value) for value in series]
+    mismatches = [(v, e, a) for v, e, a in zip(series, expected, actual) if e != a]
+    assert not mismatches[:5]
+    assert actual.index.equals(series.index)
+
+
+def test_location_pipeline_matches_scalar():
+    texts = pd.Series(CORPUS["location_date"], dtype=object)
+
+    actual = pv.identify_region(pv.extract_location_from_text(texts))
+
+    assert actual.tolist() == [proc.identify_region(proc.extract_location_from_text(text)) for text in texts]
+
+
+def test_salary_frame_matches_salary_fields(tmp_path):
+    rates_path = tmp_path / 'rates.csv'
+    rates_path.write_text("date,currency,rate_to_uzs\n2000-01-01,USD,13000\n2024-01-01,USD,12650.5\n"
+                          "2024-06-01,USD,12600\n2000-01-01,RUB,150\n2024-01-01,EUR,13700.25\n", encoding='utf-8')
+    rates = salary.ExchangeRates(str(rates_path))
+    texts = pd.Series(CORPUS["salary"], index=range(10, 10 + len(CORPUS["salary"])), dtype=object)
+    dates = pd.Series([["2023-12-31", "2024-01-01", "2024-07-15", None, "", "1999-01-01"][i % 6]
+                       for i in range(len(texts))], index=texts.index, dtype=object)
+
+    frame = pv.salary_frame(texts, dates, rates)
+
+    expected = pd.DataFrame([salary.salary_fields(text, day, rates) for text, day in zip(texts, dates)],
+                            index=texts.index, columns=salary.SALARY_COLUMNS, dtype=object)
+    expected = expected.where(expected.notna(), None)
+    assert frame.to_dict('records') == expected.to_dict('records')
+
+
+def test_unresolved_locations_keep_their_text():
+    locations = pd.Series(["в Ташкенте", "Moscow", "Almaty, Kazakhstan", "", "N/A"], dtype=object)
+
+    expected = ["UZ-TK", "Moscow", "Almaty, Kazakhstan", "N/A", "N/A"]
+    assert [proc.identify_region(location) for location in locations] == expected
+    assert pv.identify_region(locations).tolist() == expected
@@ -0,0 +1,127 @@
+# tests/test_rate_control.py
+import time
+import threading
+from selenium.webdriver.support.ui import WebDriverWait
+import scraper
+from rate_control import RateController, QuotaLimiter
+
+
+class _RecordingRate(RateController):
+    def __init__(self):
+        super().__init__(initial_rate=1000, max_rate=1000)
+        self.latencies = []
+
+    def record(self, url, latency, status=None, error=False):
+        self.latencies.append(latency)
+        super().record(url, latency, status=status, error=error)
+
+
+class _ReadyWait:
+    def until(self, condition):
+        return True
+
+
+def test_waiting_for_a_page_slot_is_not_latency():
+    rate = _RecordingRate()
+    scrape = scraper.GhhScraper(None, WebDriverWait(None, 1), base_url="http://fixture/{page_num}",
+                                max_concurrency=1, rate=rate)
+    scrape.page_slots.acquire()
+    threading.Timer(0.5, scrape.page_slots.release).start()
+
+    scrape._timed_load("http://fixture/1", lambda url: None, _ReadyWait(), "//h1")
+
+    assert rate.latencies and rate.latencies[0] < 0.2
+
+
+def test_quota_limiter_holds_requests_past_the_window():
+    limiter = QuotaLimiter(requests_per_minute=2, window=0.2)
+    started = time.monotonic()
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert time.monotonic() - started >= 0.2
+
+
+def test_quota_limiter_counts_tokens_but_lets_an_oversized_request_through():
+    limiter = QuotaLimiter(requests_per_minute=100, tokens_per_minute=100, window=0.2)
+    started = time.monotonic()
+
+    limiter.acquire(500)
+    first = time.monotonic() - started
+    limiter.acquire(10)
+
+    assert first < 0.1
+    assert time.monotonic() - started >= 0.2
+
+
+def test_quota_limiter_pause_holds_every_thread():
+    limiter = QuotaLimiter(requests_per_minute=100, window=0.2)
+    limiter.pause(0.2)
+    waited = []
+
+    def worker():
+        started = time.monotonic()
+        limiter.acquire()
+        waited.append(time.monotonic() - started)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(waited) == 3 and min(waited) >= 0.15
+
+
+def _controller(**options):
+    options.setdefault('jitter', 0)
+    return RateController(initial_rate=1.0, min_rate=0.1, max_rate=2.0, increase_step=0.25,
+                          decrease_factor=0.5, slow_latency=4.0, **options)
+
+
+def test_good_responses_increase_the_rate_additively_up_to_the_cap():
+    rate = _controller(host_max_rates={'slow.example': 1.5})
+
+    for expected in [1.25, 1.5, 1.75, 2.0, 2.0]:
+        rate.record("https://hh.uz/vacancy/1", latency=0.5, status=200)
+        assert rate.current_rate("hh.uz") == expected
+    for _ in range(5):
+        rate.record("https://slow.example/page", latency=0.5)
+    assert rate.current_rate("slow.example") == 1.5
+
+
+def test_errors_throttling_and_slow_pages_halve_the_rate_down_to_the_floor():
+    rate = _controller()
+
+    rate.record("hh.uz", latency=0.5, error=True)
+    assert rate.current_rate("hh.uz") == 0.5
+    rate.record("hh.uz", latency=0.5, status=429)
+    assert rate.current_rate("hh.uz") == 0.25
+    rate.record("hh.uz", latency=0.5, status=503)
+    assert rate.current_rate("hh.uz") == 0.125
+    rate.record("hh.uz", latency=9.0, status=200)
+    assert rate.current_rate("hh.uz") == 0.1
+    assert rate.snapshot()["hh.uz"]["errors"] == 3
+    assert rate.snapshot()["hh.uz"]["requests"] == 4
+
+
+def test_hosts_are_paced_independently():
+    rate = _controller()
+
+    rate.record("https://hh.uz/a", latency=0.5, status=429)
+
+    assert rate.current_rate("https://hh.uz/b") == 0.5
+    assert rate.current_rate("https://other.example/") == 1.0
+
+
+def test_throttled_responses_push_back_the_next_slot():
+    rate = RateController(initial_rate=100, max_rate=100, decrease_factor=0.5, jitter=0)
+    rate.acquire("hh.uz")
+
+    rate.record("hh.uz", latency=0.1, status=429)
+    started = time.monotonic()
+    rate.acquire("hh.uz")
+
+    # 1 / 50 requests per second after the cut, instead of the 1/100 already reserved
+    assert time.monotonic() - started >= 0.015
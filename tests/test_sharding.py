@@ -0,0 +1,97 @@
+# tests/test_sharding.py
+import os
+import multiprocessing
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from selenium.webdriver.support.ui import WebDriverWait
+from fake_webdriver import FakeDriver
+import config
+import scraper
+import sharding
+from rate_control import RateController
+
+
+def _claim_all(budget):
+    granted = 0
+    while not budget.exhausted():
+        granted += budget.claim(3)
+    return granted
+
+
+def test_job_budget_is_shared_across_processes():
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=4) as executor:
+        budget = sharding.JobBudget(50, manager)
+        granted = list(executor.map(_claim_all, [budget] * 4))
+    assert sum(granted) == 50
+
+
+def test_shard_settings_split_the_budget(monkeypatch):
+    monkeypatch.setattr(config, 'RATE_LIMIT', {'max_rate': 2.0, 'host_max_rates': {'hh.uz': 1.0}}, raising=False)
+    monkeypatch.setattr(config, 'SCRAPER_WORKERS', 8, raising=False)
+    monkeypatch.setattr(config, 'SCRAPER_MAX_CONCURRENCY', 4, raising=False)
+
+    settings = sharding.shard_settings(4)
+
+    assert settings['rate'].max_rate == 0.5
+    assert settings['rate'].host_max_rates == {'hh.uz': 0.25}
+    assert settings['workers'] == 2
+    assert settings['max_concurrency'] == 1
+
+
+def test_scraper_stops_when_the_shared_budget_is_spent(fixture_site):
+    driver = FakeDriver()
+    with multiprocessing.Manager() as manager:
+        scrape = scraper.GhhScraper(
+            driver, WebDriverWait(driver, 5), base_url=fixture_site + "/list?page={page_num}",
+            rate=RateController(initial_rate=200, max_rate=500), job_budget=sharding.JobBudget(4, manager)
+        )
+        scrape._browser_fields_in_tab = lambda job_info: scrape._browser_fields_in_driver(job_info, driver, scrape.wait)
+        results = scrape.scrape()
+    assert results['ID'] == ['0', '1', '2', '3']
+    assert scrape.stop_reason == "limit"
+
+
+LAST_PAGE = 22
+
+
+def _fake_run_shard(shard_id, start, stop, out_dir, known_ids, resume, processes, job_budget):
+    open(os.path.join(out_dir, f"ran_{shard_id}"), 'w').close()
+    return shard_id, out_dir, 0, "end" if start <= LAST_PAGE < stop else "range"
+
+
+def test_coordinator_schedules_shards_until_the_last_page(monkeypatch, tmp_path):
+    monkeypatch.setattr(sharding, 'run_shard', _fake_run_shard)
+    monkeypatch.setattr(config, 'SCRAPER_MAX_CONCURRENCY', 2, raising=False)
+    monkeypatch.setattr(config, 'MAX_PAGES', None, raising=False)
+
+    sharding.run_sharded(2, pages_per_shard=5, out_dir=str(tmp_path))
+
+    ran = sorted(int(name.split('_')[1]) for name in os.listdir(tmp_path) if name.startswith('ran_'))
+    # Shard 4 holds page 22; at most one more shard was already running when it finished
+    assert ran[:5] == [0, 1, 2, 3, 4]
+    assert len(ran) <= 6
+
+
+def _failing_run_shard(shard_id, start, stop, out_dir, known_ids, resume, processes, job_budget):
+    open(os.path.join(out_dir, f"ran_{shard_id}"), 'w').close()
+    raise RuntimeError("chrome not found")
+
+
+def test_coordinator_stops_scheduling_after_a_shard_fails(monkeypatch, tmp_path):
+    monkeypatch.setattr(sharding, 'run_shard', _failing_run_shard)
+    monkeypatch.setattr(config, 'SCRAPER_MAX_CONCURRENCY', 2, raising=False)
+    monkeypatch.setattr(config, 'MAX_PAGES', None, raising=False)
+
+    merged = sharding.run_sharded(2, pages_per_shard=5, out_dir=str(tmp_path))
+
+    ran = [name for name in os.listdir(tmp_path) if name.startswith('ran_')]
+    # The shards already running when the first one failed, and no more
+    assert 1 <= len(ran) <= 2
+    assert merged.empty
+
+
+def test_coordinator_rejects_more_shards_than_the_concurrency_budget(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, 'SCRAPER_MAX_CONCURRENCY', 1, raising=False)
+
+    with pytest.raises(ValueError, match="SCRAPER_MAX_CONCURRENCY"):
+        sharding.run_sharded(4, out_dir=str(tmp_path))
@@ -0,0 +1,44 @@
+# tests/test_skills.py
+import re
+import pytest
+import processing
+from skills import SkillMatcher, _trie_pattern
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return SkillMatcher.from_file()
+
+
+def test_longer_skill_names_do_not_yield_their_prefix(matcher):
+    assert matcher.match("JavaScript, TypeScript") == ["JavaScript", "TypeScript"]
+    assert matcher.match("GitLab CI") == ["GitLab"]
+    assert matcher.match("Java и Git") == ["Git", "Java"]
+
+
+def test_aliases_map_to_the_canonical_name(matcher):
+    assert matcher.match("JS, Постгрес") == ["JavaScript", "PostgreSQL"]
+    assert matcher.match("опыт с postgres и k8s") == ["Kubernetes", "PostgreSQL"]
+
+
+def test_names_ending_in_symbols_keep_their_edges(matcher):
+    assert matcher.match("C++ и C#") == ["C#", "C++"]
+    assert matcher.match("ASP.NET Core") == [".NET"]
+
+
+def test_trie_pattern_matches_exactly_the_words_sharing_a_prefix():
+    words = ["go", "golang", "gorm", "git", "gitlab"]
+    pattern = re.compile(f"(?:{_trie_pattern(words)})")
+
+    assert all(pattern.fullmatch(word) for word in words)
+    assert not any(pattern.fullmatch(word) for word in ["g", "gol", "gitl", "gorms", "gi"])
+    # Both optional endings are nested under their shared prefix
+    assert _trie_pattern(["git", "gitlab"]) == "git(?:lab)?"
+
+
+def test_empty_taxonomy_matches_nothing():
+    assert SkillMatcher({}).match("Python") == []
+
+
+def test_plain_skill_lists_get_the_same_boundaries():
+    assert processing.extract_skills("JavaScript, GitLab", ["Java", "JavaScript", "Git"]) == ["JavaScript"]
@@ -0,0 +1,69 @@
+# tests/test_snapshots.py
+import os
+import pytest
+from conftest import fixture_page
+import http_fetcher
+import scraper
+from journal import RESULT_COLUMNS
+from replay import replay_snapshots
+from snapshots import SnapshotStore
+
+
+def _objects(root):
+    return [name for _, _, names in os.walk(os.path.join(root, 'objects')) for name in names]
+
+
+def test_identical_pages_are_stored_once(tmp_path):
+    store = SnapshotStore(str(tmp_path), codec='gzip')
+
+    first = store.put('1', "<html>same</html>", fetched_at="2024-07-01T00:00:00+00:00")
+    second = store.put('2', "<html>same</html>", fetched_at="2024-07-02T00:00:00+00:00")
+    store.put('1', "<html>changed</html>", fetched_at="2024-07-03T00:00:00+00:00")
+
+    assert first == second
+    assert len(_objects(str(tmp_path))) == 2
+    assert len(store.entries(latest_only=False)) == 3
+
+
+def test_latest_only_keeps_the_last_fetch_of_each_id(tmp_path):
+    store = SnapshotStore(str(tmp_path), codec='gzip')
+    store.put('1', "v2", fetched_at="2024-07-02T00:00:00+00:00")
+    store.put('2', "only", fetched_at="2024-07-01T12:00:00+00:00")
+    store.put('1', "v1", fetched_at="2024-07-01T00:00:00+00:00")
+
+    latest = store.entries(latest_only=True)
+
+    assert [(entry['id'], store.get(entry['digest'], entry['codec'])) for entry in latest] == [
+        ('2', "only"), ('1', "v2")
+    ]
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_pages_round_trip(tmp_path, codec):
+    if codec == 'zstd':
+        pytest.importorskip('zstandard')
+    store = SnapshotStore(str(tmp_path), codec=codec)
+    page = fixture_page('vacancy.html')
+
+    digest = store.put('42', page)
+
+    assert store.get(digest, codec) == page
+    assert _objects(str(tmp_path))[0].endswith('.zst' if codec == 'zstd' else '.gz')
+
+
+def test_replay_matches_the_scraper_on_the_fixture_page(tmp_path):
+    store = SnapshotStore(str(tmp_path), codec='gzip')
+    pages = {job_id: fixture_page('vacancy.html').replace('{job_id}', job_id) for job_id in ['7', '8']}
+    for job_id, page in pages.items():
+        store.put(job_id, page, url=f"http://fixture/vacancy/{job_id}")
+
+    replayed = replay_snapshots(str(tmp_path), workers=1)
+
+    expected = [
+        scraper.build_record(job_id, http_fetcher.extract_fields_from_html(page, f"http://fixture/vacancy/{job_id}"),
+                             scraper.SKILL_MATCHER)
+        for job_id, page in pages.items()
+    ]
+    assert replayed['ID'].tolist() == ['7', '8']
+    for row, record in zip(replayed.to_dict('records'), expected):
+        assert {column: row[column] for column in RESULT_COLUMNS} == {column: record[column] for column in RESULT_COLUMNS}
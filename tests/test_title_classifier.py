@@ -0,0 +1,20 @@
+# tests/test_title_classifier.py
+import ai_processing
+from classification_cache import ClassificationCache
+from title_classifier import TitleClassifier
+
+
+def test_from_config_trains_on_current_prompt_labels_only(tmp_path):
+    cache = ClassificationCache(str(tmp_path / 'classifications.sqlite'))
+    current = ai_processing.prompt_version()
+    cache.put_many({("java developer", ""): "Backend Developer",
+                    ("senior java developer", "sql"): "Backend Developer",
+                    ("office manager", ""): "unknown"}, "gemini", current)
+    cache.put_many({("data analyst", ""): "Data Analyst",
+                    ("react developer", ""): "Retired Title"}, "gemini", "older-prompt")
+
+    classifier = TitleClassifier.from_config(cache)
+    cache.close()
+
+    assert classifier.trained_on == 2
+    assert set(classifier._centroids) == {"Backend Developer"}
@@ -0,0 +1,93 @@
+# tests/test_translation_cache.py
+import types
+import pytest
+import translation_cache
+from translation_cache import TranslationCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time.time() for translation_cache; advance it by adding to clock.now."""
+    clock = types.SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(translation_cache, 'time', types.SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def _cache(tmp_path, **options):
+    return TranslationCache(str(tmp_path / 'translations.sqlite'), **options)
+
+
+def _disk_keys(cache):
+    return {row[0] for row in cache._conn.execute("SELECT text_key FROM translations")}
+
+
+def test_lookups_are_normalized_and_counted(tmp_path, clock):
+    cache = _cache(tmp_path)
+    cache.put("Разработчик  Python", "Python developer")
+
+    assert cache.get("разработчик python") == "Python developer"
+    assert cache.get("Тестировщик") is None
+    cache.close()
+    reopened = _cache(tmp_path)
+    assert reopened.get("Разработчик Python") == "Python developer"
+    assert reopened.get("Разработчик Python") == "Python developer"
+
+    assert cache.stats()["memory_hits"] == 1 and cache.stats()["misses"] == 1
+    assert reopened.stats() == {"memory_hits": 1, "disk_hits": 1, "misses": 0, "hit_rate": 1.0, "memory_items": 1}
+    reopened.close()
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_seconds=60)
+    cache.put("Аналитик", "Analyst")
+    clock.now += 59
+    assert cache.get("Аналитик") == "Analyst"
+
+    clock.now += 2
+
+    assert cache.get("Аналитик") is None
+    cache.close()
+    # The disk tier applies the same expiry
+    assert _cache(tmp_path, ttl_seconds=60).get("Аналитик") is None
+
+
+def test_memory_tier_evicts_the_least_recently_used(tmp_path, clock):
+    cache = _cache(tmp_path, max_memory_items=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert list(cache._memory) == [("auto", "en", "a"), ("auto", "en", "c")]
+    # Evicted from memory only: the disk tier still answers
+    assert cache.get("b") == "B" and cache.disk_hits == 1
+    cache.close()
+
+
+def test_disk_tier_is_trimmed_by_last_use_every_500_puts(tmp_path, clock):
+    cache = _cache(tmp_path, max_disk_items=10, ttl_seconds=10_000)
+    cache.put("old but used", "kept")
+    for i in range(498):
+        clock.now += 1
+        cache.put(f"text {i}", f"translation {i}")
+    cache.get("old but used")
+    assert len(_disk_keys(cache)) == 499
+
+    clock.now += 1
+    cache.put("text 498", "translation 498")
+
+    assert _disk_keys(cache) == {"old but used"} | {f"text {i}" for i in range(490, 499)}
+    cache.close()
+
+
+def test_trim_drops_expired_rows(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_seconds=100)
+    cache.put("expired", "x")
+    clock.now += 101
+    cache.put("fresh", "y")
+
+    with cache._lock:
+        cache._trim_disk()
+
+    assert _disk_keys(cache) == {"fresh"}
+    cache.close()
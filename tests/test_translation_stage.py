@@ -0,0 +1,46 @@
+# tests/test_translation_stage.py
+import pandas as pd
+import pytest
+import processing
+import translation_stage
+from translation_cache import TranslationCache
+
+
+class _FakeTranslator:
+    """Uppercases titles; batches lose a line so the stage falls back to one call per title."""
+    requests = []
+
+    def __init__(self, source, target):
+        pass
+
+    def translate(self, text):
+        _FakeTranslator.requests.append(text)
+        if translation_stage.SEPARATOR in text:
+            return text.split(translation_stage.SEPARATOR)[0].upper()
+        if text == "Не переводится":
+            return ""
+        if text == "Ошибка":
+            raise RuntimeError("translator unavailable")
+        return text.upper()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = TranslationCache(str(tmp_path / 'translations.sqlite'))
+    monkeypatch.setattr(processing, 'get_translation_cache', lambda: cache)
+    monkeypatch.setattr(translation_stage, 'GoogleTranslator', _FakeTranslator)
+    _FakeTranslator.requests = []
+    yield cache
+    cache.close()
+
+
+def test_fallbacks_are_not_cached_and_placeholders_not_sent(cache):
+    df = pd.DataFrame({'Job_Title': ["Разработчик", "Не переводится", "Ошибка", "N/A", "Разработчик"]})
+
+    translated = translation_stage.translate_titles(df.copy(), workers=1)
+
+    assert translated['Job_Title'].tolist() == ["РАЗРАБОТЧИК", "Не переводится", "Ошибка", "N/A", "РАЗРАБОТЧИК"]
+    assert not any("N/A" in request for request in _FakeTranslator.requests)
+    assert cache.get("Разработчик") == "РАЗРАБОТЧИК"
+    assert cache.get("Не переводится") is None
+    assert cache.get("Ошибка") is None
@@ -0,0 +1,64 @@
+# tests/test_worker_pool.py
+import threading
+from selenium.webdriver.support.ui import WebDriverWait
+from fake_webdriver import FakeDriver
+import scraper
+from rate_control import RateController
+
+
+def _scraper(site, driver, **options):
+    options.setdefault('rate', RateController(initial_rate=200, max_rate=500))
+    return scraper.GhhScraper(
+        driver, WebDriverWait(driver, 5), base_url=site + "/list?page={page_num}", timeout=5, **options
+    )
+
+
+def test_worker_pool_scrapes_every_vacancy(fixture_site):
+    drivers = []
+    lock = threading.Lock()
+
+    def factory():
+        driver = FakeDriver()
+        with lock:
+            drivers.append(driver)
+        return driver
+
+    results = _scraper(fixture_site, FakeDriver(), workers=3, driver_factory=factory).scrape()
+
+    assert sorted(results['ID'], key=int) == [str(i) for i in range(9)]
+    assert len(drivers) == 3
+    assert all(driver.quit_called for driver in drivers)
+    assert sum(driver.loads for driver in drivers) == 9
+    row = results['ID'].index('4')
+    assert results['Job_Title'][row] == "Python разработчик 4"
+    assert results['Skills'][row] == ["Git", "Python", "SQL"]
+
+
+def test_worker_pool_matches_single_driver_mode(fixture_site):
+    pooled = _scraper(fixture_site, FakeDriver(), workers=2, driver_factory=FakeDriver).scrape()
+
+    single = _scraper(fixture_site, FakeDriver(), workers=1)
+    # Single-driver mode opens vacancies in a tab of the main driver
+    single._browser_fields_in_tab = lambda job_info: single._browser_fields_in_driver(
+        job_info, single.driver, single.wait)
+    sequential = single.scrape()
+
+    def by_id(results):
+        return {job_id: {column: values[i] for column, values in results.items()}
+                for i, job_id in enumerate(results['ID'])}
+
+    assert by_id(pooled) == by_id(sequential)
+
+
+def test_driver_factory_failure_fails_jobs_without_hanging(fixture_site):
+    def broken_factory():
+        raise RuntimeError("chrome binary not found")
+
+    scrape = _scraper(fixture_site, FakeDriver(), workers=2, driver_factory=broken_factory)
+    finished = []
+    thread = threading.Thread(target=lambda: finished.append(scrape.scrape()), daemon=True)
+    thread.start()
+    thread.join(timeout=30)
+
+    assert not thread.is_alive(), "producer blocked on the job queue"
+    assert finished[0]['ID'] == []
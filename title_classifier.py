@@ -0,0 +1,152 @@
+# title_classifier.py
+import os
+import math
+import time
+from collections import Counter, defaultdict
+import config
+import ai_processing
+from skills import SkillMatcher
+from classification_cache import ClassificationCache
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'title_rules.txt')
+
+
+def _ngrams(key, n=3):
+    padded = f" {key} "
+    return Counter(padded[i:i + n] for i in range(len(padded) - n + 1))
+
+
+class TitleClassifier:
+    """
+    Offline classifier that settles the easy titles before they reach Gemini.
+
+    Two stages, each of which either answers with confidence or passes:
+      1. keyword rules (title_rules.txt), accepted when exactly one job title matches;
+      2. character trigram similarity to earlier Gemini labels: a TF-IDF centroid per
+         label, accepted when the best cosine is at least `min_similarity` and beats
+         the runner-up by `min_margin`.
+
+    Args:
+        rules (SkillMatcher): Keyword matcher whose canonical names are job titles.
+        examples (list): (normalized title, label) pairs to train the similarity model.
+        min_similarity (float): Lowest cosine accepted from the similarity model.
+        min_margin (float): Required lead of the best label over the second.
+    """
+
+    def __init__(self, rules=None, examples=(), min_similarity=0.6, min_margin=0.1):
+        self.rules = rules
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self._train(examples)
+
+    @classmethod
+    def from_config(cls, cache=None):
+        """
+        Rules from title_rules.txt, trained on the cached labels of the current prompt.
+        Answers to older prompts may use titles that are no longer valid, and "unknown"
+        is not a title the classifier should ever settle on.
+        """
+        valid = set(config.VALID_JOB_TITLES)
+        rules = SkillMatcher.from_file(getattr(config, 'TITLE_RULES_FILE', DEFAULT_RULES_PATH))
+        rules = SkillMatcher({
+            title: [alias for alias, canonical in rules.aliases.items() if canonical == title]
+            for title in set(rules.aliases.values()) & valid
+        })
+        owns_cache = cache is None
+        cache = cache or ClassificationCache()
+        try:
+            examples = [(title_key, label) for title_key, label in cache.labeled_titles(ai_processing.prompt_version())
+                        if label in valid]
+        finally:
+            if owns_cache:
+                cache.close()
+        return cls(
+            rules, examples,
+            min_similarity=getattr(config, 'TITLE_MIN_SIMILARITY', 0.6),
+            min_margin=getattr(config, 'TITLE_MIN_MARGIN', 0.1)
+        )
+
+    def _train(self, examples):
+        document_frequency = Counter()
+        label_grams = defaultdict(Counter)
+        for title_key, label in examples:
+            grams = _ngrams(title_key)
+            document_frequency.update(grams.keys())
+            label_grams[label].update(grams)
+
+        total = max(len(examples), 1)
+        self._idf = {gram: math.log(total / count) + 1 for gram, count in document_frequency.items()}
+        self._centroids = {}
+        for label, grams in label_grams.items():
+            vector = {gram: count * self._idf[gram] for gram, count in grams.items()}
+            norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+            self._centroids[label] = {gram: weight / norm for gram, weight in vector.items()}
+        self.trained_on = len(examples)
+
+    def _similarities(self, title_key):
+        vector = {gram: count * self._idf[gram] for gram, count in _ngrams(title_key).items() if gram in self._idf}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if not norm:
+            return []
+        scores = [
+            (sum(weight * centroid.get(gram, 0.0) for gram, weight in vector.items()) / norm, label)
+            for label, centroid in self._centroids.items()
+        ]
+        return sorted(scores, reverse=True)
+
+    def classify(self, title):
+        """
+        Returns (label, source) where source is "rules" or "model", or (None, None)
+        if neither stage is confident.
+        """
+        if self.rules is not None:
+            matched = self.rules.match(str(title))
+            if len(matched) == 1:
+                return matched[0], "rules"
+
+        scores = self._similarities(ai_processing.normalize_title(title))
+        if scores:
+            best, label = scores[0]
+            runner_up = scores[1][0] if len(scores) > 1 else 0.0
+            if best >= self.min_similarity and best - runner_up >= self.min_margin:
+                return label, "model"
+        return None, None
+
+
+def identify_job_titles(titles: list, skills: list, classifier=None, **ai_options) -> list:
+    """
+    Drop-in for ai_processing.identify_job_titles that classifies locally first and
+    sends only the unresolved jobs to Gemini.
+
+    Args:
+        titles (list): Job titles to classify.
+        skills (list): Skills of each job, aligned with `titles`.
+        classifier (TitleClassifier): Built with TitleClassifier.from_config if not given.
+        **ai_options: Passed on to ai_processing.identify_job_titles.
+    """
+    if len(titles) != len(skills):
+        raise ValueError("titles и skills должны быть одной длины")
+    classifier = classifier or TitleClassifier.from_config()
+
+    started = time.perf_counter()
+    labels, sources = [], Counter()
+    for title in titles:
+        label, source = classifier.classify(title)
+        labels.append(label)
+        sources[source] += 1
+    elapsed = time.perf_counter() - started
+
+    resolved = len(titles) - sources[None]
+    share = resolved / len(titles) if titles else 0.0
+    print(f"\n--- Local title classifier: {resolved}/{len(titles)} jobs resolved ({share:.0%}; "
+          f"{sources['rules']} by rules, {sources['model']} by similarity to "
+          f"{classifier.trained_on} earlier labels) in {elapsed:.2f}s ---")
+
+    pending = [i for i, label in enumerate(labels) if label is None]
+    if pending:
+        identified = ai_processing.identify_job_titles(
+            [titles[i] for i in pending], [skills[i] for i in pending], **ai_options
+        )
+        for i, label in zip(pending, identified):
+            labels[i] = label
+    return labels
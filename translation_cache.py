@@ -0,0 +1,153 @@
+# translation_cache.py
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+def normalize_text(text: str) -> str:
+    """Cache key form of a source text: collapsed whitespace, case-folded."""
+    return " ".join(text.split()).casefold()
+
+
+class TranslationCache:
+    """
+    Two-tier translation cache: an in-process LRU in front of a SQLite file.
+
+    Keys are (source language, target language, normalized text). Entries older than
+    `ttl_seconds` are treated as misses; the disk tier is trimmed to `max_disk_items`
+    by least recent use.
+
+    Args:
+        path (str): SQLite file shared across runs (and processes).
+        max_memory_items (int): LRU size.
+        max_disk_items (int): Upper bound on rows kept on disk.
+        ttl_seconds (float): Optional expiry; None keeps translations forever.
+    """
+
+    def __init__(self, path=os.path.join('Data', 'translation_cache.sqlite'),
+                 max_memory_items=10000, max_disk_items=200000, ttl_seconds=None):
+        self.path = path
+        self.max_memory_items = max_memory_items
+        self.max_disk_items = max_disk_items
+        self.ttl_seconds = ttl_seconds
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts_since_trim = 0
+        self._memory_uses = {}  # key -> time of its last memory hit, not yet on disk
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                text_key TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (source, target, text_key)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_translations_last_used ON translations (last_used)")
+        self._conn.commit()
+
+    def _expired(self, created_at, now):
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, text, source='auto', target='en'):
+        """Returns the cached translation or None."""
+        key = (source, target, normalize_text(text))
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and not self._expired(cached[1], now):
+                self._memory.move_to_end(key)
+                self._memory_uses[key] = now
+                self.memory_hits += 1
+                return cached[0]
+
+            row = self._conn.execute(
+                "SELECT translation, created_at FROM translations WHERE source = ? AND target = ? AND text_key = ?",
+                key
+            ).fetchone()
+            if row is None or self._expired(row[1], now):
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE translations SET last_used = ? WHERE source = ? AND target = ? AND text_key = ?",
+                (now, *key)
+            )
+            self._conn.commit()
+            self._remember(key, row[0], row[1])
+            self.disk_hits += 1
+            return row[0]
+
+    def put(self, text, translation, source='auto', target='en'):
+        key = (source, target, normalize_text(text))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (source, target, text_key, translation, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, translation, now, now)
+            )
+            self._remember(key, translation, now)
+            self._puts_since_trim += 1
+            # Counting rows on every put would cost more than the insert itself
+            if self._puts_since_trim >= 500:
+                self._trim_disk()
+            self._conn.commit()
+
+    def _remember(self, key, translation, created_at):
+        self._memory[key] = (translation, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _flush_memory_uses(self):
+        # Memory hits skip the disk, so their recency is written in bulk before trimming
+        self._conn.executemany(
+            "UPDATE translations SET last_used = MAX(last_used, ?) WHERE source = ? AND target = ? AND text_key = ?",
+            [(used, *key) for key, used in self._memory_uses.items()]
+        )
+        self._memory_uses.clear()
+
+    def _trim_disk(self):
+        self._puts_since_trim = 0
+        self._flush_memory_uses()
+        self._memory_uses = {}  # key -> time of its last memory hit, not yet on disk
+        count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        excess = count - self.max_disk_items
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM translations WHERE rowid IN "
+                "(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)",
+                (excess,)
+            )
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM translations WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else None,
+            "memory_items": len(self._memory),
+        }
+
+    def close(self):
+        with self._lock:
+            self._flush_memory_uses()
+            self._conn.commit()
+            self._conn.close()
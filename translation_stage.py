@@ -0,0 +1,108 @@
+# translation_stage.py
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from deep_translator import GoogleTranslator
+import processing as proc
+
+# GoogleTranslator rejects requests over 5000 characters
+MAX_BATCH_CHARS = 4500
+SEPARATOR = "\n"
+# Values the scraper stores for missing fields; never sent to the translator
+PLACEHOLDERS = {"", "N/A"}
+
+
+def _clean(text) -> str:
+    # Same clean-up translate_to_english applies, so cache keys match between the two
+    return str(text).strip()[:1000] if isinstance(text, str) else ""
+
+
+def _make_batches(texts, max_items, max_chars):
+    batch, size = [], 0
+    for text in texts:
+        if batch and (len(batch) >= max_items or size + len(text) + 1 > max_chars):
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text) + 1
+    if batch:
+        yield batch
+
+
+def _translate_batch(batch):
+    """
+    Translates a batch with one request by joining the titles with newlines.
+    Falls back to one request per title if the line count does not survive translation.
+
+    Returns:
+        tuple: ({title: translation, or None when it failed}, number of translator calls made).
+        Failed titles keep their original text and are not cached.
+    """
+    translator = GoogleTranslator(source='auto', target='en')
+    try:
+        translated = translator.translate(SEPARATOR.join(batch))
+    except Exception as e:
+        print(f"  ⚠️ Batch translation failed ({e}). Keeping {len(batch)} original titles.")
+        return {text: None for text in batch}, 1
+
+    lines = [line.strip() for line in (translated or "").split(SEPARATOR)]
+    if len(lines) == len(batch) and all(lines):
+        return dict(zip(batch, lines)), 1
+
+    print(f"  ⚠️ Batch came back with {len(lines)} lines for {len(batch)} titles. Translating one by one.")
+    results = {}
+    for text in batch:
+        try:
+            results[text] = translator.translate(text) or None
+        except Exception:
+            results[text] = None
+    return results, 1 + len(batch)
+
+
+def translate_titles(df: pd.DataFrame, column='Job_Title', batch_size=50, workers=4) -> pd.DataFrame:
+    """
+    Translates a column of scraped titles to English as a separate pipeline stage.
+
+    Only unique titles missing from the translation cache are sent, in batches of up
+    to `batch_size` titles, on `workers` concurrent requests. Results are cached and
+    written back to every row.
+
+    Args:
+        df (pd.DataFrame): Raw scraped frame.
+        column (str): Column holding the original titles.
+        batch_size (int): Maximum titles per translator request.
+        workers (int): Concurrent translator requests.
+
+    Returns:
+        pd.DataFrame: The same frame with `column` translated.
+    """
+    if df.empty:
+        return df
+
+    print("\n--- Translating job titles ---")
+    cache = proc.get_translation_cache()
+    unique_titles = {_clean(title) for title in df[column]} - PLACEHOLDERS
+    translations = {"": ""}
+    pending = []
+    for title in unique_titles:
+        cached = cache.get(title)
+        if cached is not None:
+            translations[title] = cached
+        else:
+            pending.append(title)
+
+    calls = 0
+    if pending:
+        batches = list(_make_batches(sorted(pending), batch_size, MAX_BATCH_CHARS))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for results, batch_calls in executor.map(_translate_batch, batches):
+                calls += batch_calls
+                for title, translated in results.items():
+                    if translated:
+                        cache.put(title, translated)
+                        translations[title] = translated
+
+    # Placeholders and failed translations keep the original value
+    df[column] = [translations.get(_clean(title), title) for title in df[column]]
+    print(f"Translated {len(unique_titles)} unique titles for {len(df)} rows: "
+          f"{len(unique_titles) - len(pending)} from cache, {len(pending)} sent in {calls} translator calls.")
+    return df